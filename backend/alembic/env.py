@@ -35,6 +35,13 @@ target_metadata = Base.metadata
 SCHEMA_NAME = "jobify"
 
 
+def include_object(obj, name, type_, reflected, compare_to):
+    # partições do histórico (anexadas ou já arquivadas) não estão no metadata
+    if type_ == "table" and reflected and name and name.startswith("job_history_"):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Gera SQL sem abrir conexão."""
     url = config.get_main_option("sqlalchemy.url")
@@ -45,6 +52,7 @@ def run_migrations_offline() -> None:
         version_table_schema=SCHEMA_NAME,
         compare_type=True,
         compare_server_default=True,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -74,6 +82,7 @@ def run_migrations_online() -> None:
                     version_table_schema=SCHEMA_NAME,
                     compare_type=True,
                     compare_server_default=True,
+                    include_object=include_object,
                     render_as_batch=False,
                 )
                 with context.begin_transaction():
@@ -81,6 +90,9 @@ def run_migrations_online() -> None:
 
             # chama a função sync no contexto da conexão async
             await async_conn.run_sync(run_sync_migrations)
+            # o CREATE SCHEMA já abriu a transação: o Alembic roda dentro dela
+            # e não comita sozinho
+            await async_conn.commit()
 
         await connectable.dispose()
 
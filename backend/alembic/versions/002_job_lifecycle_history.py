@@ -0,0 +1,61 @@
+"""Job lifecycle columns and partitioned job history
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Ciclo de vida das vagas no feed da Remotive
+    op.add_column('jobs', sa.Column('first_seen', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False), schema='jobify')
+    op.add_column('jobs', sa.Column('last_seen', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False), schema='jobify')
+    op.add_column('jobs', sa.Column('expired_at', sa.DateTime(timezone=True), nullable=True), schema='jobify')
+
+    # Índices parciais: vagas ativas (caminho quente) e expiradas (retenção)
+    op.create_index('ix_jobs_active', 'jobs', ['id'], unique=False, schema='jobify',
+                    postgresql_where=sa.text('expired_at IS NULL'))
+    op.create_index('ix_jobs_expired_at', 'jobs', ['expired_at'], unique=False, schema='jobify',
+                    postgresql_where=sa.text('expired_at IS NOT NULL'))
+
+    # Histórico particionado por mês de publicação; as partições
+    # (job_history_AAAA_MM) são criadas pela retenção conforme precisa
+    op.create_table('job_history',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('posted_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('remotive_id', sa.String(length=120), nullable=True),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('company', sa.String(length=255), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('url', sa.String(length=1024), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('raw', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('first_seen', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_seen', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expired_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'posted_at'),
+        schema='jobify',
+        postgresql_partition_by='RANGE (posted_at)',
+    )
+    op.create_index('ix_job_history_remotive_id', 'job_history', ['remotive_id'], unique=False, schema='jobify')
+
+def downgrade() -> None:
+    # remove a tabela particionada junto com as partições anexadas; partições
+    # já desanexadas (arquivo) ficam como tabelas comuns
+    op.drop_table('job_history', schema='jobify')
+    op.drop_index('ix_jobs_expired_at', table_name='jobs', schema='jobify')
+    op.drop_index('ix_jobs_active', table_name='jobs', schema='jobify')
+    op.drop_column('jobs', 'expired_at', schema='jobify')
+    op.drop_column('jobs', 'last_seen', schema='jobify')
+    op.drop_column('jobs', 'first_seen', schema='jobify')
@@ -0,0 +1,27 @@
+"""Job content change timestamp for incremental exports
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Muda só quando o conteúdo da vaga muda (last_seen é regravado
+    # periodicamente mesmo sem mudança)
+    op.add_column('jobs', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False), schema='jobify')
+    # vagas existentes: a última mudança de conteúdo foi no máximo em last_seen
+    op.execute('UPDATE jobify.jobs SET updated_at = last_seen')
+    op.create_index('ix_jobs_updated_at', 'jobs', ['updated_at'], unique=False, schema='jobify')
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_updated_at', table_name='jobs', schema='jobify')
+    op.drop_column('jobs', 'updated_at', schema='jobify')
@@ -1,42 +1,50 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from .config import settings
+from .config import get_settings
 from .db import get_session
 from .models import User
 
 # Configuração de segurança
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer(auto_error=False)
 
-# Configurações JWT - CORRIGIDO: Sem fallback inseguro
-SECRET_KEY = settings.JWT_SECRET_KEY
-ALGORITHM = settings.JWT_ALGORITHM
-ACCESS_TOKEN_EXPIRE_MINUTES = settings.JWT_EXPIRE_MINUTES
+# jose/passlib (bcrypt) são caros de importar: carregados só no primeiro uso
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Configurações JWT - CORRIGIDO: Sem fallback inseguro (lidas do settings no uso)
+def _jwt_settings():
+    settings = get_settings()
+    return settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifica se a senha está correta."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Gera hash da senha."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Cria token JWT."""
+    from jose import jwt
+
+    secret_key, algorithm = _jwt_settings()
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, secret_key, algorithm=algorithm)
     return encoded_jwt
 
 async def get_current_user(
@@ -44,6 +52,8 @@ async def get_current_user(
     session: AsyncSession = Depends(get_session)
 ) -> User:
     """Obtém o usuário atual a partir do token JWT."""
+    from jose import JWTError, jwt
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -57,8 +67,9 @@ async def get_current_user(
             return user
         raise credentials_exception
     
+    secret_key, algorithm = _jwt_settings()
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(credentials.credentials, secret_key, algorithms=[algorithm])
         user_id: int = payload.get("sub")
         if user_id is None:
             raise credentials_exception
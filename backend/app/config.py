@@ -1,5 +1,6 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Any, List, Optional
 
 class Settings(BaseSettings):
     APP_PORT: int = 8080
@@ -15,6 +16,54 @@ class Settings(BaseSettings):
     FRONTEND_URL: Optional[str] = None
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
     
+    # Cache compartilhado entre workers do uvicorn
+    # "memory" (por processo) ou "shm" (arquivos em memória compartilhada)
+    CACHE_BACKEND: str = "memory"
+    CACHE_DIR: Optional[str] = None
+    UPSTREAM_CACHE_TTL: int = 60
+    CATALOG_TTL: int = 300
+    
+    # Novidades do catálogo (/api/jobs/changes e stream SSE)
+    CATALOG_POLL_INTERVAL: float = 5.0
+    CATALOG_DELTA_HISTORY: int = 100
+    SSE_KEEPALIVE: float = 15.0
+    
+    # Chamadas de saída para a Remotive (por worker)
+    UPSTREAM_MAX_CONCURRENCY: int = 8
+    UPSTREAM_MAX_QUEUE: int = 100
+    UPSTREAM_QUEUE_TIMEOUT: float = 10.0
+    UPSTREAM_RETRY_AFTER: int = 5
+    
+    # Aquecimento de cache (startup e a cada refresh do catálogo)
+    WARM_CONCURRENCY: int = 4
+    WARM_TOP_QUERIES: int = 20
+    LISTING_CACHE_SIZE: int = 1024
+    
+    # Favoritos: grava toggles em lote (write-behind) em vez de um commit por clique
+    FAVORITES_WRITE_BEHIND: bool = False
+    FAVORITES_FLUSH_MS: int = 50
+    FAVORITES_MAX_BATCH: int = 500
+    
+    # Feed personalizado (/api/feed)
+    FEED_PROFILE_TTL: int = 86400
+    FEED_CACHE_SIZE: int = 4096
+    
+    # Exportação em massa (/api/jobs/export)
+    EXPORT_CHUNK_SIZE: int = 1000
+    EXPORT_GZIP_LEVEL: int = 6
+    EXPORT_MAX_CONCURRENCY: int = 2
+    EXPORT_RETRY_AFTER: int = 10
+    
+    # Histórico de vagas: jobify.jobs gravado a cada refresh do catálogo e
+    # expiradas arquivadas em job_history (particionada por mês)
+    JOBS_PERSIST_CATALOG: bool = True
+    JOBS_SEEN_RESOLUTION: int = 3600
+    JOBS_ARCHIVE_AFTER_DAYS: int = 30
+    JOBS_HISTORY_MONTHS: int = 12
+    JOBS_HISTORY_DROP: bool = False
+    JOBS_RETENTION_INTERVAL: float = 3600.0
+    JOBS_RETENTION_BATCH: int = 1000
+    
     # Configurações de ambiente
     DEBUG: bool = False
     LOG_LEVEL: str = "INFO"
@@ -23,4 +72,14 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = True
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Settings carregado no primeiro uso (importar o módulo não lê o ambiente)."""
+    return Settings()
+
+
+def __getattr__(name: str) -> Any:
+    # compatibilidade: "from app.config import settings" continua funcionando
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
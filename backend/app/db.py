@@ -1,29 +1,71 @@
 # app/db.py
-from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+from sqlalchemy import MetaData, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from .config import settings
+
+from .config import get_settings
 
 metadata_obj = MetaData(schema="jobify")
 
 class Base(DeclarativeBase):
     metadata = metadata_obj
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    pool_size=5,
-    max_overflow=0,
-    pool_recycle=300,
-    pool_pre_ping=True,
-    connect_args={
-        "server_settings": {
-            "search_path": "jobify"
-        }
-    },
-)
-
-SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+POOL_SIZE = 5
+
+# engine criado no primeiro uso (lifespan ou primeira sessão), não no import
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[sessionmaker] = None
+
+
+def get_engine() -> AsyncEngine:
+    global _engine
+    if _engine is None:
+        _engine = create_async_engine(
+            get_settings().DATABASE_URL,
+            pool_size=POOL_SIZE,
+            max_overflow=0,
+            pool_recycle=300,
+            pool_pre_ping=True,
+            connect_args={
+                "server_settings": {
+                    "search_path": "jobify"
+                }
+            },
+        )
+    return _engine
+
+
+def get_sessionmaker() -> sessionmaker:
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = sessionmaker(bind=get_engine(), class_=AsyncSession, expire_on_commit=False)
+    return _sessionmaker
+
+
+async def warm_pool(connections: int = POOL_SIZE) -> None:
+    """Abre (em paralelo) as conexões do pool, para a primeira requisição não pagar o handshake."""
+    engine = get_engine()
+
+    async def _ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_ping() for _ in range(max(1, min(connections, POOL_SIZE)))))
+
+
+async def dispose_engine() -> None:
+    global _engine, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _sessionmaker = None
+
 
 async def get_session():
-    async with SessionLocal() as s:
+    async with get_sessionmaker()() as s:
         yield s
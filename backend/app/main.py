@@ -1,23 +1,25 @@
 # app/main.py
 from __future__ import annotations
 
-from typing import List
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import get_settings
 
-# Se seu settings tiver FRONTEND_URL / CORS_ORIGINS, usamos. Caso contrário,
-# caímos nos padrões locais.
-try:
-    from .config import settings  # type: ignore
-except Exception:  # pragma: no cover
-    settings = None  # fallback simples
 
 def _cors_origins() -> List[str]:
+    # FRONTEND_URL / CORS_ORIGINS do settings, mais os padrões locais
+    settings = get_settings()
     defaults = ["http://localhost:3000", "http://127.0.0.1:3000"]
-    if not settings:
-        return defaults
     origins: List[str] = []
     # FRONTEND_URL único (string)
     url = getattr(settings, "FRONTEND_URL", None)
@@ -33,39 +35,158 @@ def _cors_origins() -> List[str]:
             origins.append(o)
     return origins
 
+logger = logging.getLogger(__name__)
+
+# espera entre tentativas de conectar no banco durante o startup
+DB_RETRY_MIN = 0.5
+DB_RETRY_MAX = 5.0
+
+
+async def _warm_database(checks: Dict[str, bool]) -> None:
+    from .db import warm_pool
+
+    delay = DB_RETRY_MIN
+    while True:
+        try:
+            await warm_pool()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Banco indisponível no startup (%s); nova tentativa em %.1fs", exc, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, DB_RETRY_MAX)
+        else:
+            checks["database"] = True
+            return
+
+
+async def _warm_caches(checks: Dict[str, bool]) -> None:
+    # Remotive fora do ar não segura o readiness: a API segue servindo
+    # favoritos e devolve 502 nas listagens até o catálogo carregar
+    await jobs.warm_up()
+    checks["caches"] = True
+
+
+async def _prepare(app: FastAPI) -> None:
+    checks = app.state.readiness
+    await asyncio.gather(_warm_database(checks), _warm_caches(checks))
+    app.state.ready = True
+    logger.info("API pronta para receber tráfego")
+
+
+async def _run_retention() -> None:
+    from datetime import timedelta
+
+    from .db import get_sessionmaker
+    from .services.retention import run_periodically
+
+    settings = get_settings()
+    # vagas expiradas vão para job_history; partições antigas são desanexadas
+    await run_periodically(
+        lambda: get_sessionmaker()(),
+        interval=settings.JOBS_RETENTION_INTERVAL,
+        archive_after=timedelta(days=settings.JOBS_ARCHIVE_AFTER_DAYS),
+        keep_months=settings.JOBS_HISTORY_MONTHS,
+        drop=settings.JOBS_HISTORY_DROP,
+        batch=settings.JOBS_RETENTION_BATCH,
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    app.state.ready = False
+    app.state.readiness = {"database": False, "caches": False}
+    # pools e caches aquecem em background; /readyz libera o tráfego no fim
+    app.state.startup = asyncio.ensure_future(_prepare(app))
+    # novas versões do catálogo chegam ao stream SSE mesmo sem tráfego
+    app.state.catalog_watch = asyncio.ensure_future(jobs.watch_catalog())
+    app.state.retention = asyncio.ensure_future(_run_retention())
+    try:
+        yield
+    finally:
+        app.state.startup.cancel()
+        app.state.catalog_watch.cancel()
+        app.state.retention.cancel()
+        from .db import dispose_engine
+        from .services.upstream import close_client
+
+        await close_client()
+        # grava os favoritos ainda na fila (write-behind) antes de fechar o pool
+        await favorites.get_write_behind().close()
+        await dispose_engine()
+
+
+class _GZipMiddleware(GZipMiddleware):
+    """
+    GZip, exceto para streams SSE: o GzipFile do Starlette seguraria os
+    eventos no buffer e cada conexão ociosa manteria um compressor alocado.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and (
+            scope["path"].endswith("/stream")
+            or "text/event-stream" in Headers(scope=scope).get("accept", "")
+        ):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+class _CORSMiddleware(CORSMiddleware):
+    """
+    CORS com as origens do settings, lidas quando o Starlette monta a pilha
+    de middlewares (startup/primeira requisição): importar o app não lê o ambiente.
+    """
+
+    def __init__(self, app: ASGIApp, **kwargs: Any) -> None:
+        super().__init__(app, allow_origins=_cors_origins(), **kwargs)
+
+
 # -----------------------------------------------------------------------------
 # App
 # -----------------------------------------------------------------------------
 app = FastAPI(
     title="Jobify API (FastAPI)",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Compressão de respostas textuais
-app.add_middleware(GZipMiddleware, minimum_size=1024)
+app.add_middleware(_GZipMiddleware, minimum_size=1024)
 
 # CORS – permite o frontend Next.js acessar a API
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=_cors_origins(),
+    _CORSMiddleware,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # a exportação incremental lê a marca d'água do cabeçalho
+    expose_headers=["X-Export-Watermark"],
 )
 
-# Routers
-from .routers import jobs, favorites  # noqa: E402
+# Routers no import do módulo: 'app' já sai com as rotas /api (TestClient,
+# app.openapi() e scripts não dependem do lifespan). O custo desse import
+# entra no orçamento de benchmarks/startup.py.
+from .routers import favorites, feed, jobs  # noqa: E402
 
 app.include_router(jobs.router)
 app.include_router(favorites.router)
+app.include_router(feed.router)
 
 # -----------------------------------------------------------------------------
 # Health / root
 # -----------------------------------------------------------------------------
 @app.get("/healthz", tags=["infra"])
 async def healthz():
+    # liveness: o processo está de pé (não depende de banco nem da Remotive)
     return {"status": "ok"}
 
+@app.get("/readyz", tags=["infra"])
+async def readyz():
+    # readiness: pool do banco e caches aquecidos
+    checks: Dict[str, Any] = dict(getattr(app.state, "readiness", {}))
+    if getattr(app.state, "ready", False):
+        return {"status": "ready", "checks": checks}
+    return JSONResponse({"status": "starting", "checks": checks}, status_code=503)
+
 @app.get("/", tags=["infra"])
 async def root():
-    return {"name": "Jobify API", "docs": "/docs", "health": "/healthz"}
+    return {"name": "Jobify API", "docs": "/docs", "health": "/healthz", "ready": "/readyz"}
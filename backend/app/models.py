@@ -5,7 +5,7 @@ from typing import Optional, List
 from datetime import datetime
 
 from sqlalchemy import (
-    String, Text, DateTime, ForeignKey, Integer, func, UniqueConstraint
+    String, Text, DateTime, ForeignKey, Integer, func, UniqueConstraint, Index, text
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -40,6 +40,11 @@ class Job(Base):
     __tablename__ = "jobs"
     __table_args__ = (
         UniqueConstraint("remotive_id", name="uq_jobs_remotive_id"),
+        # caminho quente (vagas ativas) e retenção (expiradas) com índices parciais
+        Index("ix_jobs_active", "id", postgresql_where=text("expired_at IS NULL")),
+        Index("ix_jobs_expired_at", "expired_at", postgresql_where=text("expired_at IS NOT NULL")),
+        # exportação incremental (since=)
+        Index("ix_jobs_updated_at", "updated_at"),
         {"schema": "jobify"},
     )
 
@@ -53,12 +58,48 @@ class Job(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     raw: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
 
+    # ciclo de vida no feed da Remotive (ver app.services.sync.persist_catalog)
+    first_seen: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_seen: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expired_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # última mudança de conteúdo (ou volta ao feed); last_seen muda sem isso
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
     category_id: Mapped[Optional[int]] = mapped_column(ForeignKey("jobify.categories.id"), nullable=True)
     category: Mapped[Optional["Category"]] = relationship("Category", back_populates="jobs")
 
     favorites: Mapped[List["Favorite"]] = relationship("Favorite", back_populates="job", cascade="all, delete-orphan")
 
 
+class JobHistory(Base):
+    """
+    Vagas expiradas arquivadas (ver app.services.retention). Particionada por
+    mês de publicação: as partições (job_history_AAAA_MM) são criadas sob
+    demanda pela retenção, não pelo metadata.
+    """
+    __tablename__ = "job_history"
+    __table_args__ = (
+        Index("ix_job_history_remotive_id", "remotive_id"),
+        {"schema": "jobify", "postgresql_partition_by": "RANGE (posted_at)"},
+    )
+
+    # a chave de partição precisa fazer parte da PK
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    posted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    remotive_id: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    company: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    location: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    url: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    raw: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    category_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    first_seen: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_seen: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    expired_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
 class Favorite(Base):
     __tablename__ = "favorites"
     __table_args__ = ({"schema": "jobify"},)
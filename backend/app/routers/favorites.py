@@ -1,25 +1,81 @@
 # app/routers/favorites.py
-from typing import List
+import logging
+from functools import lru_cache
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response
-from sqlalchemy import select, delete, insert
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import and_, select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db import get_session
+from ..config import get_settings
+from ..db import get_session, get_sessionmaker
 from ..models import Favorite, Job
 from ..schemas import JobOut, FavoriteIn
+from ..services.cache import get_cache
+from ..services.profiles import Member, ProfileStore, raw_job_features
+from ..services.write_behind import FavoriteWriteBehind, insert_existing_favorites
 
 router = APIRouter(prefix="/api/favorites", tags=["favorites"])
+logger = logging.getLogger(__name__)
 
 
 DEMO_USER = 1
 
+@lru_cache(maxsize=1)
+def get_write_behind() -> FavoriteWriteBehind:
+    """Fila de toggles (só usada com FAVORITES_WRITE_BEHIND), criada no primeiro uso."""
+    settings = get_settings()
+    return FavoriteWriteBehind(
+        lambda: get_sessionmaker()(),
+        flush_ms=settings.FAVORITES_FLUSH_MS,
+        max_batch=settings.FAVORITES_MAX_BATCH,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_profiles() -> ProfileStore:
+    """Perfis do feed personalizado (ver app.routers.feed)."""
+    return ProfileStore(get_cache(), ttl=get_settings().FEED_PROFILE_TTL)
+
+
+async def _favorite_member(user_id: int, job_id: int) -> Optional[Member]:
+    """Vaga como entra no perfil se ela é favorita agora (fila do write-behind ou banco), senão None."""
+    pending = get_write_behind().pending_state(user_id, job_id)
+    if pending is False:
+        return None
+    async with get_sessionmaker()() as session:
+        row = (
+            await session.execute(
+                select(Job.remotive_id, Job.company, Job.raw, Favorite.user_id.label("favorite_of"))
+                .outerjoin(Favorite, and_(Favorite.job_id == Job.id, Favorite.user_id == user_id))
+                .where(Job.id == job_id)
+            )
+        ).first()
+    if row is None or (pending is None and row.favorite_of is None):
+        return None
+    return row.remotive_id or "", raw_job_features(row.company, row.raw)
+
+
+async def _update_profile(user_id: int, job_id: int) -> None:
+    """Atualiza o perfil do usuário com o estado atual da vaga (depois de responder o toggle)."""
+    try:
+        await get_profiles().update(user_id, str(job_id), lambda: _favorite_member(user_id, job_id))
+    except Exception:  # noqa: BLE001
+        logger.warning("Falha ao atualizar o perfil do usuário %s", user_id, exc_info=True)
+        try:
+            await get_profiles().invalidate(user_id)
+        except Exception:  # noqa: BLE001
+            pass
+
 
 @router.get("", response_model=List[JobOut])
 async def list_favorites(session: AsyncSession = Depends(get_session)):
     """
     Lista todas as vagas favoritas do usuário.
     """
+    # toggles pendentes deste worker entram antes da leitura
+    await get_write_behind().flush()
     q = (
         select(Job)
         .join(Favorite, Favorite.job_id == Job.id)
@@ -32,35 +88,50 @@ async def list_favorites(session: AsyncSession = Depends(get_session)):
 
 @router.post("", status_code=201)
 async def add_favorite(
-    payload: FavoriteIn, session: AsyncSession = Depends(get_session)
+    payload: FavoriteIn,
+    background: BackgroundTasks,
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Adiciona uma vaga aos favoritos.
+    Com write-behind, só enfileira e responde 202 (vaga inexistente é
+    descartada no flush).
     """
-    
-    exists = await session.get(Job, payload.job_id)
-    if not exists:
-        raise HTTPException(status_code=404, detail="Vaga não encontrada")
+    if get_settings().FAVORITES_WRITE_BEHIND:
+        get_write_behind().enqueue(DEMO_USER, payload.job_id, favorite=True)
+        background.add_task(_update_profile, DEMO_USER, payload.job_id)
+        return JSONResponse(
+            {"message": "Vaga será adicionada aos favoritos", "job_id": payload.job_id},
+            status_code=202,
+        )
 
-    
-    await session.execute(
-        insert(Favorite)
-        .values(user_id=DEMO_USER, job_id=payload.job_id)
-        .prefix_with("ON CONFLICT DO NOTHING")
-    )
+    # INSERT ... SELECT: a existência da vaga é checada no próprio insert;
+    # só sem linha inserida (vaga inexistente ou já favorita) vamos ao banco de novo
+    result = await session.execute(insert_existing_favorites(DEMO_USER, [payload.job_id]))
     await session.commit()
-    
+    if result.rowcount == 0 and await session.get(Job, payload.job_id) is None:
+        raise HTTPException(status_code=404, detail="Vaga não encontrada")
+    if result.rowcount:
+        background.add_task(_update_profile, DEMO_USER, payload.job_id)
+
     return {"message": "Vaga adicionada aos favoritos", "job_id": payload.job_id}
 
 
 @router.delete("/{job_id}", status_code=204, response_class=Response)
 async def remove_favorite(
-    job_id: int, session: AsyncSession = Depends(get_session)
+    job_id: int,
+    background: BackgroundTasks,
+    session: AsyncSession = Depends(get_session),
 ) -> Response:
     """
     Remove uma vaga dos favoritos.
-    Retorna 204 No Content SEM corpo.
+    Retorna 204 No Content SEM corpo (202 com write-behind).
     """
+    if get_settings().FAVORITES_WRITE_BEHIND:
+        get_write_behind().enqueue(DEMO_USER, job_id, favorite=False)
+        background.add_task(_update_profile, DEMO_USER, job_id)
+        return Response(status_code=202)
+
     result = await session.execute(
         delete(Favorite).where(
             Favorite.user_id == DEMO_USER,
@@ -71,7 +142,7 @@ async def remove_favorite(
 
     if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Favorito não encontrado")
-
+    background.add_task(_update_profile, DEMO_USER, job_id)
 
     return Response(status_code=204)
 
@@ -81,6 +152,10 @@ async def check_favorite(job_id: int, session: AsyncSession = Depends(get_sessio
     """
     Verifica se uma vaga está nos favoritos.
     """
+    pending = get_write_behind().pending_state(DEMO_USER, job_id)
+    if pending is not None:
+        return {"is_favorite": pending, "job_id": job_id}
+
     result = await session.execute(
         select(Favorite).where(
             Favorite.user_id == DEMO_USER,
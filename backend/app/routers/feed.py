@@ -0,0 +1,108 @@
+# app/routers/feed.py
+# Feed personalizado: vagas do catálogo parecidas com os favoritos do usuário.
+# O perfil é mantido pelos toggles de favoritos (app.routers.favorites); aqui
+# só pontuamos o catálogo contra ele, com cache por (usuário, versão do
+# catálogo, versão do perfil).
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, List, Set
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import get_settings
+from ..db import get_session
+from ..models import Favorite, Job
+from ..services.cache import LocalLRU
+from ..services.catalog import CatalogSnapshot
+from ..services.profiles import UserProfile, raw_job_features
+from .favorites import DEMO_USER, get_profiles, get_write_behind
+from .jobs import get_catalog
+
+router = APIRouter(prefix="/api", tags=["feed"])
+
+FEED_LIMIT = 100
+
+
+
+@lru_cache(maxsize=1)
+def get_feed_cache() -> LocalLRU:
+    return LocalLRU(get_settings().FEED_CACHE_SIZE)
+
+
+async def _build_profile(user_id: int, session: AsyncSession) -> UserProfile:
+    """Monta o perfil a partir dos favoritos no banco (primeiro uso ou perfil expirado)."""
+
+    async def load() -> UserProfile:
+        await get_write_behind().flush()
+        rows = await session.execute(
+            select(Job.id, Job.remotive_id, Job.company, Job.raw)
+            .join(Favorite, Favorite.job_id == Job.id)
+            .where(Favorite.user_id == user_id)
+        )
+        profile = UserProfile()
+        for row in rows:
+            profile.add(str(row.id), row.remotive_id or "", raw_job_features(row.company, row.raw))
+        return profile
+
+    # sob o lock do perfil: toggles durante a leitura são aplicados depois
+    return await get_profiles().rebuild(user_id, load)
+
+
+def _rank(snapshot: CatalogSnapshot, profile: UserProfile, limit: int) -> List[Dict[str, Any]]:
+    store = snapshot.store
+    exclude: Set[int] = set()
+    for catalog_id in profile.catalog_ids():
+        row = store.row_of(catalog_id)
+        if row is not None:
+            exclude.add(row)
+
+    ranked = snapshot.feed.top(profile, limit, exclude) if len(profile) else []
+    # completa com as mais novas (perfil vazio ou poucas vagas com afinidade)
+    if len(ranked) < limit:
+        taken = exclude | {row for row, _ in ranked}
+        for row in snapshot.sorting.order["newest"]:
+            if row not in taken:
+                ranked.append((row, 0.0))
+                if len(ranked) == limit:
+                    break
+
+    items = []
+    for row, score in ranked:
+        item = store.row(row, with_description=False)
+        item["score"] = score
+        items.append(item)
+    return items
+
+
+@router.get("/feed")
+async def personalized_feed(
+    limit: int = Query(20, ge=1, le=FEED_LIMIT),
+    session: AsyncSession = Depends(get_session),
+) -> Dict[str, Any]:
+    """
+    Vagas recomendadas para o usuário a partir dos favoritos; sem favoritos,
+    as mais recentes ("personalized": false).
+    """
+    user_id = DEMO_USER
+    profiles = get_profiles()
+    feed_cache = get_feed_cache()
+    snapshot = await get_catalog().get()
+    cache_key = (user_id, snapshot.version, await profiles.version(user_id), limit)
+    cached = feed_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    profile = await profiles.get(user_id)
+    if profile is None:
+        profile = await _build_profile(user_id, session)
+        cache_key = (user_id, snapshot.version, await profiles.version(user_id), limit)
+
+    result = {
+        "items": _rank(snapshot, profile, limit),
+        "personalized": len(profile) > 0,
+    }
+    feed_cache.set(cache_key, result)
+    return result
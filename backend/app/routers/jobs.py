@@ -1,51 +1,114 @@
 # app/routers/jobs.py
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Literal, Optional, Set, Tuple
+from urllib.parse import urlencode
 
-import httpx
-from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi import APIRouter, Header, HTTPException, Path, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.background import BackgroundTask
+
+from ..config import get_settings
+from ..db import get_sessionmaker
+from ..services.broadcast import Broadcaster, Event, Subscription
+from ..services.cache import LocalLRU, get_cache
+from ..services.catalog import Catalog, CatalogDelta, CatalogSnapshot
+from ..services.export import MEDIA_TYPES, ExportBusy, ExportSlots, ExportStream, accepts_gzip, export_query
+from ..services.facets import FacetIndex, bitmap_from_rows
+from ..services.sorting import walk_order
+from ..services.sync import persist_catalog
+from ..services.upstream import UpstreamBusy, get_client, get_limiter, inflight
+from ..services.warmer import QueryLog, Warmer, WarmTask
 
 router = APIRouter(prefix="/api", tags=["jobs"])
+logger = logging.getLogger(__name__)
 
 
+MAX_LIMIT = 200
+FACET_LIMIT = 50
+SIMILAR_LIMIT = 50
 
-REMOTIVE_BASE = "https://remotive.com/api"
-DEFAULT_HEADERS = {"User-Agent": "Jobify/1.0 (+https://github.com/)"}
-DEFAULT_TIMEOUT = httpx.Timeout(20.0)
+# respostas maiores que isso (o feed completo) são decodificadas numa thread
+JSON_THREAD_BYTES = 1 << 20
 
-MAX_LIMIT = 200
 
-async def _get_json(url_path: str, params: Dict[str, Any] | None = None) -> Dict[str, Any]:
-    """
-    GET no endpoint público da Remotive, retornando JSON
-    ou disparando 502 em caso de erro.
-    """
+def _upstream_key(url_path: str, params: Dict[str, Any] | None) -> str:
+    query = urlencode(sorted((params or {}).items()))
+    return f"remotive:{url_path}?{query}"
+
+
+async def _fetch_json(url_path: str, params: Dict[str, Any] | None, key: str, use_cache: bool) -> Dict[str, Any]:
     try:
-        async with httpx.AsyncClient(
-            base_url=REMOTIVE_BASE,
-            timeout=DEFAULT_TIMEOUT,
-            headers=DEFAULT_HEADERS,
-        ) as client:
-            r = await client.get(url_path, params=params)
-            r.raise_for_status()
+        async with get_limiter():
+            r = await get_client().get(url_path, params=params)
+        r.raise_for_status()
+        if len(r.content) > JSON_THREAD_BYTES:
+            data = await asyncio.to_thread(json.loads, r.content) or {}
+        else:
             data = r.json() or {}
-            if not isinstance(data, dict):
-                raise ValueError("Resposta inválida (esperado objeto JSON).")
-            return data
+        if not isinstance(data, dict):
+            raise ValueError("Resposta inválida (esperado objeto JSON).")
+    except UpstreamBusy as exc:
+        raise HTTPException(
+            status_code=503,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=502, detail=f"Erro ao acessar Remotive: {exc}") from exc
 
+    if use_cache:
+        try:
+            await get_cache().set(key, r.content, ttl=get_settings().UPSTREAM_CACHE_TTL)
+        except Exception as exc:  # noqa: BLE001
+            # cache cheio (ex.: ENOSPC no /dev/shm) não derruba uma resposta boa
+            logger.warning("Falha ao gravar %s no cache: %s", key, exc)
+    return data
 
-def _normalize_job(j: Dict[str, Any]) -> Dict[str, Any]:
+
+async def _get_json(
+    url_path: str,
+    params: Dict[str, Any] | None = None,
+    *,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
     """
-    Converte o item cru da Remotive para um formato estável para a UI.
+    GET no endpoint público da Remotive, retornando JSON
+    ou disparando 502 em caso de erro.
+
+    As respostas ficam no cache compartilhado por UPSTREAM_CACHE_TTL segundos,
+    então workers diferentes não repetem a mesma chamada. Chamadas idênticas
+    simultâneas viram uma só, e o total em voo é limitado: com a fila cheia,
+    responde 503 com Retry-After.
     """
+    key = _upstream_key(url_path, params)
+    if use_cache:
+        cached = await get_cache().get(key)
+        if cached is not None:
+            return json.loads(cached)
+
+    return await inflight.do(key, lambda: _fetch_json(url_path, params, key, use_cache))
+
+
+def _raw_job_id(j: Dict[str, Any]) -> str:
+    """Id estável de um item cru da Remotive (o mesmo exposto em 'id')."""
     raw_id = j.get("id") or j.get("job_id") or j.get("uuid") or j.get("slug") or j.get("url")
-    job_id = str(raw_id) if raw_id is not None else ""
+    return str(raw_id) if raw_id is not None else ""
 
+
+def _normalize_job(j: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converte o item cru da Remotive para um formato estável para a UI.
+    """
     return {
-        "id": job_id,
+        "id": _raw_job_id(j),
         "remotive_id": str(j.get("id") or ""),
         "title": j.get("title") or "",
         "company": j.get("company_name"),
@@ -76,61 +139,510 @@ def _extract_jobs_and_total(payload: Dict[str, Any]) -> Tuple[List[Dict[str, Any
     return jobs, total_int
 
 
-def _slice_page(items: List[Dict[str, Any]], page: int, per_page: int) -> List[Dict[str, Any]]:
+async def _load_catalog() -> List[Dict[str, Any]]:
+    """
+    Feed completo da Remotive, normalizado (fonte do catálogo).
+    Não passa pelo cache de payloads: o próprio catálogo já é compartilhado.
+    """
+    payload = await _get_json("/remote-jobs", use_cache=False)
+    items, _ = await asyncio.to_thread(_extract_jobs_and_total, payload)
+    return items
+
+
+@lru_cache(maxsize=1)
+def get_catalog() -> Catalog:
+    """
+    Catálogo deste worker, criado no primeiro uso (importar o router não lê
+    o settings). Cada nova versão dispara o aquecimento e o push do stream;
+    o worker que a montou também decai o ranking de buscas e grava no banco.
+    """
+    settings = get_settings()
+    catalog = Catalog(
+        get_cache(),
+        _load_catalog,
+        ttl=settings.CATALOG_TTL,
+        delta_history=settings.CATALOG_DELTA_HISTORY,
+    )
+    catalog.subscribe(lambda _snapshot: get_warmer().schedule(_warm_tasks))
+    catalog.subscribe(_on_new_version)
+    catalog.on_rebuild(_on_rebuild)
+    return catalog
+
+
+async def _categories_by_slug() -> Dict[str, str]:
+    """slug (minúsculo) -> nome, pela lista de categorias da Remotive (em cache). Vazio se indisponível."""
+    try:
+        payload = await _get_json("/remote-jobs/categories")
+    except HTTPException:
+        return {}
+    raw = payload.get("jobs") or payload.get("categories") or payload.get("data") or []
+    return {c["value"].lower(): c["label"] for c in _normalize_categories(raw)}
+
+
+def _category_key(values: Iterable[str], by_slug: Dict[str, str]) -> Tuple[str, ...]:
+    """
+    Categorias como entram em ListingParams: slug traduzido para o nome,
+    minúsculas, sem repetição e em ordem. Slug e nome da mesma categoria (e
+    a ordem dos filtros) caem na mesma entrada do cache de respostas.
+    """
+    names = (by_slug.get(v.strip().lower(), v.strip()).lower() for v in values)
+    return tuple(sorted({n for n in names if n}))
+
+
+async def _category_names(values: List[str], index: FacetIndex) -> List[str]:
+    """
+    Aceita slug OU nome de categoria. O catálogo só conhece os nomes; slugs
+    são traduzidos pela lista de categorias da Remotive (em cache).
+    """
+    if all(index.has_value("category", v) for v in values):
+        return values
+    by_slug = await _categories_by_slug()
+    return [
+        v if index.has_value("category", v) else by_slug.get(v.strip().lower(), v)
+        for v in values
+    ]
+
+
+async def _search_rows(q: str, snapshot: CatalogSnapshot) -> List[int]:
+    """
+    Linhas do catálogo que a busca da Remotive devolve para 'q', na ordem de
+    relevância dela. A busca textual continua sendo da Remotive; facetas e
+    ordenação são locais.
+    """
+    payload = await _get_json("/remote-jobs", params={"search": q})
+    jobs_raw = payload.get("jobs") or payload.get("data") or []
+    store = snapshot.store
+    rows = (store.row_of(_raw_job_id(j)) for j in jobs_raw if isinstance(j, dict))
+    return [r for r in rows if r is not None]
+
+
+@dataclass(frozen=True)
+class ListingParams:
+    """Parâmetros normalizados de uma listagem (também chave do cache de respostas)."""
+
+    q: Optional[str] = None
+    category: Tuple[str, ...] = ()
+    job_type: Tuple[str, ...] = ()
+    location: Tuple[str, ...] = ()
+    tag: Tuple[str, ...] = ()
+    tag_mode: str = "any"
+    include_facets: bool = False
+    sort: str = "relevance"
+    page: int = 1
+    per_page: int = 20
+
+
+async def _list_jobs(params: ListingParams) -> Dict[str, Any]:
+    """Monta a listagem (ou devolve do cache de respostas desta versão do catálogo)."""
+    snapshot = await get_catalog().get()
+    cache_key = (snapshot.version, params)
+    # com 'q' a resposta depende da busca da Remotive (cache com TTL); sem
+    # 'q' só do catálogo, e a versão na chave já invalida
+    cache = get_search_cache() if params.q else get_listing_cache()
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    index = snapshot.facets
+    search_rows = await _search_rows(params.q, snapshot) if params.q else None
+    base = bitmap_from_rows(search_rows, index.size) if search_rows is not None else index.all_mask
+    facet_masks: Dict[str, int] = {}
+    if params.category:
+        names = await _category_names(list(params.category), index)
+        facet_masks["category"] = index.mask_for("category", names)
+    if params.job_type:
+        facet_masks["job_type"] = index.mask_for("job_type", params.job_type)
+    if params.location:
+        facet_masks["location"] = index.mask_for("location", params.location)
+    if params.tag:
+        facet_masks["tag"] = index.mask_for("tag", params.tag, match_all=params.tag_mode == "all")
+
+    mask = base
+    for facet_mask in facet_masks.values():
+        mask &= facet_mask
+
+    total = mask.bit_count()
+    per_page = params.per_page
+    start = (params.page - 1) * per_page
+    if search_rows is not None and params.sort == "relevance":
+        rows = walk_order(search_rows, mask, start, per_page)
+    else:
+        rows = snapshot.sorting.page(params.sort, mask, start, per_page)
+    total_pages = max(1, (total + per_page - 1) // per_page)
+
+    result: Dict[str, Any] = {
+        "items": [snapshot.store.row(r) for r in rows],
+        "total": total,
+        "page": params.page,
+        "per_page": per_page,
+        "total_pages": total_pages,
+    }
+    if params.include_facets:
+        result["facets"] = index.counts(base, facet_masks, limit=FACET_LIMIT)
+    cache.set(cache_key, result)
+    return result
+
+
+async def _warm_tasks() -> List[WarmTask]:
+    """
+    O que aquecer: primeira página sem filtros, de cada categoria e das
+    buscas mais populares do tráfego recente.
+    """
+    targets = [ListingParams(), ListingParams(include_facets=True)]
+    try:
+        categories = await list_categories()
+    except HTTPException:
+        categories = []
+    by_slug = {c["value"].lower(): c["label"] for c in categories}
+    # mesma chave que um cliente filtrando pelo slug (ou pelo nome) gera
+    targets += [ListingParams(category=_category_key([c["value"]], by_slug)) for c in categories]
+    targets += [ListingParams(q=q) for q in await get_query_log().top(get_settings().WARM_TOP_QUERIES)]
+    return [lambda p=p: _list_jobs(p) for p in targets]
+
+
+# chave inclui a versão do catálogo: um refresh invalida tudo sem TTL, e o
+# que foi aquecido vale até a próxima versão
+@lru_cache(maxsize=1)
+def get_listing_cache() -> LocalLRU:
+    return LocalLRU(get_settings().LISTING_CACHE_SIZE)
+
+
+# listagens com 'q' expiram junto com a busca da Remotive em cache
+@lru_cache(maxsize=1)
+def get_search_cache() -> LocalLRU:
+    settings = get_settings()
+    return LocalLRU(settings.LISTING_CACHE_SIZE, ttl=settings.UPSTREAM_CACHE_TTL)
+
+
+@lru_cache(maxsize=1)
+def get_similar_cache() -> LocalLRU:
+    return LocalLRU(get_settings().LISTING_CACHE_SIZE)
+
+
+@lru_cache(maxsize=1)
+def get_query_log() -> QueryLog:
+    return QueryLog(get_cache())
+
+
+@lru_cache(maxsize=1)
+def get_warmer() -> Warmer:
+    return Warmer(concurrency=get_settings().WARM_CONCURRENCY)
+
+
+async def warm_up() -> None:
+    """
+    Carrega o catálogo no startup; a nova versão dispara o aquecimento
+    (primeiras páginas, categorias e buscas populares), que é aguardado.
+    """
+    try:
+        await get_catalog().get()
+    except HTTPException as exc:
+        logger.warning("Catálogo indisponível no startup: %s", exc.detail)
+        return
+    await get_warmer().wait()
+
+
+async def watch_catalog() -> None:
     """
-    Paginação local (a API pública não tem offset).
+    Mantém o catálogo deste worker em dia mesmo sem tráfego (novas versões
+    disparam o aquecimento e o push para os clientes do stream).
     """
-    if page < 1:
-        page = 1
-    start = (page - 1) * per_page
-    end = start + per_page
-    return items[start:end]
+    while True:
+        await asyncio.sleep(get_settings().CATALOG_POLL_INTERVAL)
+        try:
+            await get_catalog().get()
+        except HTTPException as exc:
+            logger.warning("Falha ao atualizar o catálogo: %s", exc.detail)
+        except Exception:  # noqa: BLE001
+            logger.exception("Falha ao atualizar o catálogo")
+
+
+# -----------------------------------------------------------------------------
+# Novidades do catálogo: delta por versão e stream SSE
+# -----------------------------------------------------------------------------
+broadcaster = Broadcaster()
+_publish_lock = asyncio.Lock()
+_background: Set["asyncio.Task[None]"] = set()
+
+
+def _changes_payload(
+    snapshot: CatalogSnapshot, since: int, deltas: Optional[List[CatalogDelta]]
+) -> Dict[str, Any]:
+    """Vagas que entraram (resumo, sem descrição) e ids que saíram desde 'since'."""
+    if deltas is None:
+        # intervalo fora do histórico: o cliente recarrega a listagem
+        return {"version": snapshot.version, "since": since, "reset": True, "added": [], "removed": []}
+    added, removed = CatalogDelta.merge(deltas)
+    store = snapshot.store
+    rows = [store.row_of(job_id) for job_id in added]
+    return {
+        "version": snapshot.version,
+        "since": since,
+        "reset": False,
+        "added": [store.row(r, with_description=False) for r in rows if r is not None],
+        "removed": removed,
+    }
+
+
+def _sse_frame(payload: Dict[str, Any]) -> bytes:
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {payload['version']}\nevent: changes\ndata: {data}\n\n".encode("utf-8")
+
+
+async def _publish_changes(snapshot: CatalogSnapshot) -> None:
+    # serializa uma vez por versão; todos os clientes recebem os mesmos bytes
+    async with _publish_lock:
+        since = broadcaster.version
+        if snapshot.version <= since:
+            return
+        if since == 0:
+            # primeira versão vista por este worker: nada a anunciar
+            broadcaster.version = snapshot.version
+            return
+        payload = _changes_payload(snapshot, since, await get_catalog().changes(snapshot, since))
+        empty = not (payload["reset"] or payload["added"] or payload["removed"])
+        broadcaster.publish(Event(snapshot.version, since, b"" if empty else _sse_frame(payload)))
+
+
+def _on_new_version(snapshot: CatalogSnapshot) -> None:
+    task = asyncio.ensure_future(_publish_changes(snapshot))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+
+async def _persist_snapshot(snapshot: CatalogSnapshot) -> None:
+    try:
+        counts = await persist_catalog(
+            get_sessionmaker(), snapshot.store, seen_resolution=get_settings().JOBS_SEEN_RESOLUTION
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Falha ao gravar o catálogo v%d no banco: %s", snapshot.version, exc)
+        return
+    if counts is not None:
+        logger.info("Catálogo v%d gravado no banco: %s", snapshot.version, counts)
+
+
+def _on_rebuild(snapshot: CatalogSnapshot) -> None:
+    # uma vez por versão no cluster (não por worker): decaimento do ranking
+    # de buscas e, se ligado, gravação no banco
+    tasks = [get_query_log().decay()]
+    if get_settings().JOBS_PERSIST_CATALOG:
+        # só o worker que buscou a Remotive grava; a listagem não espera o banco
+        tasks.append(_persist_snapshot(snapshot))
+    for coro in tasks:
+        task = asyncio.ensure_future(coro)
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+
+
+
+async def _stream_events(
+    subscription: Subscription, snapshot: CatalogSnapshot, since: Optional[int]
+) -> AsyncIterator[bytes]:
+    try:
+        yield b"retry: 5000\n\n"
+        last = snapshot.version
+        if since is not None and since != last:
+            yield _sse_frame(_changes_payload(snapshot, since, await get_catalog().changes(snapshot, since)))
+        while True:
+            event = await subscription.next(get_settings().SSE_KEEPALIVE)
+            if event is None:
+                yield b": keepalive\n\n"
+                continue
+            if event.version <= last:
+                continue
+            if event.since != last:
+                # o cliente pulou versões (worker atrasado): recalcula só para ele
+                snapshot = await get_catalog().get()
+                yield _sse_frame(_changes_payload(snapshot, last, await get_catalog().changes(snapshot, last)))
+                last = snapshot.version
+                continue
+            if event.frame:
+                yield event.frame
+            last = event.version
+    finally:
+        subscription.close()
+
 
 @router.get("/jobs")
 async def list_jobs(
     q: Optional[str] = Query(None, description="Texto de busca (search)"),
-    category: Optional[str] = Query(
+    category: Optional[List[str]] = Query(
         None,
-        description="Categoria (slug OU nome). Ex.: 'software-dev' ou 'Software Development'.",
+        description="Categoria (slug OU nome). Ex.: 'software-dev' ou 'Software Development'. "
+        "Pode repetir (OR).",
+    ),
+    job_type: Optional[List[str]] = Query(None, description="Tipo (ex.: full_time). Pode repetir (OR)."),
+    location: Optional[List[str]] = Query(None, description="Local exigido. Pode repetir (OR)."),
+    tag: Optional[List[str]] = Query(None, description="Tag. Pode repetir; ver 'tag_mode'."),
+    tag_mode: Literal["any", "all"] = Query("any", description="'any' (OR) ou 'all' (AND) entre tags"),
+    include_facets: bool = Query(False, alias="facets", description="Inclui contagens por faceta"),
+    sort: Literal["relevance", "newest", "company", "title"] = Query(
+        "relevance",
+        description="'relevance' = ordem da busca da Remotive (ou do feed, sem 'q')",
     ),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
 ) -> Dict[str, Any]:
     """
-    Lista vagas a partir da Remotive e devolve no formato estável:
+    Lista vagas do catálogo e devolve no formato estável:
 
     {
       "items": [Job, ...],
       "total": <int>,
       "page": <int>,
       "per_page": <int>,
-      "total_pages": <int>
+      "total_pages": <int>,
+      "facets": {"category": [{"value", "count"}, ...], ...}   # se facets=true
     }
 
-    Observação: Remotive não suporta offset; usamos 'limit' e paginamos localmente.
+    Filtros combinam com AND entre facetas e OR entre valores da mesma faceta,
+    respondidos pelo índice invertido do catálogo (bitmaps). A busca 'q'
+    continua delegada à Remotive (em cache) e é cruzada com as facetas.
+    As ordenações usam permutações pré-computadas a cada refresh do catálogo.
     """
-    
-    limit = min(MAX_LIMIT, max(per_page * page, per_page))
+    get_query_log().record(q)
+    params = ListingParams(
+        q=QueryLog.normalize(q) if q else None,
+        category=_category_key(category, await _categories_by_slug()) if category else (),
+        job_type=tuple(job_type or ()),
+        location=tuple(location or ()),
+        tag=tuple(tag or ()),
+        tag_mode=tag_mode,
+        include_facets=include_facets,
+        sort=sort,
+        page=page,
+        per_page=per_page,
+    )
+    return await _list_jobs(params)
 
-    params: Dict[str, Any] = {"limit": limit}
-    if q:
-        params["search"] = q
-    if category:
-        params["category"] = category
 
-    payload = await _get_json("/remote-jobs", params=params)
-    all_items, total = _extract_jobs_and_total(payload)
+@router.get("/jobs/changes")
+async def job_changes(
+    since: int = Query(..., ge=0, description="Última versão do catálogo vista pelo cliente"),
+) -> Dict[str, Any]:
+    """
+    Vagas que entraram/saíram do catálogo desde a versão 'since'. Com
+    "reset": true o intervalo não está mais no histórico e o cliente deve
+    recarregar a listagem.
+    """
+    snapshot = await get_catalog().get()
+    return _changes_payload(snapshot, since, await get_catalog().changes(snapshot, since))
 
-    page_items = _slice_page(all_items, page, per_page)
-    total_pages = max(1, (total + per_page - 1) // per_page)
 
-    return {
-        "items": page_items,
-        "total": total,
-        "page": page,
-        "per_page": per_page,
-        "total_pages": total_pages,
+@router.get("/jobs/stream")
+async def job_stream(
+    since: Optional[int] = Query(None, ge=0, description="Versão a partir da qual enviar as novidades"),
+    last_event_id: Optional[str] = Header(None),
+) -> StreamingResponse:
+    """
+    Server-Sent Events: um evento "changes" (mesmo formato de /jobs/changes)
+    a cada nova versão do catálogo. Reconexões retomam pelo Last-Event-ID.
+    """
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    # inscreve antes de ler o snapshot: nenhuma versão escapa entre os dois
+    subscription = broadcaster.subscribe()
+    try:
+        snapshot = await get_catalog().get()
+    except BaseException:
+        subscription.close()
+        raise
+    return StreamingResponse(
+        _stream_events(subscription, snapshot, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# -----------------------------------------------------------------------------
+# Exportação em massa (NDJSON/CSV) a partir do banco
+# -----------------------------------------------------------------------------
+EXPORT_WATERMARK_SLACK = timedelta(minutes=5)
+
+
+@lru_cache(maxsize=1)
+def get_export_slots() -> ExportSlots:
+    settings = get_settings()
+    return ExportSlots(settings.EXPORT_MAX_CONCURRENCY, retry_after=settings.EXPORT_RETRY_AFTER)
+
+
+@router.get("/jobs/export")
+async def export_jobs(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="'ndjson' (um JSON por linha) ou 'csv'"),
+    category: Optional[List[str]] = Query(None, description="Categoria (slug OU nome). Pode repetir (OR)."),
+    job_type: Optional[List[str]] = Query(None, description="Tipo (ex.: full_time). Pode repetir (OR)."),
+    location: Optional[List[str]] = Query(None, description="Local exigido. Pode repetir (OR)."),
+    since: Optional[datetime] = Query(
+        None, description="Só vagas novas, alteradas ou expiradas a partir deste instante (ISO 8601)"
+    ),
+    include_expired: bool = Query(False, description="Inclui vagas que já saíram da Remotive (ainda não arquivadas)"),
+    accept_encoding: Optional[str] = Header(None),
+) -> StreamingResponse:
+    """
+    Todas as vagas ativas persistidas (filtradas como em /jobs), em ordem de
+    id, com os mesmos campos dos itens da listagem e 'expired_at'. O corpo é
+    gerado à medida que o cursor do banco avança; com Accept-Encoding: gzip
+    sai comprimido (Content-Encoding: gzip). Para exportações incrementais,
+    guarde o cabeçalho X-Export-Watermark da resposta e passe-o em 'since'
+    na próxima.
+    """
+    gzip = accepts_gzip(accept_encoding)
+    # marca d'água tomada antes da consulta, com folga para um persist_catalog
+    # que ainda não comitou (updated_at é o início da transação dele): a
+    # próxima exportação repete algumas vagas, mas não perde nenhuma
+    watermark = datetime.now(timezone.utc) - EXPORT_WATERMARK_SLACK
+    # a Remotive filtra por slug, mas o banco guarda o nome da categoria
+    by_slug = await _categories_by_slug() if category else {}
+    stmt = export_query(
+        category=[by_slug.get(c.strip().lower(), c) for c in category or ()],
+        job_type=job_type or (),
+        location=location or (),
+        since=since,
+        include_expired=include_expired,
+    )
+    settings = get_settings()
+    sessions = get_sessionmaker()
+    # a vaga só é tomada depois dos awaits acima (um cliente que desconecta
+    # ali não a segura); daqui em diante, ExportStream.open ou o stream a devolvem
+    export_slots = get_export_slots()
+    try:
+        export_slots.acquire()
+    except ExportBusy as exc:
+        raise HTTPException(
+            status_code=429,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+    try:
+        export = await ExportStream.open(
+            sessions,
+            stmt,
+            chunk_size=settings.EXPORT_CHUNK_SIZE,
+            fmt=format,
+            gzip_level=settings.EXPORT_GZIP_LEVEL if gzip else None,
+            on_close=export_slots.release,
+        )
+    except (SQLAlchemyError, OSError) as exc:
+        logger.warning("Exportação indisponível: %s", exc)
+        raise HTTPException(status_code=503, detail="Banco de dados indisponível.") from exc
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="jobs.{format}"',
+        "Vary": "Accept-Encoding",
+        "X-Export-Watermark": watermark.isoformat(),
     }
+    if gzip:
+        # já comprimido aqui: o GZipMiddleware não mexe em respostas com Content-Encoding
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export.chunks(),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+        # fecha o cursor mesmo se o cliente desconectar antes do primeiro chunk
+        background=BackgroundTask(export.close),
+    )
 
 
 @router.get("/jobs/{job_id}")
@@ -139,34 +651,57 @@ async def get_job(
 ) -> Dict[str, Any]:
     """
     Busca uma vaga específica. A API pública não tem endpoint por ID;
-    então buscamos um lote (limit alto) e filtramos localmente (best-effort).
+    então consultamos o catálogo (feed completo, compartilhado entre workers)
+    e, se a vaga for mais nova que ele, o lote mais recente (best-effort).
     """
-    
-    payload = await _get_json("/remote-jobs", params={"limit": MAX_LIMIT})
-    items, _ = _extract_jobs_and_total(payload)
-
-    match = next((j for j in items if j["id"] == job_id or j.get("remotive_id") == job_id), None)
+    snapshot = await get_catalog().get()
+    match = snapshot.get(job_id)
     if match:
         return match
 
-    
-    payload_all = await _get_json("/remote-jobs")
-    items_all, _ = _extract_jobs_and_total(payload_all)
-    match = next((j for j in items_all if j["id"] == job_id or j.get("remotive_id") == job_id), None)
+    payload = await _get_json("/remote-jobs", params={"limit": MAX_LIMIT})
+    items, _ = _extract_jobs_and_total(payload)
+    match = next((j for j in items if j["id"] == job_id or j.get("remotive_id") == job_id), None)
     if not match:
         raise HTTPException(status_code=404, detail="Vaga não encontrada.")
     return match
 
 
-@router.get("/categories")
-async def list_categories() -> List[Dict[str, str]]:
+@router.get("/jobs/{job_id}/similar")
+async def similar_jobs(
+    job_id: str = Path(..., description="ID retornado no campo 'id'/'remotive_id'"),
+    limit: int = Query(10, ge=1, le=SIMILAR_LIMIT),
+) -> Dict[str, Any]:
     """
-    Retorna categorias no formato:
-      [{ "value": "<slug>", "label": "<nome>" }, ...]
+    Vagas parecidas (cosseno TF-IDF sobre título e tags), sem descrição.
+    Só para vagas do catálogo.
     """
-    payload = await _get_json("/remote-jobs/categories")
-    raw = payload.get("jobs") or payload.get("categories") or payload.get("data") or []
+    snapshot = await get_catalog().get()
+    row = snapshot.store.row_of(job_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Vaga não encontrada.")
 
+    cache_key = (snapshot.version, row, limit)
+    cached = get_similar_cache().get(cache_key)
+    if cached is not None:
+        return cached
+
+    store = snapshot.store
+    items = []
+    for other, score in snapshot.similarity.similar(row, limit):
+        item = store.row(other, with_description=False)
+        item["score"] = score
+        items.append(item)
+    result = {"job_id": store.id_at(row), "items": items}
+    get_similar_cache().set(cache_key, result)
+    return result
+
+
+def _normalize_categories(raw: List[Any]) -> List[Dict[str, str]]:
+    """
+    Converte as categorias cruas da Remotive em [{ "value", "label" }],
+    ordenadas pelo nome.
+    """
     out: List[Dict[str, str]] = []
     for c in raw:
         if not isinstance(c, dict):
@@ -183,3 +718,14 @@ async def list_categories() -> List[Dict[str, str]]:
     
     out.sort(key=lambda x: x["label"].lower())
     return out
+
+
+@router.get("/categories")
+async def list_categories() -> List[Dict[str, str]]:
+    """
+    Retorna categorias no formato:
+      [{ "value": "<slug>", "label": "<nome>" }, ...]
+    """
+    payload = await _get_json("/remote-jobs/categories")
+    raw = payload.get("jobs") or payload.get("categories") or payload.get("data") or []
+    return _normalize_categories(raw)
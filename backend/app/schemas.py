@@ -13,6 +13,7 @@ class JobOut(BaseModel):
     url: Optional[str] = None
     posted_at: Optional[datetime] = None
     description: Optional[str] = None
+    expired_at: Optional[datetime] = None  # vaga que já saiu da Remotive
 
     class Config:
         from_attributes = True
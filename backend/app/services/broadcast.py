@@ -0,0 +1,65 @@
+# app/services/broadcast.py
+"""
+Fan-out de eventos para conexões de longa duração (SSE), um por worker.
+
+Os eventos formam uma lista encadeada de futures: cada publish resolve o
+future atual com (evento, próximo future). Uma conexão parada custa só uma
+corrotina esperando um future compartilhado — sem fila por cliente, sem
+cópia do evento (o payload já vem serializado uma vez só). Um cliente
+lento apenas segue a cadeia a partir de onde parou.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Event:
+    version: int
+    since: int  # versão anterior: quem viu 'since' pode aplicar este evento direto
+    frame: bytes  # evento SSE já codificado
+
+
+class Subscription:
+    """Posição de um cliente na cadeia de eventos."""
+
+    def __init__(self, broadcaster: "Broadcaster", tail: "asyncio.Future[Tuple[Event, asyncio.Future]]") -> None:
+        self._broadcaster = broadcaster
+        self._tail = tail
+
+    async def next(self, timeout: float) -> Optional[Event]:
+        """Próximo evento, ou None se nada chegar em 'timeout' segundos (keepalive)."""
+        try:
+            event, self._tail = await asyncio.wait_for(asyncio.shield(self._tail), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return event
+
+    def close(self) -> None:
+        self._broadcaster.subscribers -= 1
+
+
+class Broadcaster:
+    def __init__(self) -> None:
+        self.version = 0  # última versão publicada por este worker
+        self.subscribers = 0
+        self._next: Optional[asyncio.Future[Tuple[Event, asyncio.Future]]] = None
+
+    def _tail(self) -> "asyncio.Future[Tuple[Event, asyncio.Future]]":
+        # criado sob demanda: precisa do event loop em execução
+        if self._next is None:
+            self._next = asyncio.get_running_loop().create_future()
+        return self._next
+
+    def subscribe(self) -> Subscription:
+        """Inscreve a partir do próximo evento (a posição é fixada aqui, não no primeiro next)."""
+        self.subscribers += 1
+        return Subscription(self, self._tail())
+
+    def publish(self, event: Event) -> None:
+        current = self._tail()
+        self._next = current.get_loop().create_future()
+        self.version = event.version
+        current.set_result((event, self._next))
@@ -0,0 +1,269 @@
+# app/services/cache.py
+"""
+Cache compartilhado para payloads da Remotive e para o catálogo normalizado.
+
+Dois backends com a mesma interface:
+
+- MemoryCache: dicionário por processo (padrão; um worker só, ou testes).
+- SharedMemoryCache: arquivos num tmpfs (/dev/shm) visíveis para todos os
+  workers do uvicorn no mesmo host. Um worker atualiza (lock via flock) e os
+  demais só leem o snapshot quando o "version stamp" muda — consultar a versão
+  é um pread de 8 bytes.
+"""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import os
+import stat
+import struct
+import tempfile
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from ..config import get_settings
+
+_HEADER = struct.Struct("<d")  # expira_em (epoch, segundos); 0 = sem expiração
+_VERSION = struct.Struct("<Q")
+
+
+class CacheBackend:
+    """Interface comum dos backends de cache."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def version(self, key: str) -> int:
+        """Versão atual de 'key' (0 se nunca publicada). Deve ser barato."""
+        raise NotImplementedError
+
+    async def bump_version(self, key: str) -> int:
+        raise NotImplementedError
+
+    async def try_lock(self, key: str) -> bool:
+        """Tenta virar o único "refresher" de 'key'. Não bloqueia."""
+        raise NotImplementedError
+
+    async def unlock(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """Cache local ao processo."""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[float, bytes]] = {}
+        self._versions: Dict[str, int] = {}
+        self._locks: set[str] = set()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at and expires_at < time.time():
+            self._data.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl else 0.0
+        self._data[key] = (expires_at, value)
+
+    async def version(self, key: str) -> int:
+        return self._versions.get(key, 0)
+
+    async def bump_version(self, key: str) -> int:
+        self._versions[key] = self._versions.get(key, 0) + 1
+        return self._versions[key]
+
+    async def try_lock(self, key: str) -> bool:
+        if key in self._locks:
+            return False
+        self._locks.add(key)
+        return True
+
+    async def unlock(self, key: str) -> None:
+        self._locks.discard(key)
+
+
+class SharedMemoryCache(CacheBackend):
+    """
+    Cache em arquivos num diretório tmpfs, compartilhado entre processos.
+
+    - valores: cabeçalho (expiração) + bytes, gravados em arquivo temporário e
+      publicados com os.replace (leitores nunca veem escrita parcial);
+    - versões: 8 bytes por chave, incrementados sob flock;
+    - locks: flock não bloqueante, liberado automaticamente se o processo morrer.
+
+    O catálogo é publicado aqui como pickle, então quem escreve no diretório
+    executa código nos workers: ele é criado com modo 0700 e recusado se
+    pertencer a outro usuário, for um symlink ou aceitar escrita de outros.
+    """
+
+    SWEEP_EVERY = 256  # a cada N escritas, remove entradas expiradas
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        self.dir = Path(directory)
+        self.dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self._check_private(self.dir)
+        self._lock_fds: Dict[str, int] = {}
+        self._writes = 0
+
+    @staticmethod
+    def _check_private(directory: Path) -> None:
+        st = os.lstat(directory)
+        if not stat.S_ISDIR(st.st_mode):
+            raise PermissionError(f"{directory} não é um diretório (symlink?)")
+        if st.st_uid != os.getuid():
+            raise PermissionError(f"{directory} pertence a outro usuário (uid {st.st_uid})")
+        if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError(f"{directory} aceita escrita de outros usuários (modo {st.st_mode & 0o777:o})")
+
+    def _path(self, key: str, suffix: str) -> Path:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.dir / f"{digest}{suffix}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key, ".val"), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < _HEADER.size:
+            return None
+        (expires_at,) = _HEADER.unpack_from(data)
+        if expires_at and expires_at < time.time():
+            return None
+        return data[_HEADER.size:]
+
+    def _sweep(self) -> None:
+        now = time.time()
+        for path in self.dir.glob("*.val"):
+            try:
+                with open(path, "rb") as f:
+                    header = f.read(_HEADER.size)
+                (expires_at,) = _HEADER.unpack(header)
+                if expires_at and expires_at < now:
+                    path.unlink()
+            except (OSError, struct.error):
+                continue
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl else 0.0
+        target = self._path(key, ".val")
+        fd, tmp = tempfile.mkstemp(dir=self.dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(expires_at))
+                f.write(value)
+            os.replace(tmp, target)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+        self._writes += 1
+        if self._writes % self.SWEEP_EVERY == 0:
+            self._sweep()
+
+    async def version(self, key: str) -> int:
+        try:
+            fd = os.open(self._path(key, ".ver"), os.O_RDONLY)
+        except FileNotFoundError:
+            return 0
+        try:
+            raw = os.pread(fd, _VERSION.size, 0)
+        finally:
+            os.close(fd)
+        return _VERSION.unpack(raw)[0] if len(raw) == _VERSION.size else 0
+
+    async def bump_version(self, key: str) -> int:
+        fd = os.open(self._path(key, ".ver"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.pread(fd, _VERSION.size, 0)
+            current = _VERSION.unpack(raw)[0] if len(raw) == _VERSION.size else 0
+            os.pwrite(fd, _VERSION.pack(current + 1), 0)
+            return current + 1
+        finally:
+            os.close(fd)  # fechar o fd libera o flock
+
+    async def try_lock(self, key: str) -> bool:
+        if key in self._lock_fds:
+            return False
+        fd = os.open(self._path(key, ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fds[key] = fd
+        return True
+
+    async def unlock(self, key: str) -> None:
+        fd = self._lock_fds.pop(key, None)
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+class LocalLRU:
+    """
+    LRU em memória, por worker, para objetos Python já prontos (ex.: respostas
+    montadas). Não é compartilhado: serve para o que é barato de recomputar a
+    partir do catálogo, mas caro o bastante para não refazer a cada requisição.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        stored_at, value = item
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+def _default_cache_dir() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "jobify-cache")
+
+
+@lru_cache(maxsize=1)
+def get_cache() -> CacheBackend:
+    """Backend configurado em CACHE_BACKEND (instância única por processo)."""
+    settings = get_settings()
+    backend = (settings.CACHE_BACKEND or "memory").lower()
+    if backend == "memory":
+        return MemoryCache()
+    if backend == "shm":
+        return SharedMemoryCache(settings.CACHE_DIR or _default_cache_dir())
+    raise ValueError(f"CACHE_BACKEND inválido: {settings.CACHE_BACKEND!r}")
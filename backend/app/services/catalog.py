@@ -0,0 +1,337 @@
+# app/services/catalog.py
+"""
+Catálogo de vagas (feed completo da Remotive já normalizado).
+
+O catálogo (um JobStore compacto, ver app.services.job_store) é publicado no
+cache compartilhado (app.services.cache) com um version stamp: só um worker
+busca a Remotive a cada CATALOG_TTL; os demais apenas consultam a versão
+(barato) e decodificam o snapshot quando ela muda.
+
+A cada nova versão, quem atualizou grava também o delta em relação à versão
+anterior (ids que entraram e saíram), guardando as últimas 'delta_history'
+versões: é o que alimenta /api/jobs/changes e o stream SSE. Os ouvintes de
+on_rebuild rodam só nesse worker (ex.: persistir o feed no banco uma vez).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import pickle
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .cache import CacheBackend
+from .facets import FacetIndex
+from .job_store import JobStore
+from .profiles import FeedIndex
+from .similarity import SimilarityIndex
+from .sorting import SortIndex
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[List[Dict[str, Any]]]]
+Listener = Callable[["CatalogSnapshot"], None]
+
+
+@dataclass
+class CatalogSnapshot:
+    """Uma versão imutável do catálogo, como vista por este worker."""
+
+    version: int
+    refreshed_at: float
+    store: JobStore
+    facets: FacetIndex
+    sorting: SortIndex
+    similarity: SimilarityIndex
+    feed: FeedIndex
+
+    @classmethod
+    def build(cls, version: int, refreshed_at: float, store: JobStore) -> "CatalogSnapshot":
+        """Monta o snapshot e as estruturas derivadas (facetas, ordenações, similaridade e feed)."""
+        sorting = SortIndex(store)
+        return cls(
+            version=version,
+            refreshed_at=refreshed_at,
+            store=store,
+            facets=FacetIndex(store),
+            sorting=sorting,
+            similarity=SimilarityIndex(store),
+            feed=FeedIndex(store, sorting.rank["newest"]),
+        )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Vaga completa (com descrição) pelo id, ou None."""
+        return self.store.get(job_id)
+
+
+@dataclass
+class CatalogDelta:
+    """Vagas que entraram/saíram do catálogo numa versão."""
+
+    version: int
+    added: List[str]
+    removed: List[str]
+
+    @classmethod
+    def between(cls, version: int, old: JobStore, new: JobStore) -> "CatalogDelta":
+        old_ids = {old.id_at(r) for r in range(len(old))}
+        new_ids = [new.id_at(r) for r in range(len(new))]
+        new_set = set(new_ids)
+        return cls(
+            version=version,
+            added=[i for i in new_ids if i not in old_ids],
+            removed=[i for i in old_ids if i not in new_set],
+        )
+
+    @staticmethod
+    def merge(deltas: List["CatalogDelta"]) -> Tuple[List[str], List[str]]:
+        """
+        Efeito líquido de uma sequência de deltas: (adicionados, removidos).
+        Só conta quem mudou de estado no intervalo: o primeiro evento de um id
+        diz se ele estava no catálogo antes (saiu = estava), o último se está
+        agora. Saiu e voltou, ou entrou e saiu, não aparece.
+        """
+        before: Dict[str, bool] = {}
+        after: Dict[str, bool] = {}
+        for delta in deltas:
+            for job_id in delta.added:
+                before.setdefault(job_id, False)
+                after[job_id] = True
+            for job_id in delta.removed:
+                before.setdefault(job_id, True)
+                after[job_id] = False
+        added = [i for i, present in after.items() if present and not before[i]]
+        removed = [i for i, present in after.items() if not present and before[i]]
+        return added, removed
+
+    def dumps(self) -> bytes:
+        return json.dumps({"version": self.version, "added": self.added, "removed": self.removed}).encode("utf-8")
+
+    @classmethod
+    def loads(cls, body: bytes) -> "CatalogDelta":
+        data = json.loads(body)
+        return cls(int(data["version"]), list(data["added"]), list(data["removed"]))
+
+
+class Catalog:
+    """
+    Acesso ao catálogo compartilhado.
+
+    - get(): devolve o snapshot atual; se estiver velho, dispara a
+      atualização em background e devolve o anterior (só o cold start, sem
+      snapshot nenhum, espera). Um único worker (lock no cache) busca o
+      'loader'; os demais seguem servindo o snapshot anterior.
+    - changes(): deltas publicados desde uma versão.
+    """
+
+    def __init__(
+        self,
+        cache: CacheBackend,
+        loader: Loader,
+        *,
+        name: str = "catalog:v2",
+        ttl: float = 300.0,
+        poll_interval: float = 1.0,
+        wait_timeout: float = 30.0,
+        delta_history: int = 100,
+    ) -> None:
+        self.cache = cache
+        self.loader = loader
+        self.name = name
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.wait_timeout = wait_timeout
+        self.delta_history = delta_history
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._checked_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+        self._load_lock = asyncio.Lock()
+        self._refresh_task: Optional["asyncio.Task[CatalogSnapshot]"] = None
+        self._listeners: List[Listener] = []
+        self._rebuild_listeners: List[Listener] = []
+
+    @property
+    def data_key(self) -> str:
+        return f"{self.name}:data"
+
+    def delta_key(self, version: int) -> str:
+        return f"{self.name}:delta:{version}"
+
+    @property
+    def snapshot(self) -> Optional[CatalogSnapshot]:
+        return self._snapshot
+
+    def subscribe(self, listener: Listener) -> None:
+        """Chamado (neste worker) sempre que uma nova versão passa a valer."""
+        self._listeners.append(listener)
+
+    def on_rebuild(self, listener: Listener) -> None:
+        """Chamado só no worker que buscou a Remotive e publicou a nova versão."""
+        self._rebuild_listeners.append(listener)
+
+    def _set_snapshot(self, snap: CatalogSnapshot) -> CatalogSnapshot:
+        previous = self._snapshot
+        self._snapshot = snap
+        if previous is None or previous.version != snap.version:
+            for listener in self._listeners:
+                listener(snap)
+        return snap
+
+    def _is_stale(self, snap: CatalogSnapshot) -> bool:
+        return time.time() - snap.refreshed_at > self.ttl
+
+    async def get(self) -> CatalogSnapshot:
+        snap = self._snapshot
+        now = time.monotonic()
+        if snap is not None and now - self._checked_at < self.poll_interval:
+            return snap
+        self._checked_at = now
+
+        version = await self.cache.version(self.name)
+        if snap is None or version != snap.version:
+            if snap is not None and self._load_lock.locked():
+                # outra requisição já está montando a versão nova
+                return snap
+            async with self._load_lock:
+                snap = self._snapshot
+                if snap is None or version != snap.version:
+                    loaded = await self._load_published()
+                    if loaded is not None:
+                        snap = self._set_snapshot(loaded)
+
+        if snap is None:
+            return await self.refresh(wait=True)
+        if self._is_stale(snap):
+            # a requisição que percebeu não paga a busca na Remotive
+            self._refresh_in_background()
+        return snap
+
+    def _refresh_in_background(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh_quietly())
+
+    async def _refresh_quietly(self) -> Optional[CatalogSnapshot]:
+        try:
+            return await self.refresh(wait=False)
+        except Exception as exc:  # noqa: BLE001
+            # segue servindo o snapshot atual; a próxima leitura tenta de novo
+            logger.warning("Falha ao atualizar o catálogo: %s", exc)
+            return None
+
+    async def refresh(self, *, wait: bool = True) -> CatalogSnapshot:
+        """
+        Atualiza o catálogo a partir do loader, se este worker conseguir o lock.
+        Sem o lock: devolve o snapshot atual ou, se não houver (wait=True),
+        espera o worker que está atualizando publicar a nova versão.
+        """
+        snap = self._snapshot
+        if snap is not None and self._refresh_lock.locked():
+            # outra corrotina deste worker já está atualizando
+            return snap
+        async with self._refresh_lock:
+            # outra corrotina deste worker pode ter atualizado enquanto esperávamos
+            snap = self._snapshot
+            if snap is not None and not self._is_stale(snap):
+                return snap
+
+            if await self.cache.try_lock(self.name):
+                try:
+                    return await self._rebuild()
+                finally:
+                    await self.cache.unlock(self.name)
+
+            if snap is not None and not wait:
+                return snap
+            return await self._wait_for_publish(snap.version if snap else 0)
+
+    async def changes(self, snapshot: CatalogSnapshot, since: int) -> Optional[List[CatalogDelta]]:
+        """
+        Deltas de 'since' (exclusive) até a versão do snapshot, em ordem.
+        None se o intervalo não puder ser reconstruído (versão futura, mais
+        antiga que o histórico ou delta expirado): o cliente deve recarregar.
+        """
+        if since > snapshot.version or since < snapshot.version - self.delta_history:
+            return None
+        deltas: List[CatalogDelta] = []
+        for version in range(since + 1, snapshot.version + 1):
+            body = await self.cache.get(self.delta_key(version))
+            if body is None:
+                return None
+            try:
+                deltas.append(CatalogDelta.loads(body))
+            except (ValueError, KeyError, TypeError):
+                return None
+        return deltas
+
+    async def _rebuild(self) -> CatalogSnapshot:
+        jobs = await self.loader()
+        # montagens pesadas (centenas de ms com dezenas de milhares de vagas)
+        # rodam numa thread: o event loop segue atendendo requisições e streams
+        store = await asyncio.to_thread(JobStore.from_jobs, jobs)
+        version = await self.cache.version(self.name) + 1
+        refreshed_at = time.time()
+
+        previous = self._snapshot.store if self._snapshot and self._snapshot.version == version - 1 else None
+        if previous is None:
+            published = await self._load_published_state()
+            previous = published[2] if published and published[0] == version - 1 else None
+        if previous is not None:
+            # o delta vai antes da nova versão: quem a vir já encontra o delta
+            delta = await asyncio.to_thread(CatalogDelta.between, version, previous, store)
+            await self.cache.set(
+                self.delta_key(version),
+                delta.dumps(),
+                ttl=max(self.ttl, 60.0) * self.delta_history,
+            )
+
+        body = await asyncio.to_thread(
+            pickle.dumps, (version, refreshed_at, store), protocol=pickle.HIGHEST_PROTOCOL
+        )
+        await self.cache.set(self.data_key, body)
+        await self.cache.bump_version(self.name)
+        built = await asyncio.to_thread(CatalogSnapshot.build, version, refreshed_at, store)
+        snap = self._set_snapshot(built)
+        for listener in self._rebuild_listeners:
+            listener(snap)
+        return snap
+
+    async def _load_published_state(self) -> Optional[Tuple[int, float, JobStore]]:
+        body = await self.cache.get(self.data_key)
+        if body is None:
+            return None
+        try:
+            version, refreshed_at, store = await asyncio.to_thread(pickle.loads, body)
+        except Exception as exc:  # noqa: BLE001
+            # formato antigo ou arquivo truncado (EOFError, ImportError, ...):
+            # será regravado no próximo refresh
+            logger.warning("Snapshot do catálogo ilegível no cache: %r", exc)
+            return None
+        return int(version), float(refreshed_at), store
+
+    async def _load_published(self) -> Optional[CatalogSnapshot]:
+        state = await self._load_published_state()
+        if state is None:
+            return None
+        return await asyncio.to_thread(CatalogSnapshot.build, *state)
+
+    async def _wait_for_publish(self, current_version: int) -> CatalogSnapshot:
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            await asyncio.sleep(0.1)
+            if await self.cache.version(self.name) != current_version:
+                loaded = await self._load_published()
+                if loaded is not None:
+                    return self._set_snapshot(loaded)
+            # o worker que tinha o lock não publicou a tempo: atualiza por conta
+            # própria, mas também sob o lock (duas montagens simultâneas
+            # carimbariam os dados com uma versão e o contador com outra)
+            if time.monotonic() >= deadline and await self.cache.try_lock(self.name):
+                try:
+                    loaded = None
+                    if await self.cache.version(self.name) != current_version:
+                        loaded = await self._load_published()
+                    return self._set_snapshot(loaded) if loaded is not None else await self._rebuild()
+                finally:
+                    await self.cache.unlock(self.name)
@@ -0,0 +1,259 @@
+# app/services/export.py
+"""
+Exportação em massa das vagas persistidas (NDJSON ou CSV).
+
+A consulta roda num cursor do lado do servidor (session.stream com
+yield_per): o Postgres entrega as linhas em lotes, cada lote vira um único
+bloco de bytes e, se o cliente aceitar, passa por um compressor gzip
+incremental (zlib). A memória usada fica em um lote, qualquer que seja o
+tamanho da tabela. O cursor prende uma conexão do pool enquanto o cliente
+baixa, por isso o número de exportações simultâneas por worker é limitado.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Sequence
+
+from sqlalchemy import Select, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+
+from ..models import Category, Job
+
+# mesmos campos (e nomes) dos itens de /api/jobs
+EXPORT_FIELDS = (
+    "id",
+    "remotive_id",
+    "title",
+    "company",
+    "category",
+    "job_type",
+    "location",
+    "url",
+    "published_at",
+    "tags",
+    "description",
+    "expired_at",
+)
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+class ExportBusy(Exception):
+    """Já há exportações demais abertas neste worker."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Muitas exportações em andamento; tente novamente em instantes.")
+        self.retry_after = retry_after
+
+
+class ExportSlots:
+    """Limite de exportações abertas ao mesmo tempo (cada uma segura uma conexão)."""
+
+    def __init__(self, limit: int, *, retry_after: int) -> None:
+        self.limit = max(1, limit)
+        self.retry_after = retry_after
+        self.active = 0
+
+    def acquire(self) -> None:
+        if self.active >= self.limit:
+            raise ExportBusy(self.retry_after)
+        self.active += 1
+
+    def release(self) -> None:
+        self.active = max(0, self.active - 1)
+
+
+def _any_of(column: Any, values: Sequence[str]) -> Any:
+    # mesma normalização dos filtros da listagem (FacetIndex.mask_for)
+    return func.lower(func.trim(column)).in_([v.strip().lower() for v in values])
+
+
+def export_query(
+    *,
+    category: Sequence[str] = (),
+    job_type: Sequence[str] = (),
+    location: Sequence[str] = (),
+    since: Optional[datetime] = None,
+    include_expired: bool = False,
+) -> Select:
+    """
+    SELECT das vagas a exportar, em ordem de id (estável entre exportações).
+    'category' são nomes de categoria (o router traduz os slugs); categoria,
+    tipo e local são comparados como na listagem, sem diferenciar
+    maiúsculas nem espaços nas pontas. 'since' pega as vagas novas, com conteúdo
+    alterado ou de volta ao feed (updated_at) ou expiradas a partir daquele
+    instante.
+    """
+    category_name = func.coalesce(Category.name, Job.raw["category"].astext)
+    job_type_col = Job.raw["job_type"].astext
+    stmt = select(
+        Job.id,
+        Job.remotive_id,
+        Job.title,
+        Job.company,
+        category_name.label("category"),
+        job_type_col.label("job_type"),
+        Job.location,
+        Job.url,
+        Job.posted_at,
+        Job.raw["tags"].label("tags"),
+        Job.description,
+        Job.expired_at,
+    ).outerjoin(Category, Category.id == Job.category_id)
+    if not include_expired:
+        # só as ativas: percorre o índice parcial ix_jobs_active, em ordem de id
+        stmt = stmt.where(Job.expired_at.is_(None))
+    if category:
+        stmt = stmt.where(_any_of(category_name, category))
+    if job_type:
+        stmt = stmt.where(_any_of(job_type_col, job_type))
+    if location:
+        stmt = stmt.where(_any_of(Job.location, location))
+    if since is not None:
+        # last_seen não serve: é regravado periodicamente mesmo sem mudança
+        stmt = stmt.where(or_(Job.updated_at >= since, Job.expired_at >= since))
+    return stmt.order_by(Job.id)
+
+
+def _record(row: Any) -> Dict[str, Any]:
+    tags = row.tags if isinstance(row.tags, list) else []
+    return {
+        "id": str(row.id),
+        "remotive_id": row.remotive_id or "",
+        "title": row.title,
+        "company": row.company,
+        "category": row.category,
+        "job_type": row.job_type,
+        "location": row.location,
+        "url": row.url,
+        "published_at": row.posted_at.isoformat() if row.posted_at else None,
+        "tags": [str(t) for t in tags],
+        "description": row.description,
+        "expired_at": row.expired_at.isoformat() if row.expired_at else None,
+    }
+
+
+def _ndjson_encoder() -> Callable[[Sequence[Any]], bytes]:
+    def encode(rows: Sequence[Any]) -> bytes:
+        lines = [json.dumps(_record(r), ensure_ascii=False, separators=(",", ":")) for r in rows]
+        lines.append("")
+        return "\n".join(lines).encode("utf-8")
+
+    return encode
+
+
+def _csv_encoder() -> Callable[[Sequence[Any]], bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def encode(rows: Sequence[Any]) -> bytes:
+        for r in rows:
+            record = _record(r)
+            record["tags"] = ", ".join(record["tags"])
+            writer.writerow([record[f] for f in EXPORT_FIELDS])
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    return encode
+
+
+class ExportStream:
+    """
+    Cursor aberto de uma exportação. Consumir chunks() (ou chamar close())
+    devolve a conexão ao pool; close() pode ser chamado mais de uma vez.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        result: AsyncResult,
+        *,
+        fmt: str,
+        gzip_level: Optional[int],
+        on_close: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.session = session
+        self.result = result
+        self.fmt = fmt
+        self.gzip_level = gzip_level
+        self._on_close = on_close
+        self._closed = False
+
+    @classmethod
+    async def open(
+        cls,
+        session_factory: Callable[[], AsyncSession],
+        stmt: Select,
+        *,
+        chunk_size: int,
+        fmt: str,
+        gzip_level: Optional[int] = None,
+        on_close: Optional[Callable[[], None]] = None,
+    ) -> "ExportStream":
+        """Executa a consulta (erros de banco saem aqui, antes de a resposta começar)."""
+        session: Optional[AsyncSession] = None
+        try:
+            session = session_factory()
+            result = await session.stream(stmt.execution_options(yield_per=max(1, chunk_size)))
+        except BaseException:
+            if session is not None:
+                await session.close()
+            if on_close is not None:
+                on_close()
+            raise
+        return cls(session, result, fmt=fmt, gzip_level=gzip_level, on_close=on_close)
+
+    async def chunks(self) -> AsyncIterator[bytes]:
+        encode = _csv_encoder() if self.fmt == "csv" else _ndjson_encoder()
+        # wbits=31: cabeçalho e trailer gzip (Content-Encoding: gzip)
+        gz = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31) if self.gzip_level is not None else None
+
+        def emit(data: bytes) -> bytes:
+            if gz is None:
+                return data
+            # SYNC_FLUSH por lote: o cliente descomprime à medida que recebe
+            return gz.compress(data) + gz.flush(zlib.Z_SYNC_FLUSH)
+
+        try:
+            if self.fmt == "csv":
+                yield emit((",".join(EXPORT_FIELDS) + "\r\n").encode("utf-8"))
+            async for partition in self.result.partitions():
+                yield emit(encode(partition))
+            if gz is not None:
+                yield gz.flush()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self.result.close()
+        finally:
+            await self.session.close()
+            if self._on_close is not None:
+                self._on_close()
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """True se o Accept-Encoding aceita gzip (q=0 recusa explicitamente)."""
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        q = params.strip().lower()
+        if q.startswith("q="):
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+        return True
+    return False
+
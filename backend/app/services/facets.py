@@ -0,0 +1,144 @@
+# app/services/facets.py
+"""
+Índice invertido do catálogo para filtros por facetas.
+
+Montado junto com cada snapshot do catálogo: para cada valor de categoria,
+tipo, local e tag guardamos um bitmap (int do Python, bit i = linha i do
+JobStore). Filtros viram AND/OR de bitmaps e as contagens por faceta são
+popcounts — nada de chamadas à Remotive nem COUNT no banco por requisição.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .job_store import JobStore
+
+# faceta -> coluna do JobStore ("tag" é multivalorada)
+FACETS: Dict[str, str] = {
+    "category": "category",
+    "job_type": "job_type",
+    "location": "location",
+    "tag": "tags",
+}
+
+
+def bitmap_from_rows(rows: Iterable[int], size: int) -> int:
+    """Bitmap com os bits das linhas informadas ligados."""
+    buf = bytearray((size + 7) // 8)
+    for r in rows:
+        buf[r >> 3] |= 1 << (r & 7)
+    return int.from_bytes(buf, "little")
+
+
+def select_rows(mask: int, start: int, count: int) -> List[int]:
+    """
+    Linhas (em ordem crescente) dos bits ligados em 'mask', pulando os
+    'start' primeiros e devolvendo até 'count'. Percorre palavras de 64 bits
+    e usa popcount para pular palavras inteiras.
+    """
+    if count <= 0 or not mask:
+        return []
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    out: List[int] = []
+    skip = start
+    for offset in range(0, len(data), 8):
+        word = int.from_bytes(data[offset:offset + 8], "little")
+        if not word:
+            continue
+        if skip:
+            bits = word.bit_count()
+            if skip >= bits:
+                skip -= bits
+                continue
+        base = offset * 8
+        while word:
+            low = word & -word
+            if skip:
+                skip -= 1
+            else:
+                out.append(base + low.bit_length() - 1)
+                if len(out) == count:
+                    return out
+            word ^= low
+    return out
+
+
+class FacetIndex:
+    """Bitmaps por valor de faceta sobre um JobStore."""
+
+    def __init__(self, store: JobStore) -> None:
+        self.size = len(store)
+        self.all_mask = (1 << self.size) - 1
+        self.labels: Dict[str, List[Optional[str]]] = {}
+        self.bitmaps: Dict[str, List[int]] = {}
+        self._lookup: Dict[str, Dict[str, int]] = {}
+
+        for facet, column in FACETS.items():
+            if column == "tags":
+                labels = store.tag_vocab
+                rows_by_code: List[List[int]] = [[] for _ in labels]
+                offsets, codes = store.tag_offsets, store.tag_codes
+                for row in range(self.size):
+                    for code in codes[offsets[row]:offsets[row + 1]]:
+                        rows_by_code[code].append(row)
+            else:
+                labels = store.vocab[column]
+                rows_by_code = [[] for _ in labels]
+                for row, code in enumerate(store.codes[column]):
+                    rows_by_code[code].append(row)
+
+            self.labels[facet] = labels
+            self.bitmaps[facet] = [bitmap_from_rows(rows, self.size) for rows in rows_by_code]
+            self._lookup[facet] = {
+                label.strip().lower(): code
+                for code, label in enumerate(labels)
+                if label is not None
+            }
+
+    def has_value(self, facet: str, value: str) -> bool:
+        return value.strip().lower() in self._lookup[facet]
+
+    def mask_for(self, facet: str, values: Sequence[str], *, match_all: bool = False) -> int:
+        """
+        Bitmap das vagas com algum dos valores (OR) ou, com match_all, com
+        todos eles (AND). Valores desconhecidos não casam com nada.
+        """
+        lookup = self._lookup[facet]
+        bitmaps = self.bitmaps[facet]
+        mask = self.all_mask if match_all else 0
+        for value in values:
+            code = lookup.get(value.strip().lower())
+            bitmap = bitmaps[code] if code is not None else 0
+            mask = mask & bitmap if match_all else mask | bitmap
+        return mask
+
+    def counts(
+        self,
+        base: int,
+        facet_masks: Dict[str, int],
+        *,
+        limit: Optional[int] = None,
+    ) -> Dict[str, List[Dict[str, object]]]:
+        """
+        Contagens por valor de cada faceta. Para a faceta F, conta sobre
+        'base' combinada com os filtros das *outras* facetas (facetas
+        disjuntivas: escolher uma categoria não zera as demais categorias).
+        """
+        out: Dict[str, List[Dict[str, object]]] = {}
+        for facet in FACETS:
+            mask = base
+            for other, other_mask in facet_masks.items():
+                if other != facet:
+                    mask &= other_mask
+            labels = self.labels[facet]
+            items = []
+            if mask:
+                for code, bitmap in enumerate(self.bitmaps[facet]):
+                    if code == 0:
+                        continue
+                    n = (bitmap & mask).bit_count()
+                    if n:
+                        items.append({"value": labels[code], "count": n})
+            items.sort(key=lambda x: (-x["count"], str(x["value"]).lower()))  # type: ignore[operator]
+            out[facet] = items[:limit] if limit else items
+        return out
@@ -0,0 +1,207 @@
+# app/services/job_store.py
+"""
+Armazenamento compacto do catálogo em memória.
+
+Em vez de uma lista de dicts (chaves repetidas em cada vaga, strings de
+categoria/empresa/tipo duplicadas milhares de vezes), as vagas ficam em
+colunas:
+
+- campos categóricos (empresa, categoria, tipo, local) viram códigos num
+  array('I') apontando para um vocabulário único por coluna;
+- tags em formato CSR (códigos + offsets por linha);
+- descrições comprimidas com zlib, descomprimidas só quando a vaga é lida
+  com detalhes;
+- ids numéricos da Remotive num array ordenado (busca binária id -> linha),
+  sem um dict de strings por vaga.
+
+Cada vaga é remontada no formato de _normalize_job só quando é devolvida.
+"""
+from __future__ import annotations
+
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional
+
+_CATEGORICAL = ("company", "category", "job_type", "location")
+_FORMAT = 1
+
+
+def _numeric(job_id: str) -> Optional[int]:
+    """Id da Remotive como inteiro, se o texto for exatamente um inteiro >= 0."""
+    if job_id.isascii() and job_id.isdigit() and (job_id == "0" or job_id[0] != "0"):
+        return int(job_id)
+    return None
+
+
+class _Vocabulary:
+    """Valores distintos de uma coluna categórica; o código 0 é None."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self) -> None:
+        self.values: List[Optional[str]] = [None]
+        self._codes: Dict[str, int] = {}
+
+    def code(self, value: Any) -> int:
+        if value is None:
+            return 0
+        value = str(value)
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self.values.append(value)
+            self._codes[value] = code
+        return code
+
+
+class JobStore:
+    """Catálogo imutável em colunas. Construa com JobStore.from_jobs()."""
+
+    __slots__ = (
+        "size",
+        "row_ids",
+        "remotive_ids",
+        "titles",
+        "urls",
+        "published_at",
+        "codes",
+        "vocab",
+        "tag_codes",
+        "tag_offsets",
+        "tag_vocab",
+        "descriptions",
+        "sorted_ids",
+        "sorted_rows",
+        "other_ids",
+        "other_rows",
+    )
+
+    def __init__(self) -> None:
+        self.size = 0
+        self.row_ids = array("q")  # id numérico por linha; -1 = id não numérico
+        self.remotive_ids = array("B")  # 1 = remotive_id igual ao id
+        self.titles: List[str] = []
+        self.urls: List[Optional[str]] = []
+        self.published_at: List[Optional[str]] = []
+        self.codes: Dict[str, array] = {name: array("I") for name in _CATEGORICAL}
+        self.vocab: Dict[str, List[Optional[str]]] = {}
+        self.tag_codes = array("I")
+        self.tag_offsets = array("I", [0])
+        self.tag_vocab: List[Optional[str]] = []
+        self.descriptions: List[Optional[bytes]] = []
+        self.sorted_ids = array("q")
+        self.sorted_rows = array("I")
+        self.other_ids: Dict[str, int] = {}
+        self.other_rows: Dict[int, str] = {}
+
+    # ------------------------------------------------------------------ build
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Dict[str, Any]]) -> "JobStore":
+        """Constrói a partir de vagas no formato de _normalize_job."""
+        store = cls()
+        vocabs = {name: _Vocabulary() for name in _CATEGORICAL}
+        tags = _Vocabulary()
+        titles = _Vocabulary()  # só para internar títulos repetidos
+        numeric: List[tuple[int, int]] = []
+
+        for row, job in enumerate(jobs):
+            job_id = str(job.get("id") or "")
+            numeric_id = _numeric(job_id)
+            if numeric_id is not None:
+                store.row_ids.append(numeric_id)
+                numeric.append((numeric_id, row))
+            else:
+                store.row_ids.append(-1)
+                store.other_ids[job_id] = row
+                store.other_rows[row] = job_id
+            store.remotive_ids.append(1 if job_id and job.get("remotive_id") == job_id else 0)
+            store.titles.append(titles.values[titles.code(job.get("title") or "")] or "")
+            store.urls.append(job.get("url"))
+            store.published_at.append(job.get("published_at"))
+            for name in _CATEGORICAL:
+                store.codes[name].append(vocabs[name].code(job.get(name)))
+            for tag in job.get("tags") or []:
+                store.tag_codes.append(tags.code(tag))
+            store.tag_offsets.append(len(store.tag_codes))
+            description = job.get("description")
+            store.descriptions.append(
+                zlib.compress(description.encode("utf-8"), 6) if description else None
+            )
+
+        numeric.sort()
+        store.sorted_ids = array("q", (i for i, _ in numeric))
+        store.sorted_rows = array("I", (r for _, r in numeric))
+        store.vocab = {name: vocabs[name].values for name in _CATEGORICAL}
+        store.tag_vocab = tags.values
+        store.size = len(store.row_ids)
+        return store
+
+    # ------------------------------------------------------------ serialização
+
+    # usado pelo pickle ao publicar o catálogo no cache compartilhado
+    def __getstate__(self) -> tuple[int, Dict[str, Any]]:
+        return _FORMAT, {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state: tuple[int, Dict[str, Any]]) -> None:
+        fmt, values = state
+        if fmt != _FORMAT:
+            raise ValueError(f"Formato de catálogo incompatível: {fmt}")
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    # ----------------------------------------------------------------- leitura
+
+    def __len__(self) -> int:
+        return self.size
+
+    def row_of(self, job_id: str) -> Optional[int]:
+        """Linha da vaga com esse id (ou None)."""
+        numeric_id = _numeric(job_id)
+        if numeric_id is None:
+            return self.other_ids.get(job_id)
+        pos = bisect_left(self.sorted_ids, numeric_id)
+        if pos < len(self.sorted_ids) and self.sorted_ids[pos] == numeric_id:
+            return self.sorted_rows[pos]
+        return None
+
+    def id_at(self, row: int) -> str:
+        numeric_id = self.row_ids[row]
+        return str(numeric_id) if numeric_id >= 0 else self.other_rows[row]
+
+    def value(self, column: str, row: int) -> Optional[str]:
+        return self.vocab[column][self.codes[column][row]]
+
+    def tags_at(self, row: int) -> List[str]:
+        start, end = self.tag_offsets[row], self.tag_offsets[row + 1]
+        vocab = self.tag_vocab
+        return [vocab[c] for c in self.tag_codes[start:end]]  # type: ignore[misc]
+
+    def description_at(self, row: int) -> Optional[str]:
+        blob = self.descriptions[row]
+        return zlib.decompress(blob).decode("utf-8") if blob is not None else None
+
+    def row(self, row: int, *, with_description: bool = True) -> Dict[str, Any]:
+        """Vaga no formato de _normalize_job."""
+        job_id = self.id_at(row)
+        return {
+            "id": job_id,
+            "remotive_id": job_id if self.remotive_ids[row] else "",
+            "title": self.titles[row],
+            "company": self.value("company", row),
+            "category": self.value("category", row),
+            "job_type": self.value("job_type", row),
+            "location": self.value("location", row),
+            "url": self.urls[row],
+            "published_at": self.published_at[row],
+            "description": self.description_at(row) if with_description else None,
+            "is_favorite": False,
+            "tags": self.tags_at(row),
+        }
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self.row_of(job_id)
+        return self.row(row) if row is not None else None
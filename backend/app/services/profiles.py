@@ -0,0 +1,266 @@
+# app/services/profiles.py
+"""
+Feed personalizado a partir dos favoritos.
+
+- UserProfile: pesos por característica (categoria, tags, empresa) somados
+  sobre as vagas favoritas do usuário. É atualizado incrementalmente a cada
+  add/remove (soma/subtrai as características daquela vaga); 'members'
+  guarda quem já foi somado, para repetir um toggle não contar duas vezes.
+- ProfileStore: perfis no cache compartilhado (todos os workers veem a mesma
+  versão); a version stamp de cada perfil identifica o feed já calculado.
+  Montagem e atualizações de um usuário rodam sob o mesmo lock, e cada
+  atualização relê do banco o estado atual da vaga em vez de confiar na
+  direção do toggle: tarefas em background que terminam fora de ordem
+  não deixam o perfil divergir dos favoritos.
+- FeedIndex: montado com o snapshot do catálogo; pontua todas as vagas
+  contra um perfil com operações vetorizadas (NumPy) sobre os códigos do
+  JobStore e devolve o top-k.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .cache import CacheBackend
+from .job_store import JobStore
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# peso de cada tipo de característica na pontuação
+FEATURE_WEIGHTS: Dict[str, float] = {"category": 1.0, "company": 0.8, "tag": 0.6}
+
+# desempate entre vagas de mesma pontuação: mais novas primeiro
+RECENCY_WEIGHT = 0.05
+
+# vaga favorita como entra no perfil: (id no catálogo, características)
+Member = Tuple[str, List[str]]
+
+
+def _label(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def job_features(category: Optional[str], company: Optional[str], tags: Iterable[str]) -> List[str]:
+    """Características de uma vaga no formato das chaves do perfil ("tipo:valor")."""
+    out = []
+    if category:
+        out.append(f"category:{_label(category)}")
+    if company:
+        out.append(f"company:{_label(company)}")
+    out.extend(sorted({f"tag:{_label(t)}" for t in tags if t}))
+    return out
+
+
+def raw_job_features(company: Optional[str], raw: Optional[Dict[str, Any]]) -> List[str]:
+    """Características a partir de uma vaga persistida (coluna company + JSON da Remotive)."""
+    raw = raw or {}
+    tags = raw.get("tags") or []
+    return job_features(
+        raw.get("category"),
+        company or raw.get("company_name"),
+        [str(t) for t in tags] if isinstance(tags, list) else [],
+    )
+
+
+@dataclass
+class UserProfile:
+    # job_id (do banco) -> (id no catálogo, características)
+    members: Dict[str, Tuple[str, List[str]]] = field(default_factory=dict)
+    weights: Dict[str, float] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def add(self, job_id: str, catalog_id: str, features: List[str]) -> bool:
+        if job_id in self.members:
+            return False
+        self.members[job_id] = (catalog_id, features)
+        for f in features:
+            self.weights[f] = self.weights.get(f, 0.0) + 1.0
+        return True
+
+    def remove(self, job_id: str) -> bool:
+        member = self.members.pop(job_id, None)
+        if member is None:
+            return False
+        for f in member[1]:
+            left = self.weights.get(f, 0.0) - 1.0
+            if left > 0:
+                self.weights[f] = left
+            else:
+                self.weights.pop(f, None)
+        return True
+
+    def catalog_ids(self) -> List[str]:
+        return [catalog_id for catalog_id, _ in self.members.values() if catalog_id]
+
+    def dumps(self) -> bytes:
+        return json.dumps({"members": self.members, "weights": self.weights}).encode("utf-8")
+
+    @classmethod
+    def loads(cls, body: bytes) -> "UserProfile":
+        data = json.loads(body)
+        members = {k: (str(v[0]), list(v[1])) for k, v in data.get("members", {}).items()}
+        return cls(members=members, weights={k: float(v) for k, v in data.get("weights", {}).items()})
+
+
+class ProfileStore:
+    """Perfis no cache compartilhado, com atualização sob lock por usuário."""
+
+    def __init__(self, cache: CacheBackend, *, ttl: float, lock_timeout: float = 1.0) -> None:
+        self.cache = cache
+        # expirado, o perfil é remontado a partir do banco (corrige qualquer desvio)
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+
+    @staticmethod
+    def key(user_id: int) -> str:
+        return f"profile:{user_id}"
+
+    async def version(self, user_id: int) -> int:
+        return await self.cache.version(self.key(user_id))
+
+    async def get(self, user_id: int) -> Optional[UserProfile]:
+        body = await self.cache.get(self.key(user_id))
+        if not body:
+            return None
+        try:
+            return UserProfile.loads(body)
+        except (ValueError, TypeError, KeyError, IndexError):
+            return None
+
+    async def put(self, user_id: int, profile: UserProfile) -> int:
+        key = self.key(user_id)
+        await self.cache.set(key, profile.dumps(), ttl=self.ttl)
+        return await self.cache.bump_version(key)
+
+    async def invalidate(self, user_id: int) -> None:
+        """Descarta o perfil: o próximo feed monta do banco."""
+        key = self.key(user_id)
+        await self.cache.set(key, b"", ttl=1)
+        await self.cache.bump_version(key)
+
+    async def _acquire(self, key: str) -> bool:
+        deadline = time.monotonic() + self.lock_timeout
+        while not await self.cache.try_lock(key):
+            if time.monotonic() > deadline:
+                return False
+            await asyncio.sleep(0.005)
+        return True
+
+    async def update(
+        self, user_id: int, job_id: str, current: Callable[[], Awaitable[Optional[Member]]]
+    ) -> None:
+        """
+        Reaplica ao perfil o estado atual de uma vaga: 'current' lê (sob o
+        lock do usuário) se ela é favorita e devolve o Member, ou None. Sem
+        perfil no cache não há o que atualizar: o próximo feed monta do banco.
+        """
+        key = self.key(user_id)
+        if not await self._acquire(key):
+            # não deu para atualizar com segurança: descarta o perfil (e uma
+            # montagem em andamento não o publica, pela versão)
+            await self.invalidate(user_id)
+            return
+        try:
+            profile = await self.get(user_id)
+            if profile is None:
+                return
+            member = await current()
+            changed = profile.add(job_id, *member) if member is not None else profile.remove(job_id)
+            if changed:
+                await self.put(user_id, profile)
+        finally:
+            await self.cache.unlock(key)
+
+    async def rebuild(self, user_id: int, load: Callable[[], Awaitable[UserProfile]]) -> UserProfile:
+        """
+        Monta o perfil com 'load' (do banco) e o publica, sob o lock do
+        usuário: toggles durante a montagem esperam e são aplicados depois.
+        Sem o lock, ou se o perfil foi invalidado no meio, devolve sem publicar.
+        """
+        key = self.key(user_id)
+        if not await self._acquire(key):
+            return await load()
+        try:
+            version = await self.version(user_id)
+            profile = await load()
+            if await self.version(user_id) == version:
+                await self.put(user_id, profile)
+            return profile
+        finally:
+            await self.cache.unlock(key)
+
+
+class FeedIndex:
+    """Códigos de categoria, empresa e tags do catálogo como arrays NumPy."""
+
+    def __init__(self, store: JobStore, newest_rank: Sequence[int]) -> None:
+        # NumPy só quando o índice é montado (ver SimilarityIndex)
+        import numpy as np
+
+        self.size = n = len(store)
+        self.codes = {
+            "category": np.asarray(store.codes["category"], dtype=np.int64),
+            "company": np.asarray(store.codes["company"], dtype=np.int64),
+        }
+        self.tag_codes = np.asarray(store.tag_codes, dtype=np.int64)
+        offsets = np.asarray(store.tag_offsets, dtype=np.int64)
+        self.tag_rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+        self.vocab_size = {
+            "category": len(store.vocab["category"]),
+            "company": len(store.vocab["company"]),
+            "tag": len(store.tag_vocab),
+        }
+        self.lookup: Dict[str, Dict[str, int]] = {
+            "category": self._lookup(store.vocab["category"]),
+            "company": self._lookup(store.vocab["company"]),
+            "tag": self._lookup(store.tag_vocab),
+        }
+        rank = np.asarray(newest_rank, dtype=np.float64)
+        self.recency = 1.0 - rank / max(n, 1) if n else rank
+
+    @staticmethod
+    def _lookup(labels: List[Optional[str]]) -> Dict[str, int]:
+        return {_label(label): code for code, label in enumerate(labels) if label}
+
+    def _weights(self, kind: str, profile: UserProfile) -> np.ndarray:
+        import numpy as np
+
+        w = np.zeros(self.vocab_size[kind], dtype=np.float64)
+        lookup = self.lookup[kind]
+        scale = FEATURE_WEIGHTS[kind] / max(len(profile), 1)
+        prefix = kind + ":"
+        for feature, count in profile.weights.items():
+            if feature.startswith(prefix):
+                code = lookup.get(feature[len(prefix):])
+                if code is not None:
+                    w[code] += count * scale
+        return w
+
+    def top(self, profile: UserProfile, k: int, exclude: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """Top-k linhas por afinidade com o perfil (sem as de 'exclude')."""
+        if not self.size or k <= 0:
+            return []
+        import numpy as np
+
+        scores = np.zeros(self.size, dtype=np.float64)
+        for kind, codes in self.codes.items():
+            scores += self._weights(kind, profile)[codes]
+        if len(self.tag_codes):
+            tag_w = self._weights("tag", profile)[self.tag_codes]
+            scores += np.bincount(self.tag_rows, weights=tag_w, minlength=self.size)
+
+        excluded = np.fromiter(exclude, dtype=np.int64)
+        scores[excluded] = 0.0
+        candidates = np.flatnonzero(scores > 0.0)
+        ranked = scores[candidates] + RECENCY_WEIGHT * self.recency[candidates]
+        if len(candidates) > k:
+            top = np.argpartition(-ranked, k - 1)[:k]
+            candidates, ranked = candidates[top], ranked[top]
+        order = np.lexsort((candidates, -ranked))
+        return [(int(candidates[i]), round(float(ranked[i]), 4)) for i in order]
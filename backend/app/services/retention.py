@@ -0,0 +1,275 @@
+# app/services/retention.py
+"""
+Histórico de vagas: arquivamento e retenção.
+
+jobify.jobs fica só com o que o caminho quente usa: vagas ativas
+(expired_at IS NULL, com índice parcial) e expiradas recentes ou
+favoritadas — favorites tem FK para jobs.id, e uma tabela particionada
+exigiria a chave de partição na PK (e na FK). As expiradas há mais de
+'archive_after' sem favoritos são movidas para jobify.job_history,
+particionada por mês de publicação (RANGE em posted_at, partições
+job_history_AAAA_MM criadas sob demanda). Partições mais antigas que
+'keep_months' são desanexadas (DETACH PARTITION): viram tabelas comuns,
+prontas para pg_dump/arquivo frio, e com 'drop' são apagadas.
+
+Cada etapa roda sob pg_try_advisory_xact_lock: com vários workers ou
+réplicas, só um executa por vez e os outros pulam a rodada.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, List, Optional
+
+from sqlalchemy import delete, exists, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Favorite, Job, JobHistory
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "jobify"
+PARTITION_PREFIX = "job_history_"
+_PARTITION_NAME = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})_(\d{{2}})$")
+
+RETENTION_LOCK = "jobify.retention"
+
+# colunas copiadas de jobs para job_history (mesmos nomes)
+_COPIED = (
+    "id", "remotive_id", "title", "company", "location", "url",
+    "description", "raw", "category_id", "first_seen", "last_seen", "expired_at",
+)
+
+
+@dataclass
+class RetentionReport:
+    archived: int = 0
+    created: List[str] = field(default_factory=list)
+    detached: List[str] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+    skipped: bool = False
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARTITION_PREFIX}{month:%Y_%m}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def _bound(month: date) -> str:
+    # limites em UTC: não dependem do timezone da sessão
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+async def _try_lock(session: AsyncSession) -> bool:
+    return bool(await session.scalar(select(func.pg_try_advisory_xact_lock(func.hashtext(RETENTION_LOCK)))))
+
+
+async def _partitions(session: AsyncSession) -> List[str]:
+    """Partições anexadas a job_history."""
+    rows = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "JOIN pg_namespace n ON n.oid = p.relnamespace "
+            "WHERE n.nspname = :schema AND p.relname = 'job_history'"
+        ),
+        {"schema": SCHEMA},
+    )
+    return [name for (name,) in rows]
+
+
+async def ensure_partition(session: AsyncSession, month: date, attached: List[str]) -> Optional[str]:
+    """
+    Garante a partição do mês. Se ela já foi desanexada (arquivo), é
+    reanexada: as vagas que chegarem atrasadas vão para o mesmo arquivo.
+    Devolve o nome se criou/reanexou.
+    """
+    name = partition_name(month)
+    if name in attached:
+        return None
+    bounds = f"FROM ({_bound(month)}) TO ({_bound(add_months(month, 1))})"
+    table = await session.scalar(select(func.to_regclass(f"{SCHEMA}.{name}")))
+    if table is None:
+        await session.execute(text(f"CREATE TABLE {SCHEMA}.{name} PARTITION OF {SCHEMA}.job_history FOR VALUES {bounds}"))
+    else:
+        await session.execute(text(f"ALTER TABLE {SCHEMA}.job_history ATTACH PARTITION {SCHEMA}.{name} FOR VALUES {bounds}"))
+    attached.append(name)
+    return name
+
+
+def _archivable(older_than: datetime):
+    return (
+        Job.expired_at < older_than,
+        ~exists().where(Favorite.job_id == Job.id),
+    )
+
+
+async def archive_expired(session: AsyncSession, *, older_than: datetime, batch: int, report: RetentionReport) -> int:
+    """Move até 'batch' vagas expiradas antes de 'older_than' (sem favoritos) para o histórico."""
+    # mês de cada vaga: publicação, ou a primeira vez vista se a Remotive não informou
+    partition_key = func.coalesce(Job.posted_at, Job.first_seen)
+    months = await session.scalars(
+        select(func.date_trunc("month", func.timezone("UTC", partition_key)))
+        .where(*_archivable(older_than))
+        .distinct()
+    )
+    attached = await _partitions(session)
+    for month in months.all():
+        created = await ensure_partition(session, month_start(month.date()), attached)
+        if created:
+            report.created.append(created)
+
+    picked = (
+        select(Job.id)
+        .where(*_archivable(older_than))
+        .order_by(Job.expired_at)
+        .limit(batch)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(Job)
+        .where(Job.id.in_(picked.scalar_subquery()))
+        .returning(*(getattr(Job, c) for c in _COPIED), partition_key.label("partition_key"))
+        .cte("moved")
+    )
+    # o DELETE ... RETURNING precisa ficar no WITH do próprio INSERT
+    stmt = (
+        pg_insert(JobHistory)
+        .from_select([*_COPIED, "posted_at"], select(*(moved.c[c] for c in _COPIED), moved.c.partition_key))
+        .add_cte(moved)
+    )
+    # vaga que voltou ao feed depois de arquivada (mesmo id e posted_at) já
+    # está no histórico: fica a passagem mais recente, com o first_seen da
+    # primeira, em vez de o conflito na PK abortar o lote inteiro
+    result = await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[JobHistory.id, JobHistory.posted_at],
+            set_={
+                **{c: stmt.excluded[c] for c in _COPIED if c not in ("id", "first_seen")},
+                "archived_at": func.now(),
+            },
+        )
+    )
+    return result.rowcount
+
+
+async def detach_old_partitions(
+    session: AsyncSession, *, before: date, drop: bool, report: RetentionReport
+) -> None:
+    """Desanexa (e, com 'drop', apaga) as partições de meses anteriores a 'before'."""
+    for name in sorted(await _partitions(session)):
+        month = partition_month(name)
+        if month is None or add_months(month, 1) > before:
+            continue
+        await session.execute(text(f"ALTER TABLE {SCHEMA}.job_history DETACH PARTITION {SCHEMA}.{name}"))
+        report.detached.append(name)
+        if drop:
+            await session.execute(text(f"DROP TABLE {SCHEMA}.{name}"))
+            report.dropped.append(name)
+
+
+async def run_retention(
+    session_factory: Callable[[], AsyncSession],
+    *,
+    archive_after: timedelta,
+    keep_months: int,
+    drop: bool = False,
+    batch: int = 1000,
+    now: Optional[datetime] = None,
+) -> RetentionReport:
+    """Uma rodada completa: arquiva em lotes (uma transação por lote) e depois desanexa."""
+    now = now or datetime.now(timezone.utc)
+    report = RetentionReport()
+    older_than = now - archive_after
+
+    while True:
+        async with session_factory() as session:
+            if not await _try_lock(session):
+                report.skipped = True
+                return report
+            moved = await archive_expired(session, older_than=older_than, batch=batch, report=report)
+            await session.commit()
+        report.archived += moved
+        if moved < batch:
+            break
+
+    async with session_factory() as session:
+        if not await _try_lock(session):
+            report.skipped = True
+            return report
+        before = add_months(month_start(now.date()), -max(keep_months, 1))
+        await detach_old_partitions(session, before=before, drop=drop, report=report)
+        await session.commit()
+    return report
+
+
+async def run_periodically(
+    session_factory: Callable[[], AsyncSession],
+    *,
+    interval: float,
+    archive_after: timedelta,
+    keep_months: int,
+    drop: bool = False,
+    batch: int = 1000,
+) -> None:
+    """Laço do lifespan: uma rodada a cada 'interval' segundos (falhas só geram log)."""
+    while True:
+        try:
+            report = await run_retention(
+                session_factory,
+                archive_after=archive_after,
+                keep_months=keep_months,
+                drop=drop,
+                batch=batch,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Retenção do histórico de vagas falhou: %s", exc)
+        else:
+            if report.archived or report.detached:
+                logger.info(
+                    "Retenção: %d vagas arquivadas, partições criadas %s, desanexadas %s, apagadas %s",
+                    report.archived, report.created, report.detached, report.dropped,
+                )
+        await asyncio.sleep(interval)
+
+
+async def _main() -> None:
+    from ..config import settings
+    from ..db import dispose_engine, get_sessionmaker
+
+    try:
+        report = await run_retention(
+            lambda: get_sessionmaker()(),
+            archive_after=timedelta(days=settings.JOBS_ARCHIVE_AFTER_DAYS),
+            keep_months=settings.JOBS_HISTORY_MONTHS,
+            drop=settings.JOBS_HISTORY_DROP,
+            batch=settings.JOBS_RETENTION_BATCH,
+        )
+    finally:
+        await dispose_engine()
+    print(report)
+
+
+if __name__ == "__main__":
+    # rodada avulsa (cron/manutenção): python -m app.services.retention
+    asyncio.run(_main())
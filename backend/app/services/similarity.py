@@ -0,0 +1,120 @@
+# app/services/similarity.py
+"""
+Vagas parecidas por TF-IDF sobre título e tags.
+
+Montado junto com cada snapshot do catálogo (NumPy, em lote): cada vaga vira
+um vetor TF-IDF normalizado (L2) e guardamos as duas visões esparsas dele —
+por linha (termos de cada vaga) e por termo (listas invertidas). A consulta
+"parecidas com a vaga r" soma, só sobre as listas invertidas dos termos de r,
+os produtos escalares (= cosseno) e tira o top-k com argpartition: o custo
+depende das vagas que compartilham algum termo com r, não do catálogo todo.
+Termos presentes em boa parte do catálogo ("engineer", "senior") quase não
+pesam no cosseno e são ignorados na consulta (max_df).
+"""
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from .job_store import JobStore
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+
+STOPWORDS = frozenset(
+    "a an and at de da do e em for in of on or para the to with".split()
+)
+
+# peso de uma tag em relação a uma palavra do título
+TAG_WEIGHT = 1.5
+
+# termos em mais que essa fração das vagas não entram na consulta
+MAX_DF = 0.2
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.casefold()) if t not in STOPWORDS and len(t) > 1]
+
+
+class SimilarityIndex:
+    """Vetores TF-IDF (título + tags) de um JobStore, com busca por cosseno."""
+
+    def __init__(self, store: JobStore, *, max_df: float = MAX_DF) -> None:
+        # NumPy só quando o índice é montado: importar o app não paga o import
+        import numpy as np
+
+        self.size = n = len(store)
+        vocabulary: Dict[str, int] = {}
+        counts = np.zeros(n, dtype=np.int64)
+        terms: List[int] = []
+        freqs: List[float] = []
+
+        for row in range(n):
+            tf: Dict[int, float] = {}
+            for token in tokenize(store.titles[row] or ""):
+                code = vocabulary.setdefault(token, len(vocabulary))
+                tf[code] = tf.get(code, 0.0) + 1.0
+            for tag in store.tags_at(row):
+                token = "#" + " ".join(tag.casefold().split())
+                code = vocabulary.setdefault(token, len(vocabulary))
+                tf[code] = tf.get(code, 0.0) + TAG_WEIGHT
+            counts[row] = len(tf)
+            terms.extend(tf.keys())
+            freqs.extend(tf.values())
+
+        # visão por linha (CSR): termos da vaga r em indices[indptr[r]:indptr[r+1]]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+        self.indices = np.asarray(terms, dtype=np.int32)
+        entry_rows = np.repeat(np.arange(n, dtype=np.int32), counts)
+
+        self.df = np.bincount(self.indices, minlength=len(vocabulary))
+        idf = np.log((1.0 + n) / (1.0 + self.df)) + 1.0
+        data = (1.0 + np.log(np.asarray(freqs, dtype=np.float64))) * idf[self.indices]
+        norms = np.sqrt(np.bincount(entry_rows, weights=data * data, minlength=n))
+        if len(data):
+            data /= norms[entry_rows]
+        self.data = data.astype(np.float32)
+
+        # visão por termo (listas invertidas): vagas com o termo t em
+        # post_rows[term_ptr[t]:term_ptr[t+1]]
+        order = np.argsort(self.indices, kind="stable")
+        self.post_rows = entry_rows[order]
+        self.post_data = self.data[order]
+        self.term_ptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(self.df, out=self.term_ptr[1:])
+        self.max_df = max(int(max_df * n), 1)
+
+    def similar(self, row: int, k: int) -> List[Tuple[int, float]]:
+        """Até k linhas mais parecidas com 'row' (cosseno decrescente), sem ela mesma."""
+        import numpy as np
+
+        start, end = self.indptr[row], self.indptr[row + 1]
+        terms = self.indices[start:end]
+        weights = self.data[start:end]
+        selective = self.df[terms] <= self.max_df
+        if selective.any():
+            terms, weights = terms[selective], weights[selective]
+        if not len(terms):
+            return []
+
+        # concatena as listas invertidas dos termos sem laço em Python
+        lo = self.term_ptr[terms]
+        lengths = self.term_ptr[terms + 1] - lo
+        total = int(lengths.sum())
+        offsets = np.repeat(lo - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+        hits = self.post_rows[offsets]
+        contributions = self.post_data[offsets] * np.repeat(weights, lengths)
+
+        scores = np.bincount(hits, weights=contributions, minlength=self.size)
+        scores[row] = 0.0
+        candidates = np.flatnonzero(scores > 0.0)
+        scores = scores[candidates]
+        if len(candidates) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            candidates, scores = candidates[top], scores[top]
+        # score decrescente; empate pela ordem do feed
+        ranked = np.lexsort((candidates, -scores))
+        return [(int(candidates[i]), round(float(scores[i]), 4)) for i in ranked]
@@ -0,0 +1,101 @@
+# app/services/sorting.py
+"""
+Ordenações pré-computadas do catálogo.
+
+Para cada critério guardamos, a cada snapshot, a permutação das linhas já
+ordenada (order) e a posição de cada linha nela (rank). Por requisição nunca
+ordenamos o resultado inteiro:
+
+- filtro denso: percorremos 'order' até juntar a página pedida;
+- filtro esparso: top-k com heapq.nsmallest pela 'rank' só das linhas filtradas.
+"""
+from __future__ import annotations
+
+import heapq
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+from .facets import select_rows
+from .job_store import JobStore
+
+SORT_KEYS = ("relevance", "newest", "company", "title")
+
+
+def _casefold(value: Optional[str]) -> tuple[bool, str]:
+    # None/vazio vai para o fim
+    return (not value, (value or "").casefold())
+
+
+class SortIndex:
+    """Permutações ordenadas das linhas de um JobStore, por critério."""
+
+    def __init__(self, store: JobStore) -> None:
+        self.size = len(store)
+        rows = range(self.size)
+        published = store.published_at
+        titles = store.titles
+        company_codes = store.codes["company"]
+        companies = store.vocab["company"]
+
+        # ISO 8601 ordena como texto; vagas sem data vão para o fim
+        dated = [r for r in rows if published[r]]
+        undated = [r for r in rows if not published[r]]
+        orders: Dict[str, List[int]] = {
+            "newest": sorted(dated, key=published.__getitem__, reverse=True) + undated,
+            "company": sorted(
+                rows, key=lambda r: (_casefold(companies[company_codes[r]]), _casefold(titles[r]))
+            ),
+            "title": sorted(rows, key=lambda r: _casefold(titles[r])),
+        }
+        self.order: Dict[str, array] = {}
+        self.rank: Dict[str, array] = {}
+        for name, rows_sorted in orders.items():
+            order = array("I", rows_sorted)
+            rank = array("I", bytes(4 * self.size))
+            for position, row in enumerate(order):
+                rank[row] = position
+            self.order[name] = order
+            self.rank[name] = rank
+
+    def page(self, key: str, mask: int, start: int, count: int) -> List[int]:
+        """
+        Linhas da página [start, start+count) das vagas em 'mask', na ordem
+        de 'key'. 'relevance' (sem busca) é a ordem do feed da Remotive.
+        """
+        if key == "relevance" or key not in self.order:
+            return select_rows(mask, start, count)
+
+        order = self.order[key]
+        matches = mask.bit_count()
+        if matches == self.size:
+            return order[start:start + count].tolist()
+        if not matches or start >= matches:
+            return []
+
+        # custo estimado de varrer 'order' até completar a página vs. top-k
+        # sobre as 'matches' linhas filtradas
+        wanted = start + count
+        if wanted * self.size / matches <= matches:
+            return walk_order(order, mask, start, count)
+        candidates = select_rows(mask, 0, matches)
+        top = heapq.nsmallest(wanted, candidates, key=self.rank[key].__getitem__)
+        return top[start:]
+
+
+def walk_order(order: Sequence[int], mask: int, start: int, count: int) -> List[int]:
+    """Percorre 'order' devolvendo a página [start, start+count) das linhas em 'mask'."""
+    if not mask:
+        return []
+    bits = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    limit = len(bits) * 8
+    out: List[int] = []
+    skip = start
+    for row in order:
+        if row < limit and bits[row >> 3] >> (row & 7) & 1:
+            if skip:
+                skip -= 1
+                continue
+            out.append(row)
+            if len(out) == count:
+                break
+    return out
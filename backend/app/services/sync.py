@@ -1,13 +1,30 @@
 # app/services/sync.py
 from __future__ import annotations
 
-from typing import Optional, Dict, Any
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import String, all_, bindparam, case, func, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models import Job
+from app.services.job_store import JobStore
 from app.services.remotive import fetch_remotive_jobs
-# Se você quiser persistir no banco, você pode importar seus modelos e fazer upsert aqui.
-# from app.models import Job
-# from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+logger = logging.getLogger(__name__)
+
+# linhas por INSERT ... ON CONFLICT (11 parâmetros cada)
+UPSERT_BATCH = 500
+
+# maior id que cabe na coluna integer; ids maiores usam a sequence
+_MAX_ID = 2**31 - 1
+
+# chave do pg_try_advisory_xact_lock: um único persist por vez no cluster
+PERSIST_LOCK = "jobify.persist_catalog"
+
 
 async def sync_jobs_from_remotive(
     session: AsyncSession,
@@ -18,35 +35,170 @@ async def sync_jobs_from_remotive(
     per_page: int,
 ) -> Dict[str, Any]:
     """
-    Busca na Remotive e (opcionalmente) persiste. Por ora, retorna direto os dados
-    para garantir o fluxo funcionando sem erro de import/persistência.
+    Busca na Remotive e devolve direto os dados. A persistência do feed
+    completo é feita a cada refresh do catálogo (persist_catalog).
+    """
+    return await fetch_remotive_jobs(q=q, category=category, page=page, per_page=per_page)
+
+
+def _posted_at(value: Any) -> Optional[datetime]:
+    """publication_date da Remotive (ISO, normalmente sem fuso = UTC)."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _job_values(store: JobStore, row: int, seen_at: datetime) -> Optional[Dict[str, Any]]:
+    job = store.row(row)
+    job_id = job["id"]
+    if not job_id or len(job_id) > 120:
+        return None
+    values: Dict[str, Any] = {
+        "remotive_id": job_id,
+        "title": (job["title"] or "")[:255],
+        "company": (job["company"] or "")[:255] or None,
+        "location": (job["location"] or "")[:255] or None,
+        "url": (job["url"] or "")[:1024] or None,
+        "posted_at": _posted_at(job["published_at"]),
+        "description": job["description"],
+        # subconjunto do item cru da Remotive (o que feed e exportação leem)
+        "raw": {
+            "id": job_id,
+            "title": job["title"],
+            "company_name": job["company"],
+            "category": job["category"],
+            "job_type": job["job_type"],
+            "candidate_required_location": job["location"],
+            "url": job["url"],
+            "publication_date": job["published_at"],
+            "tags": job["tags"],
+        },
+        "first_seen": seen_at,
+        "last_seen": seen_at,
+        "updated_at": seen_at,
+    }
+    numeric_id = store.row_ids[row]
+    if 0 < numeric_id <= _MAX_ID:
+        # mesmo id da Remotive: é o que o frontend manda nos favoritos
+        values["id"] = numeric_id
+    return values
+
+
+def _upsert(batch: List[Dict[str, Any]], seen_at: datetime, stale_before: datetime):
+    stmt = pg_insert(Job).values(batch)
+    new = stmt.excluded
+    # conteúdo mudou ou a vaga voltou ao feed: é o que a exportação
+    # incremental precisa ver (updated_at); só o last_seen vencido não é
+    changed = or_(
+        Job.expired_at.is_not(None),
+        Job.title.is_distinct_from(new.title),
+        Job.company.is_distinct_from(new.company),
+        Job.location.is_distinct_from(new.location),
+        Job.url.is_distinct_from(new.url),
+        Job.posted_at.is_distinct_from(new.posted_at),
+        Job.description.is_distinct_from(new.description),
+        Job.raw.is_distinct_from(new.raw),
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[Job.remotive_id],
+        set_={
+            "title": new.title,
+            "company": new.company,
+            "location": new.location,
+            "url": new.url,
+            "posted_at": new.posted_at,
+            "description": new.description,
+            "raw": new.raw,
+            "last_seen": seen_at,
+            "expired_at": None,
+            "updated_at": case((changed, seen_at), else_=Job.updated_at),
+        },
+        # vaga sem mudança e vista há pouco não é regravada: evita reescrever
+        # (e inchar) a tabela inteira a cada refresh
+        where=or_(changed, Job.last_seen < stale_before),
+    )
+
+
+async def persist_catalog(
+    session_factory: Callable[[], AsyncSession],
+    store: JobStore,
+    *,
+    seen_resolution: float,
+    now: Optional[datetime] = None,
+) -> Optional[Dict[str, int]]:
+    """
+    Grava o feed do catálogo em jobify.jobs e marca como expiradas as vagas
+    ativas que saíram dele. 'last_seen' tem resolução de 'seen_resolution'
+    segundos. Devolve as contagens, ou None se outro processo já está
+    persistindo (o próximo refresh grava o estado mais novo).
     """
-    data = await fetch_remotive_jobs(q=q, category=category, page=page, per_page=per_page)
-
-    # --- Exemplo de persistência (deixe comentado até querer usar) ---
-    # for item in data["items"]:
-    #     stmt = pg_insert(Job).values(
-    #         remotive_id=item["remotive_id"],
-    #         title=item["title"],
-    #         company=item["company"],
-    #         location=item["location"],
-    #         url=item["url"],
-    #         published_at=item["published_at"],
-    #         raw=item["raw"],
-    #         category=item["category"],
-    #     ).on_conflict_do_update(
-    #         index_elements=[Job.remotive_id],
-    #         set_={
-    #             "title": item["title"],
-    #             "company": item["company"],
-    #             "location": item["location"],
-    #             "url": item["url"],
-    #             "published_at": item["published_at"],
-    #             "raw": item["raw"],
-    #             "category": item["category"],
-    #         },
-    #     )
-    #     await session.execute(stmt)
-    # await session.commit()
-
-    return data
+    seen_at = now or datetime.now(timezone.utc)
+    stale_before = seen_at - timedelta(seconds=seen_resolution)
+    seen_ids: Set[str] = set()
+    upserted = 0
+    explicit_ids = False
+
+    async with session_factory() as session:
+        locked = await session.scalar(select(func.pg_try_advisory_xact_lock(func.hashtext(PERSIST_LOCK))))
+        if not locked:
+            return None
+
+        async def upsert(batch: List[Dict[str, Any]]) -> int:
+            return (await session.execute(_upsert(batch, seen_at, stale_before))).rowcount
+
+        # lotes por remotive_id: o ON CONFLICT não pode tocar a mesma linha
+        # duas vezes no mesmo comando, então um id repetido no feed fica só
+        # com a última ocorrência
+        with_id: Dict[str, Dict[str, Any]] = {}
+        # vagas sem id numérico (raras) esperam a sequence ser ajustada
+        without_id: Dict[str, Dict[str, Any]] = {}
+        for row in range(len(store)):
+            values = _job_values(store, row, seen_at)
+            if values is None:
+                continue
+            seen_ids.add(values["remotive_id"])
+            # o multi-VALUES precisa das mesmas colunas em todas as linhas
+            if "id" not in values:
+                without_id[values["remotive_id"]] = values
+                continue
+            with_id[values["remotive_id"]] = values
+            explicit_ids = True
+            if len(with_id) >= UPSERT_BATCH:
+                upserted += await upsert(list(with_id.values()))
+                with_id.clear()
+        if with_id:
+            upserted += await upsert(list(with_id.values()))
+        if explicit_ids:
+            # ids explícitos não avançam a sequence: sem isso, as vagas sem id
+            # numérico pegariam ids já usados
+            await session.execute(
+                select(
+                    func.setval(
+                        func.pg_get_serial_sequence("jobify.jobs", "id"),
+                        select(func.max(Job.id)).scalar_subquery(),
+                    )
+                )
+            )
+        pending = list(without_id.values())
+        for i in range(0, len(pending), UPSERT_BATCH):
+            upserted += await upsert(pending[i:i + UPSERT_BATCH])
+
+        expired = 0
+        if seen_ids:
+            # feed vazio (Remotive com problema) não expira o banco inteiro
+            result = await session.execute(
+                update(Job)
+                .where(
+                    Job.expired_at.is_(None),
+                    Job.remotive_id != all_(bindparam("seen_ids", sorted(seen_ids), type_=ARRAY(String))),
+                )
+                .values(expired_at=seen_at)
+            )
+            expired = result.rowcount
+        await session.commit()
+
+    return {"seen": len(seen_ids), "upserted": upserted, "expired": expired}
@@ -0,0 +1,130 @@
+# app/services/upstream.py
+"""
+Controle das chamadas de saída para a Remotive.
+
+- SingleFlight: requisições idênticas em voo ao mesmo tempo viram uma só
+  chamada; todos os interessados recebem o mesmo resultado.
+- UpstreamLimiter: no máximo N chamadas simultâneas, com fila de espera
+  limitada; fila cheia (ou espera longa demais) falha rápido com
+  UpstreamBusy, que a API devolve como 503 + Retry-After.
+- Um único httpx.AsyncClient por worker, reaproveitando conexões.
+"""
+from __future__ import annotations
+
+import asyncio
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+
+from ..config import get_settings
+
+T = TypeVar("T")
+
+DEFAULT_HEADERS = {"User-Agent": "Jobify/1.0 (+https://github.com/)"}
+DEFAULT_TIMEOUT = httpx.Timeout(20.0)
+
+
+class UpstreamBusy(Exception):
+    """Fila de chamadas à Remotive cheia; o cliente deve tentar mais tarde."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Muitas requisições pendentes para a Remotive.")
+        self.retry_after = retry_after
+
+
+class SingleFlight:
+    """Deduplica chamadas concorrentes com a mesma chave."""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, asyncio.Task[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            # a chamada roda numa task própria: se quem a iniciou for cancelado
+            # (cliente desconectou), os demais continuam esperando o resultado
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+
+class UpstreamLimiter:
+    """Semáforo com fila de espera limitada e falha rápida."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        *,
+        queue_timeout: float,
+        retry_after: int,
+    ) -> None:
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.waiting = 0
+
+    async def __aenter__(self) -> "UpstreamLimiter":
+        if self._sem.locked():
+            if self.waiting >= self.max_queue:
+                raise UpstreamBusy(self.retry_after)
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._sem.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise UpstreamBusy(self.retry_after) from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._sem.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._sem.release()
+
+
+inflight = SingleFlight()
+
+
+@lru_cache(maxsize=1)
+def get_limiter() -> UpstreamLimiter:
+    """Limiter configurado pelo settings (criado no primeiro uso, não no import)."""
+    settings = get_settings()
+    return UpstreamLimiter(
+        settings.UPSTREAM_MAX_CONCURRENCY,
+        settings.UPSTREAM_MAX_QUEUE,
+        queue_timeout=settings.UPSTREAM_QUEUE_TIMEOUT,
+        retry_after=settings.UPSTREAM_RETRY_AFTER,
+    )
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Cliente HTTP compartilhado (criado no primeiro uso)."""
+    global _client
+    if _client is None or _client.is_closed:
+        settings = get_settings()
+        _client = httpx.AsyncClient(
+            base_url=settings.REMOTIVE_BASE.rstrip("/"),
+            timeout=DEFAULT_TIMEOUT,
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(
+                max_connections=settings.UPSTREAM_MAX_CONCURRENCY,
+                max_keepalive_connections=settings.UPSTREAM_MAX_CONCURRENCY,
+            ),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,187 @@
+# app/services/warmer.py
+"""
+Aquecimento de cache após deploy e a cada refresh do catálogo.
+
+- QueryLog: conta as buscas recentes (com decaimento a cada versão do
+  catálogo) e persiste as mais populares no cache compartilhado, para
+  sobreviverem a um restart.
+- Warmer: executa uma lista de tarefas de aquecimento com concorrência
+  limitada, sem deixar uma falha interromper as demais.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+from .cache import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+WarmTask = Callable[[], Awaitable[Any]]
+
+
+class QueryLog:
+    """
+    Buscas mais frequentes do tráfego recente.
+
+    Cada worker conta localmente e soma suas contagens às persistidas em
+    flush() (feito por top()); o read-modify-write roda sob o lock do cache,
+    então workers simultâneos não perdem contagens. O decaimento é aplicado
+    uma vez por versão do catálogo, por quem a construiu (decay()).
+    """
+
+    # tentativas de pegar o lock no decay(); o flush() só adia as contagens
+    LOCK_ATTEMPTS = 20
+    LOCK_RETRY = 0.01
+
+    def __init__(
+        self,
+        cache: CacheBackend,
+        *,
+        key: str = "warm:queries",
+        max_tracked: int = 1000,
+        decay: float = 0.5,
+    ) -> None:
+        self.cache = cache
+        self.key = key
+        self.max_tracked = max_tracked
+        self.decay_factor = decay
+        self._counts: Counter[str] = Counter()
+
+    @staticmethod
+    def normalize(q: str) -> str:
+        return " ".join(q.split()).lower()
+
+    def record(self, q: Optional[str]) -> None:
+        if not q:
+            return
+        q = self.normalize(q)
+        if not q:
+            return
+        self._counts[q] += 1
+        if len(self._counts) > self.max_tracked * 2:
+            self._counts = Counter(dict(self._counts.most_common(self.max_tracked)))
+
+    async def _stored(self) -> Counter[str]:
+        counts: Counter[str] = Counter()
+        stored = await self.cache.get(self.key)
+        if stored:
+            try:
+                counts.update({str(k): float(v) for k, v in json.loads(stored).items()})
+            except (ValueError, AttributeError):
+                pass
+        return counts
+
+    async def _update(self, change: Callable[[Counter[str]], None]) -> bool:
+        """Aplica 'change' ao ranking persistido; False se outro worker está com o lock."""
+        if not await self.cache.try_lock(self.key):
+            return False
+        try:
+            counts = await self._stored()
+            change(counts)
+            kept = dict(counts.most_common(self.max_tracked))
+            await self.cache.set(self.key, json.dumps(kept).encode("utf-8"))
+        finally:
+            await self.cache.unlock(self.key)
+        return True
+
+    async def flush(self) -> None:
+        """Soma as contagens deste worker às persistidas (de outros workers ou de antes do restart)."""
+        if not self._counts:
+            return
+        local, self._counts = self._counts, Counter()
+        if not await self._update(lambda counts: counts.update(local)):
+            # lock ocupado: as contagens voltam e entram no próximo flush
+            self._counts.update(local)
+
+    async def decay(self) -> None:
+        """Decaimento do ranking persistido, para ele refletir o tráfego recente."""
+
+        def apply(counts: Counter[str]) -> None:
+            for q, c in list(counts.items()):
+                if c * self.decay_factor >= 0.5:
+                    counts[q] = c * self.decay_factor
+                else:
+                    del counts[q]
+
+        for _ in range(self.LOCK_ATTEMPTS):
+            if await self._update(apply):
+                return
+            await asyncio.sleep(self.LOCK_RETRY)
+        logger.warning("Ranking de buscas sem decaimento nesta versão: lock ocupado")
+
+    async def top(self, n: int) -> List[str]:
+        """Top-N do ranking persistido, já com as contagens deste worker."""
+        await self.flush()
+        return [q for q, _ in (await self._stored()).most_common(n)]
+
+
+@dataclass
+class WarmReport:
+    tasks: int
+    errors: int
+    seconds: float
+
+
+class Warmer:
+    """Executa tarefas de aquecimento com concorrência limitada."""
+
+    def __init__(self, *, concurrency: int) -> None:
+        self.concurrency = max(1, concurrency)
+        self.last_report: Optional[WarmReport] = None
+        self._running: Optional[asyncio.Task[Optional[WarmReport]]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running is not None and not self._running.done()
+
+    async def wait(self) -> Optional[WarmReport]:
+        """Espera o aquecimento em andamento (se houver) terminar."""
+        if self._running is None:
+            return self.last_report
+        return await asyncio.shield(self._running)
+
+    async def run(self, tasks: Iterable[WarmTask]) -> WarmReport:
+        sem = asyncio.Semaphore(self.concurrency)
+        errors = 0
+        started = time.monotonic()
+
+        async def one(task: WarmTask) -> None:
+            nonlocal errors
+            async with sem:
+                try:
+                    await task()
+                except Exception:  # noqa: BLE001
+                    errors += 1
+                    logger.debug("Falha ao aquecer cache", exc_info=True)
+
+        pending = list(tasks)
+        await asyncio.gather(*(one(t) for t in pending))
+        report = WarmReport(tasks=len(pending), errors=errors, seconds=time.monotonic() - started)
+        self.last_report = report
+        logger.info(
+            "Cache aquecido: %d tarefas, %d erros, %.2fs", report.tasks, report.errors, report.seconds
+        )
+        return report
+
+    def schedule(self, build: Callable[[], Awaitable[Iterable[WarmTask]]]) -> None:
+        """
+        Dispara um aquecimento em background (ignora se já houver um rodando).
+        'build' monta a lista de tarefas no momento da execução.
+        """
+        if self.running:
+            return
+
+        async def _go() -> Optional[WarmReport]:
+            try:
+                return await self.run(await build())
+            except Exception:  # noqa: BLE001
+                logger.warning("Falha ao montar o aquecimento de cache", exc_info=True)
+                return None
+
+        self._running = asyncio.ensure_future(_go())
@@ -0,0 +1,189 @@
+# app/services/write_behind.py
+"""
+Gravação adiada (write-behind) dos favoritos.
+
+Com FAVORITES_WRITE_BEHIND ligado, adicionar/remover um favorito só enfileira
+a operação em memória: toggles repetidos do mesmo (usuário, vaga) se anulam
+(vale o último) e um flusher em background grava o lote a cada
+FAVORITES_FLUSH_MS — um INSERT ... SELECT multi-linha e um DELETE por lote,
+numa única transação. A fila é por worker; o que ainda não foi gravado é
+sobreposto nas leituras deste worker (pending_state).
+
+Cada grupo de linhas (inserts de um usuário, deletes do lote) roda num
+SAVEPOINT: uma linha que o banco recusa (ex.: FK de user_id inválida) não
+derruba o resto do lote. As recusadas voltam para a fila e, depois de
+MAX_ATTEMPTS tentativas, são descartadas com log — não travam a fila.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, delete, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Favorite, Job
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[int, int]  # (user_id, job_id)
+
+RETRY_MAX = 5.0
+# tentativas de uma linha recusada pelo banco antes de ser descartada
+MAX_ATTEMPTS = 5
+
+
+def insert_existing_favorites(user_id: int, job_ids: Sequence[int]):
+    """
+    INSERT ... SELECT das vagas que existem: ids desconhecidos simplesmente
+    não geram linha (a checagem de existência fica dentro do próprio insert).
+    """
+    return (
+        pg_insert(Favorite)
+        .from_select(
+            ["user_id", "job_id"],
+            select(literal(user_id, Integer), Job.id).where(Job.id.in_(job_ids)),
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+class FavoriteWriteBehind:
+    """Fila coalescida de toggles de favoritos, gravada em lotes."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        *,
+        flush_ms: int,
+        max_batch: int,
+    ) -> None:
+        self.session_factory = session_factory
+        self.flush_interval = max(flush_ms, 0) / 1000
+        self.max_batch = max(1, max_batch)
+        self._pending: Dict[Key, bool] = {}
+        self._inflight: Dict[Key, bool] = {}
+        self._attempts: Dict[Key, int] = {}
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, user_id: int, job_id: int, *, favorite: bool) -> None:
+        """True = adicionar, False = remover; substitui o toggle anterior pendente."""
+        self._pending[(user_id, job_id)] = favorite
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def pending_state(self, user_id: int, job_id: int) -> Optional[bool]:
+        """Estado ainda não gravado de (usuário, vaga), ou None se não houver."""
+        key = (user_id, job_id)
+        if key in self._pending:
+            return self._pending[key]
+        return self._inflight.get(key)
+
+    async def flush(self) -> None:
+        """Grava agora tudo o que está pendente (usado antes de leituras e no shutdown)."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            self._full.clear()
+            self._inflight = batch
+            try:
+                rejected = await self._write(batch)
+            except BaseException:
+                # devolve à fila o que não foi sobrescrito enquanto gravávamos
+                # (inclusive se cancelado no shutdown: gravar de novo é idempotente)
+                for key, favorite in batch.items():
+                    self._pending.setdefault(key, favorite)
+                raise
+            finally:
+                self._inflight = {}
+            for key in batch.keys() - rejected.keys():
+                self._attempts.pop(key, None)
+            self._retry(rejected)
+
+    def _retry(self, rejected: Dict[Key, bool]) -> None:
+        """Devolve à fila as linhas recusadas, até MAX_ATTEMPTS tentativas cada."""
+        dropped: List[Key] = []
+        for key, favorite in rejected.items():
+            if key in self._pending:
+                # toggle mais novo já na fila: ele é que vale, com contagem nova
+                self._attempts.pop(key, None)
+                continue
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts >= MAX_ATTEMPTS:
+                self._attempts.pop(key, None)
+                dropped.append(key)
+                continue
+            self._attempts[key] = attempts
+            self._pending[key] = favorite
+        if dropped:
+            logger.error("Favoritos descartados após %d tentativas: %s", MAX_ATTEMPTS, dropped)
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        try:
+            # linhas recusadas voltam à fila: tenta até esgotá-las
+            for _ in range(MAX_ATTEMPTS):
+                await self.flush()
+                if not self._pending:
+                    break
+        except Exception:  # noqa: BLE001
+            logger.exception("Favoritos pendentes perdidos no shutdown: %d", len(self._pending))
+
+    async def _run(self) -> None:
+        delay = self.flush_interval
+        while self._pending:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception as exc:  # noqa: BLE001
+                delay = min(max(delay * 2, 0.1), RETRY_MAX)
+                logger.warning("Falha ao gravar favoritos (%s); nova tentativa em %.1fs", exc, delay)
+            else:
+                delay = self.flush_interval
+
+    async def _write(self, batch: Dict[Key, bool]) -> Dict[Key, bool]:
+        """Grava o lote numa transação; devolve as entradas que o banco recusou."""
+        adds: Dict[int, List[int]] = {}
+        removes: List[Key] = []
+        for (user_id, job_id), favorite in batch.items():
+            if favorite:
+                adds.setdefault(user_id, []).append(job_id)
+            else:
+                removes.append((user_id, job_id))
+
+        groups: List[Tuple[List[Key], Any]] = [
+            ([(user_id, job_id) for job_id in job_ids], insert_existing_favorites(user_id, job_ids))
+            for user_id, job_ids in adds.items()
+        ]
+        if removes:
+            groups.append(
+                (removes, delete(Favorite).where(tuple_(Favorite.user_id, Favorite.job_id).in_(removes)))
+            )
+
+        rejected: Dict[Key, bool] = {}
+        async with self.session_factory() as session:
+            for keys, stmt in groups:
+                try:
+                    async with session.begin_nested():
+                        await session.execute(stmt)
+                except (IntegrityError, DataError) as exc:
+                    logger.warning("Banco recusou %d favoritos: %s", len(keys), exc.orig)
+                    rejected.update((key, batch[key]) for key in keys)
+            await session.commit()
+        return rejected
@@ -0,0 +1,9 @@
+# benchmarks/__init__.py
+"""
+Suíte de benchmarks do backend.
+
+- fake_remotive: servidor local que imita a API pública da Remotive
+- postgres: Postgres efêmero (initdb/pg_ctl) para as rotas de favoritos
+- load: carga ponta a ponta contra a API (throughput, p50/p95/p99, memória)
+- results: persistência e comparação de resultados entre execuções
+"""
@@ -0,0 +1,209 @@
+# benchmarks/fake_remotive.py
+"""
+Servidor local que imita a API pública da Remotive para benchmarks.
+
+Serve um feed sintético (determinístico por seed) ou um feed gravado da
+Remotive real, ampliado até o tamanho pedido, com latência configurável.
+
+Uso:
+    python -m benchmarks.fake_remotive serve --jobs 5000 --latency-ms 80 --port 8765
+    python -m benchmarks.fake_remotive record feed.json   # grava o feed real
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, Query
+
+CATEGORIES: List[Dict[str, Any]] = [
+    {"id": 1, "name": "Software Development", "slug": "software-dev"},
+    {"id": 2, "name": "Customer Service", "slug": "customer-support"},
+    {"id": 3, "name": "Design", "slug": "design"},
+    {"id": 4, "name": "Marketing", "slug": "marketing"},
+    {"id": 5, "name": "Sales / Business", "slug": "sales-business"},
+    {"id": 6, "name": "Product", "slug": "product"},
+    {"id": 7, "name": "Project Management", "slug": "project-management"},
+    {"id": 8, "name": "Data Analysis", "slug": "data"},
+    {"id": 9, "name": "DevOps / Sysadmin", "slug": "devops"},
+    {"id": 10, "name": "Finance / Legal", "slug": "finance-legal"},
+    {"id": 11, "name": "Human Resources", "slug": "hr"},
+    {"id": 12, "name": "QA", "slug": "qa"},
+    {"id": 13, "name": "Writing", "slug": "writing"},
+    {"id": 14, "name": "All others", "slug": "all-others"},
+]
+
+_TITLES = [
+    "Senior Python Engineer", "Frontend Developer (React)", "Product Designer",
+    "DevOps Engineer", "Data Analyst", "Customer Success Manager",
+    "Technical Writer", "QA Automation Engineer", "Growth Marketer",
+    "Account Executive", "Backend Engineer (Go)", "Machine Learning Engineer",
+]
+_COMPANIES = [f"Company {i:03d}" for i in range(250)]
+_JOB_TYPES = ["full_time", "contract", "part_time", "freelance", "internship"]
+_LOCATIONS = ["Worldwide", "USA", "Europe", "LATAM", "Brazil", "UK", "Canada", "Americas"]
+_TAGS = [
+    "python", "react", "typescript", "aws", "docker", "kubernetes", "sql",
+    "figma", "seo", "go", "rust", "java", "node", "django", "fastapi", "ml",
+    "excel", "salesforce", "support", "writing",
+]
+
+
+def synthetic_job(rng: random.Random, job_id: int, now: datetime) -> Dict[str, Any]:
+    """Uma vaga no formato cru da Remotive."""
+    category = rng.choice(CATEGORIES)
+    published = now - timedelta(minutes=rng.randint(0, 60 * 24 * 60))
+    paragraphs = rng.randint(3, 12)
+    return {
+        "id": job_id,
+        "url": f"https://remotive.com/remote-jobs/fake/{job_id}",
+        "title": rng.choice(_TITLES),
+        "company_name": rng.choice(_COMPANIES),
+        "company_logo": None,
+        "category": category["name"],
+        "tags": rng.sample(_TAGS, rng.randint(0, 6)),
+        "job_type": rng.choice(_JOB_TYPES),
+        "publication_date": published.strftime("%Y-%m-%dT%H:%M:%S"),
+        "candidate_required_location": rng.choice(_LOCATIONS),
+        "salary": "",
+        "description": "".join(
+            f"<p>Paragraph {p} of job {job_id}. " + "Lorem ipsum dolor sit amet. " * 8 + "</p>"
+            for p in range(paragraphs)
+        ),
+    }
+
+
+def build_feed(size: int, *, seed: int = 42, recorded: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    Monta o feed com 'size' vagas. Com 'recorded', replica as vagas gravadas
+    (com ids novos) até atingir o tamanho pedido.
+    """
+    rng = random.Random(seed)
+    if recorded is not None:
+        data = json.loads(Path(recorded).read_text(encoding="utf-8"))
+        base = [j for j in (data.get("jobs") or []) if isinstance(j, dict)]
+        if not base:
+            raise SystemExit(f"Feed gravado sem vagas: {recorded}")
+        jobs: List[Dict[str, Any]] = []
+        for i in range(size):
+            job = dict(base[i % len(base)])
+            job["id"] = 1_000_000 + i
+            jobs.append(job)
+        return jobs
+
+    now = datetime.now(timezone.utc)
+    return [synthetic_job(rng, 1_000_000 + i, now) for i in range(size)]
+
+
+def _matches(job: Dict[str, Any], search: Optional[str], category: Optional[str]) -> bool:
+    if category:
+        wanted = category.strip().lower()
+        name = str(job.get("category") or "").lower()
+        slug = next((c["slug"] for c in CATEGORIES if c["name"].lower() == name), name)
+        if wanted not in (name, slug):
+            return False
+    if search:
+        needle = search.strip().lower()
+        haystack = " ".join(
+            [str(job.get("title") or ""), str(job.get("company_name") or "")]
+            + [str(t) for t in job.get("tags") or []]
+        ).lower()
+        if needle not in haystack:
+            return False
+    return True
+
+
+def create_app(jobs: List[Dict[str, Any]], *, latency_ms: float = 0.0, jitter_ms: float = 0.0) -> FastAPI:
+    """App FastAPI com as rotas /api/remote-jobs e /api/remote-jobs/categories."""
+    app = FastAPI(title="Fake Remotive")
+    rng = random.Random(7)
+    stats = {"requests": 0}
+
+    async def _delay() -> None:
+        stats["requests"] += 1
+        delay = latency_ms + (rng.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000.0)
+
+    @app.get("/api/remote-jobs")
+    async def remote_jobs(
+        search: Optional[str] = Query(None),
+        category: Optional[str] = Query(None),
+        limit: Optional[int] = Query(None, ge=1),
+    ) -> Dict[str, Any]:
+        await _delay()
+        if search or category:
+            selected = [j for j in jobs if _matches(j, search, category)]
+        else:
+            selected = jobs
+        if limit:
+            selected = selected[:limit]
+        return {"0-legal-notice": "fake", "job-count": len(selected), "jobs": selected}
+
+    @app.get("/api/remote-jobs/categories")
+    async def categories() -> Dict[str, Any]:
+        await _delay()
+        return {"0-legal-notice": "fake", "job-count": len(CATEGORIES), "jobs": CATEGORIES}
+
+    @app.get("/_stats")
+    async def _stats() -> Dict[str, Any]:
+        """Quantas chamadas "upstream" a API fez (útil para medir cache/coalescing)."""
+        return {"requests": stats["requests"], "jobs": len(jobs)}
+
+    @app.post("/_publish")
+    async def _publish(count: int = Query(10, ge=1), expire: int = Query(0, ge=0)) -> Dict[str, Any]:
+        """Simula novas vagas (no topo do feed) e vagas encerradas (do fim)."""
+        next_id = max((int(j["id"]) for j in jobs), default=1_000_000) + 1
+        now = datetime.now(timezone.utc)
+        new_jobs = [synthetic_job(rng, next_id + i, now) for i in range(count)]
+        del jobs[len(jobs) - min(expire, len(jobs)):]
+        jobs[:0] = new_jobs
+        return {"added": [j["id"] for j in new_jobs], "jobs": len(jobs)}
+
+    return app
+
+
+def record(out: Path, base: str = "https://remotive.com/api") -> None:
+    """Grava o feed real da Remotive para reuso offline."""
+    r = httpx.get(f"{base}/remote-jobs", timeout=60.0, headers={"User-Agent": "Jobify/1.0"})
+    r.raise_for_status()
+    out.write_text(r.text, encoding="utf-8")
+    print(f">> Feed gravado em {out} ({len(r.json().get('jobs') or [])} vagas)")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    serve = sub.add_parser("serve", help="sobe o servidor fake")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--jobs", type=int, default=1000, help="tamanho do feed")
+    serve.add_argument("--latency-ms", type=float, default=50.0)
+    serve.add_argument("--jitter-ms", type=float, default=0.0)
+    serve.add_argument("--feed", type=Path, default=None, help="feed gravado (JSON da Remotive)")
+    serve.add_argument("--seed", type=int, default=42)
+
+    rec = sub.add_parser("record", help="grava o feed real da Remotive")
+    rec.add_argument("out", type=Path)
+
+    args = parser.parse_args(argv)
+    if args.cmd == "record":
+        record(args.out)
+        return
+
+    import uvicorn
+
+    jobs = build_feed(args.jobs, seed=args.seed, recorded=args.feed)
+    app = create_app(jobs, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
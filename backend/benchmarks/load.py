@@ -0,0 +1,383 @@
+# benchmarks/load.py
+"""
+Benchmark de carga ponta a ponta da API.
+
+Sobe a Remotive fake, um Postgres efêmero e a API (uvicorn) apontando para
+ambos; dispara as rotas /api/jobs, /api/jobs/{id}, /api/categories e
+/api/favorites com concorrência configurável e reporta throughput,
+p50/p95/p99 e memória (RSS do processo da API e workers).
+
+Uso:
+    python -m benchmarks.load --jobs 5000 --latency-ms 80 --concurrency 64 --duration 30
+    python -m benchmarks.load --compare benchmarks/results/load-<stamp>.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .fake_remotive import CATEGORIES, build_feed
+from .postgres import BACKEND_DIR, ephemeral_postgres, free_port, migrate, seed
+from .results import compare_metrics, load_results, save_results, summarize_latencies
+
+# (nome, peso) — mix padrão aproximando o tráfego do frontend. Todo cenário
+# que make_request_factory sabe montar aparece aqui; peso 0 = só via --mix
+DEFAULT_MIX: Dict[str, int] = {
+    "jobs_list": 40,
+    "jobs_search": 15,
+    "job_detail": 15,
+    "categories": 10,
+    "favorites_list": 8,
+    "favorites_add": 5,
+    "favorites_remove": 4,
+    "favorites_check": 3,
+    # prende uma conexão do banco por download: fora do mix padrão
+    "jobs_export": 0,
+}
+
+Request = Tuple[str, str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def wait_for_port(host: str, port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"{host}:{port} não respondeu em {timeout:.0f}s")
+
+
+def rss_bytes(pid: int) -> int:
+    """RSS do processo e de todos os descendentes (workers do uvicorn)."""
+    children: Dict[int, List[int]] = defaultdict(list)
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children[ppid].append(int(entry.name))
+
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            for line in Path(f"/proc/{current}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1]) * 1024
+                    break
+        except OSError:
+            pass
+        stack.extend(children.get(current, []))
+    return total
+
+
+class MemorySampler(threading.Thread):
+    """Amostra o RSS do servidor em background durante a carga."""
+
+    def __init__(self, pid: int, interval: float = 0.25) -> None:
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[int] = []
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            self.samples.append(rss_bytes(self.pid))
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> Dict[str, float]:
+        self._stop_event.set()
+        self.join()
+        if not self.samples:
+            return {"rss_start_mb": 0.0, "rss_peak_mb": 0.0, "rss_end_mb": 0.0}
+        mb = 1024 * 1024
+        return {
+            "rss_start_mb": self.samples[0] / mb,
+            "rss_peak_mb": max(self.samples) / mb,
+            "rss_end_mb": self.samples[-1] / mb,
+        }
+
+
+def make_request_factory(feed: List[Dict[str, Any]], seed_value: int) -> Callable[[str], Request]:
+    """Gera requisições representativas para cada cenário do mix."""
+    rng = random.Random(seed_value)
+    ids = [int(j["id"]) for j in feed]
+    searches = ["python", "react", "designer", "engineer", "aws", "sales"]
+
+    def build(kind: str) -> Request:
+        if kind == "jobs_list":
+            params: Dict[str, Any] = {"page": rng.randint(1, 5), "per_page": 20}
+            if rng.random() < 0.5:
+                params["category"] = rng.choice(CATEGORIES)["slug"]
+            return kind, "GET", "/api/jobs", params, None
+        if kind == "jobs_search":
+            return kind, "GET", "/api/jobs", {"q": rng.choice(searches), "page": 1, "per_page": 20}, None
+        if kind == "job_detail":
+            return kind, "GET", f"/api/jobs/{rng.choice(ids)}", None, None
+        if kind == "categories":
+            return kind, "GET", "/api/categories", None, None
+        if kind == "jobs_export":
+            params = {"format": rng.choice(["ndjson", "csv"])}
+            if rng.random() < 0.5:
+                params["category"] = rng.choice(CATEGORIES)["name"]
+            return kind, "GET", "/api/jobs/export", params, None
+        if kind == "favorites_list":
+            return kind, "GET", "/api/favorites", None, None
+        if kind == "favorites_add":
+            return kind, "POST", "/api/favorites", None, {"job_id": rng.choice(ids)}
+        if kind == "favorites_remove":
+            return kind, "DELETE", f"/api/favorites/{rng.choice(ids)}", None, None
+        if kind == "favorites_check":
+            return kind, "GET", f"/api/favorites/check/{rng.choice(ids)}", None, None
+        raise ValueError(f"Cenário desconhecido: {kind}")
+
+    return build
+
+
+async def drive(
+    base_url: str,
+    build: Callable[[str], Request],
+    mix: Dict[str, int],
+    *,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+    seed_value: int,
+) -> Dict[str, Any]:
+    """
+    Roda 'concurrency' clientes em loop fechado por 'duration' segundos
+    (após 'warmup' segundos descartados) e agrega as latências por cenário.
+    """
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        start = time.perf_counter()
+        measure_from = start + warmup
+        stop_at = measure_from + duration
+
+        async def worker(worker_id: int) -> None:
+            rng = random.Random(seed_value + worker_id)
+            while True:
+                now = time.perf_counter()
+                if now >= stop_at:
+                    return
+                kind, method, path, params, body = build(rng.choices(kinds, weights)[0])
+                t0 = time.perf_counter()
+                try:
+                    r = await client.request(method, path, params=params, json=body)
+                    status = str(r.status_code)
+                except httpx.HTTPError as exc:
+                    status = type(exc).__name__
+                elapsed_ms = (time.perf_counter() - t0) * 1000.0
+                if t0 >= measure_from:
+                    latencies[kind].append(elapsed_ms)
+                    statuses[kind][status] += 1
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+    routes: Dict[str, Dict[str, Any]] = {}
+    total = 0
+    for kind in kinds:
+        summary = summarize_latencies(latencies[kind])
+        summary["rps"] = summary["count"] / duration if duration else 0.0
+        summary["statuses"] = dict(statuses[kind])
+        routes[kind] = summary
+        total += summary["count"]
+
+    everything = [v for values in latencies.values() for v in values]
+    overall = summarize_latencies(everything)
+    overall["rps"] = total / duration if duration else 0.0
+    return {"routes": routes, "overall": overall}
+
+
+def start_fake_remotive(port: int, args: argparse.Namespace) -> subprocess.Popen:
+    cmd = [
+        sys.executable, "-m", "benchmarks.fake_remotive", "serve",
+        "--port", str(port),
+        "--jobs", str(args.jobs),
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--seed", str(args.seed),
+    ]
+    if args.feed:
+        cmd += ["--feed", str(args.feed)]
+    return subprocess.Popen(cmd, cwd=BACKEND_DIR)
+
+
+def start_api(port: int, database_url: str, remotive_base: str, args: argparse.Namespace) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "REMOTIVE_BASE": remotive_base,
+        "JWT_SECRET_KEY": "bench-secret",
+        "FAVORITES_WRITE_BEHIND": "true" if getattr(args, "write_behind", False) else "false",
+    }
+    cmd = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1",
+        "--port", str(port),
+        "--workers", str(args.workers),
+        "--log-level", "warning",
+        "--no-access-log",
+    ]
+    return subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env)
+
+
+def stop(proc: subprocess.Popen) -> None:
+    if proc.poll() is None:
+        proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    header = f"{'cenário':<18}{'req':>8}{'rps':>10}{'p50':>10}{'p95':>10}{'p99':>10}  status"
+    print(header)
+    print("-" * len(header))
+    rows = list(result["routes"].items()) + [("TOTAL", result["overall"])]
+    for name, s in rows:
+        statuses = ",".join(f"{k}:{v}" for k, v in sorted((s.get("statuses") or {}).items()))
+        print(
+            f"{name:<18}{s['count']:>8}{s['rps']:>10.1f}"
+            f"{s['p50']:>10.1f}{s['p95']:>10.1f}{s['p99']:>10.1f}  {statuses}"
+        )
+    mem = result["memory"]
+    print(
+        f"\nRSS API: início {mem['rss_start_mb']:.1f} MB | pico {mem['rss_peak_mb']:.1f} MB"
+        f" | fim {mem['rss_end_mb']:.1f} MB | chamadas upstream: {result['upstream_requests']}"
+    )
+
+
+def parse_mix(raw: Optional[str]) -> Dict[str, int]:
+    if not raw:
+        return {name: weight for name, weight in DEFAULT_MIX.items() if weight}
+    mix: Dict[str, int] = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in DEFAULT_MIX:
+            raise SystemExit(f"Cenário desconhecido em --mix: {name}")
+        mix[name.strip()] = int(weight or 1)
+    if not any(w > 0 for w in mix.values()):
+        raise SystemExit("--mix sem nenhum cenário com peso positivo")
+    return mix
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=2000, help="tamanho do feed fake")
+    parser.add_argument("--feed", type=Path, default=None, help="feed gravado da Remotive")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="latência da Remotive fake")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0, help="segundos medidos")
+    parser.add_argument("--warmup", type=float, default=3.0, help="segundos descartados")
+    parser.add_argument("--workers", type=int, default=1, help="workers do uvicorn")
+    parser.add_argument("--mix", default=None, help="ex.: jobs_list=5,job_detail=1")
+    parser.add_argument("--write-behind", action="store_true", help="favoritos em modo write-behind")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", type=Path, default=None, help="arquivo de resultado")
+    parser.add_argument("--compare", type=Path, default=None, help="resultado baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="regressão relativa aceita")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    feed = build_feed(args.jobs, seed=args.seed, recorded=args.feed)
+    fake_port, api_port = free_port(), free_port()
+
+    fake = start_fake_remotive(fake_port, args)
+    api: Optional[subprocess.Popen] = None
+    try:
+        with ephemeral_postgres() as database_url:
+            migrate(database_url)
+            asyncio.run(seed(database_url, feed))
+            wait_for_port("127.0.0.1", fake_port)
+
+            api = start_api(api_port, database_url, f"http://127.0.0.1:{fake_port}/api", args)
+            wait_for_port("127.0.0.1", api_port)
+
+            sampler = MemorySampler(api.pid)
+            sampler.start()
+            build = make_request_factory(feed, args.seed)
+            result = asyncio.run(
+                drive(
+                    f"http://127.0.0.1:{api_port}",
+                    build,
+                    mix,
+                    concurrency=args.concurrency,
+                    duration=args.duration,
+                    warmup=args.warmup,
+                    seed_value=args.seed,
+                )
+            )
+            result["memory"] = sampler.stop()
+            result["upstream_requests"] = (
+                httpx.get(f"http://127.0.0.1:{fake_port}/_stats").json().get("requests")
+            )
+            stop(api)
+            api = None
+    finally:
+        if api is not None:
+            stop(api)
+        stop(fake)
+
+    result["config"] = {
+        "jobs": args.jobs,
+        "feed": str(args.feed) if args.feed else None,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "workers": args.workers,
+        "write_behind": args.write_behind,
+        "mix": mix,
+    }
+    print_report(result)
+    path = save_results("load", result, args.out)
+    print(f">> Resultado salvo em {path}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        regressions = compare_metrics(
+            baseline.get("routes", {}),
+            result["routes"],
+            metrics=("p50", "p95", "p99"),
+            tolerance=args.tolerance,
+        )
+        if regressions:
+            print("\n!! Regressões em relação ao baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print("\n>> Sem regressões acima de "
+              f"{args.tolerance * 100:.0f}% em relação a {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
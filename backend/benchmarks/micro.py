@@ -0,0 +1,234 @@
+# benchmarks/micro.py
+"""
+Microbenchmarks das funções quentes do router de vagas.
+
+Mede tempo (mediana/mínimo de várias repetições) e alocações (pico e blocos
+retidos via tracemalloc) de:
+
+- _normalize_job (uma vaga por chamada, sobre o feed inteiro)
+- _extract_jobs_and_total
+- paginação sobre o bitmap do catálogo (primeira e última página)
+- filtro por facetas e contagens no índice invertido
+- páginas ordenadas (newest) com filtro denso e esparso
+- _normalize_categories (ordenação do list_categories)
+- serialização JSON de listas de JobOut
+- construção do JobStore (catálogo compacto) e leitura de uma vaga dele
+- índice de similaridade (TF-IDF) e top-10 de vagas parecidas
+
+com feeds sintéticos de 100 a 100k vagas.
+
+Uso:
+    python -m benchmarks.micro
+    python -m benchmarks.micro --sizes 100,10000 --repeat 7
+    python -m benchmarks.micro --compare benchmarks/results/baseline-micro.json
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# O router importa app.config, que exige essas variáveis.
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://bench@127.0.0.1:5432/bench")
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.routers.jobs import (  # noqa: E402
+    _extract_jobs_and_total,
+    _normalize_categories,
+    _normalize_job,
+)
+from app.schemas import JobOut  # noqa: E402
+from app.services.facets import FacetIndex, select_rows  # noqa: E402
+from app.services.job_store import JobStore  # noqa: E402
+from app.services.similarity import SimilarityIndex  # noqa: E402
+from app.services.sorting import SortIndex  # noqa: E402
+
+from .fake_remotive import build_feed  # noqa: E402
+from .results import compare_metrics, load_results, save_results  # noqa: E402
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000)
+
+_JOBS_ADAPTER = TypeAdapter(List[JobOut])
+
+
+def measure(fn: Callable[[], Any], *, repeat: int, min_time: float = 0.05) -> Dict[str, float]:
+    """
+    Executa 'fn' em lotes até somar pelo menos 'min_time' segundos por repetição
+    e devolve mediana/mínimo por chamada (µs), além do pico de memória e dos
+    blocos retidos pelo resultado de uma chamada isolada (tracemalloc).
+    """
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - t0 >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+
+    timings: List[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            timings.append((time.perf_counter() - t0) / loops * 1e6)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del result
+
+    return {
+        "median_us": statistics.median(timings),
+        "min_us": min(timings),
+        "loops": loops,
+        "peak_kib": peak / 1024.0,
+        "retained_blocks": max(0, blocks),
+    }
+
+
+def cases_for(size: int) -> Dict[str, Callable[[], Any]]:
+    """Casos de benchmark para um feed de 'size' vagas."""
+    raw_jobs = build_feed(size)
+    payload = {"job-count": size, "jobs": raw_jobs}
+    normalized, _ = _extract_jobs_and_total(payload)
+    last_page = max(1, (len(normalized) + 19) // 20)
+    raw_categories = [
+        {"id": i, "name": f"Category {(i * 7919) % size:06d}", "slug": f"cat-{i}"}
+        for i in range(size)
+    ]
+    job_outs = _JOBS_ADAPTER.validate_python(
+        [
+            {
+                "id": int(j["remotive_id"]),
+                "remotive_id": j["remotive_id"],
+                "title": j["title"],
+                "company": j["company"],
+                "location": j["location"],
+                "url": j["url"],
+                "posted_at": j["published_at"],
+                "description": j["description"],
+            }
+            for j in normalized
+        ]
+    )
+
+    store = JobStore.from_jobs(normalized)
+    middle_id = normalized[len(normalized) // 2]["id"]
+    index = FacetIndex(store)
+    sorting = SortIndex(store)
+    similarity = SimilarityIndex(store)
+    middle_row = store.row_of(middle_id)
+    category = normalized[0]["category"]
+    dense = index.mask_for("category", [category])
+    sparse = dense & index.mask_for("tag", ["python", "aws"], match_all=True)
+
+    def facet_filter_and_counts() -> Any:
+        masks = {
+            "category": index.mask_for("category", [category]),
+            "tag": index.mask_for("tag", ["python", "aws"]),
+        }
+        mask = index.all_mask & masks["category"] & masks["tag"]
+        return select_rows(mask, 0, 20), index.counts(index.all_mask, masks, limit=50)
+
+    def normalize_each() -> List[Dict[str, Any]]:
+        return [_normalize_job(j) for j in raw_jobs]
+
+    return {
+        "normalize_job": normalize_each,
+        "extract_jobs_and_total": lambda: _extract_jobs_and_total(payload),
+        "select_rows_first": lambda: select_rows(index.all_mask, 0, 20),
+        "select_rows_last": lambda: select_rows(index.all_mask, (last_page - 1) * 20, 20),
+        "facet_index_build": lambda: FacetIndex(store),
+        "facet_filter_and_counts": facet_filter_and_counts,
+        "sort_index_build": lambda: SortIndex(store),
+        "sorted_page_dense": lambda: sorting.page("newest", dense, 40, 20),
+        "sorted_page_sparse": lambda: sorting.page("newest", sparse, 0, 20),
+        "list_categories_sort": lambda: _normalize_categories(raw_categories),
+        "jobout_dump_json": lambda: _JOBS_ADAPTER.dump_json(job_outs),
+        "jobout_jsonable_encoder": lambda: json.dumps(jsonable_encoder(job_outs)).encode(),
+        "job_store_build": lambda: JobStore.from_jobs(normalized),
+        "job_store_get": lambda: store.get(middle_id),
+        "similarity_index_build": lambda: SimilarityIndex(store),
+        "similar_top10": lambda: similarity.similar(middle_row, 10),
+    }
+
+
+def run(sizes: List[int], repeat: int, only: Optional[List[str]]) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for size in sizes:
+        for name, fn in cases_for(size).items():
+            if only and name not in only:
+                continue
+            # o encoder genérico do FastAPI é bem mais lento; limitamos o tamanho
+            if name == "jobout_jsonable_encoder" and size > 10_000:
+                continue
+            key = f"{name}[{size}]"
+            stats = measure(fn, repeat=repeat)
+            results[key] = stats
+            print(
+                f"{key:<34}{stats['median_us']:>14.1f} µs (min {stats['min_us']:.1f})"
+                f"{stats['peak_kib']:>12.1f} KiB pico{stats['retained_blocks']:>10} blocos"
+            )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", default=None, help="casos separados por vírgula")
+    parser.add_argument("--out", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    only = [s.strip() for s in args.only.split(",")] if args.only else None
+    results = run(sizes, args.repeat, only)
+    path = save_results("micro", {"cases": results, "config": {"sizes": sizes, "repeat": args.repeat}}, args.out)
+    print(f">> Resultado salvo em {path}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        regressions = compare_metrics(
+            baseline.get("cases", {}),
+            results,
+            metrics=("min_us", "peak_kib", "retained_blocks"),
+            tolerance=args.tolerance,
+        )
+        if regressions:
+            print("\n!! Regressões em relação ao baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"\n>> Sem regressões acima de {args.tolerance * 100:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
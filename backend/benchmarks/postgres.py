@@ -0,0 +1,127 @@
+# benchmarks/postgres.py
+"""
+Postgres efêmero para benchmarks.
+
+Se BENCH_DATABASE_URL estiver definido, usa esse banco (ex.: o do docker-compose).
+Caso contrário, cria um cluster temporário com initdb/pg_ctl num diretório
+temporário e porta livre, destruído ao final.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import asyncpg
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+INIT_SQL = BACKEND_DIR / "database" / "init.sql"
+
+
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _pg_bin(name: str) -> str:
+    found = shutil.which(name)
+    if found:
+        return found
+    # Debian/Ubuntu instalam os binários fora do PATH
+    for candidate in sorted(Path("/usr/lib/postgresql").glob(f"*/bin/{name}"), reverse=True):
+        return str(candidate)
+    raise SystemExit(
+        f"'{name}' não encontrado. Instale o PostgreSQL ou defina BENCH_DATABASE_URL."
+    )
+
+
+@contextmanager
+def ephemeral_postgres() -> Iterator[str]:
+    """Gera a DATABASE_URL (asyncpg) de um banco vazio e descartável."""
+    external = os.environ.get("BENCH_DATABASE_URL")
+    if external:
+        yield external
+        return
+
+    tmp = Path(tempfile.mkdtemp(prefix="jobify-bench-pg-"))
+    data_dir = tmp / "data"
+    port = free_port()
+    subprocess.run(
+        [_pg_bin("initdb"), "-D", str(data_dir), "-U", "jobify_user", "--auth=trust", "-E", "UTF8"],
+        check=True,
+        capture_output=True,
+    )
+    subprocess.run(
+        [
+            _pg_bin("pg_ctl"), "-D", str(data_dir), "-l", str(tmp / "pg.log"), "-w",
+            "-o", f"-p {port} -k {tmp} -c listen_addresses=127.0.0.1 -c fsync=off",
+            "start",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    try:
+        subprocess.run(
+            [_pg_bin("createdb"), "-h", "127.0.0.1", "-p", str(port), "-U", "jobify_user", "jobify"],
+            check=True,
+            capture_output=True,
+        )
+        yield f"postgresql+asyncpg://jobify_user@127.0.0.1:{port}/jobify"
+    finally:
+        subprocess.run(
+            [_pg_bin("pg_ctl"), "-D", str(data_dir), "-m", "immediate", "-w", "stop"],
+            capture_output=True,
+        )
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def migrate(database_url: str) -> None:
+    """Aplica as migrations Alembic (mesmo caminho do deploy)."""
+    env = {**os.environ, "DATABASE_URL": database_url, "JWT_SECRET_KEY": "bench"}
+    subprocess.run(["alembic", "upgrade", "head"], cwd=BACKEND_DIR, env=env, check=True)
+
+
+def _asyncpg_dsn(database_url: str) -> str:
+    return database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+async def seed(database_url: str, feed: List[Dict[str, Any]]) -> None:
+    """
+    Roda o init.sql (usuário demo + categorias) e insere as vagas do feed fake
+    em jobify.jobs com id == id da Remotive, como o frontend envia nos favoritos.
+    """
+    conn = await asyncpg.connect(_asyncpg_dsn(database_url))
+    try:
+        await conn.execute(INIT_SQL.read_text(encoding="utf-8"))
+        await conn.executemany(
+            """
+            INSERT INTO jobify.jobs (id, remotive_id, title, company, location, url, description)
+            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            ON CONFLICT (id) DO NOTHING
+            """,
+            [
+                (
+                    int(j["id"]),
+                    str(j["id"]),
+                    (j.get("title") or "")[:255],
+                    j.get("company_name"),
+                    j.get("candidate_required_location"),
+                    j.get("url"),
+                    j.get("description"),
+                )
+                for j in feed
+            ],
+        )
+        await conn.execute(
+            "SELECT setval(pg_get_serial_sequence('jobify.jobs', 'id'), "
+            "(SELECT COALESCE(MAX(id), 1) FROM jobify.jobs))"
+        )
+    finally:
+        await conn.close()
+
@@ -0,0 +1,114 @@
+# benchmarks/results.py
+from __future__ import annotations
+
+import json
+import math
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """
+    Percentil por interpolação linear (mesmo critério do numpy 'linear').
+    Espera os valores já ordenados.
+    """
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return float(sorted_values[0])
+    rank = (pct / 100.0) * (len(sorted_values) - 1)
+    lo = math.floor(rank)
+    hi = math.ceil(rank)
+    if lo == hi:
+        return float(sorted_values[lo])
+    frac = rank - lo
+    return float(sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * frac)
+
+
+def summarize_latencies(latencies_ms: Iterable[float]) -> Dict[str, float]:
+    """Resumo padrão de latências (ms) usado em todos os relatórios."""
+    values = sorted(latencies_ms)
+    if not values:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": values[-1],
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+        return out.stdout.strip() or None
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def save_results(kind: str, payload: Dict[str, Any], out: Optional[Path] = None) -> Path:
+    """
+    Grava o resultado em benchmarks/results/<kind>-<timestamp>.json (ou em 'out'),
+    junto com metadados (revisão git, python, máquina) para comparação posterior.
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    doc = {
+        "kind": kind,
+        "created_at": stamp,
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        **payload,
+    }
+    path = out or RESULTS_DIR / f"{kind}-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(doc, indent=2, sort_keys=True), encoding="utf-8")
+    return path
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare_metrics(
+    baseline: Dict[str, Dict[str, float]],
+    current: Dict[str, Dict[str, float]],
+    *,
+    metrics: Sequence[str],
+    tolerance: float,
+) -> List[str]:
+    """
+    Compara métricas "quanto menor, melhor" entre duas execuções.
+
+    Retorna uma linha por regressão acima da tolerância relativa
+    (ex.: 0.10 = 10% pior que o baseline). Lista vazia = sem regressões.
+    """
+    regressions: List[str] = []
+    for name, cur in current.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in metrics:
+            b = base.get(metric)
+            c = cur.get(metric)
+            if b is None or c is None or b <= 0:
+                continue
+            delta = (c - b) / b
+            if delta > tolerance:
+                regressions.append(
+                    f"{name}.{metric}: {b:.3f} -> {c:.3f} (+{delta * 100:.1f}%)"
+                )
+    return regressions
@@ -0,0 +1,217 @@
+# benchmarks/startup.py
+"""
+Tempo de startup da API: orçamento de import e tempo até healthy/ready.
+
+- import: roda `python -X importtime -c "import app.main"` em interpretadores
+  novos, soma o tempo cumulativo de app.main e lista os módulos mais caros.
+  O app importado precisa já ter as rotas de --routes-prefix (os routers
+  entram no orçamento: adiá-los para o lifespan só esconderia o custo). Sai
+  com código 1 se o mínimo passar de --budget-ms.
+- serve (--serve): sobe a Remotive fake, um Postgres efêmero e a API via
+  uvicorn e mede quanto tempo o processo leva para responder /healthz (vivo)
+  e /readyz (pool do banco e caches aquecidos).
+
+Uso:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget-ms 700 --repeat 7
+    python -m benchmarks.startup --serve --jobs 5000
+    python -m benchmarks.startup --compare benchmarks/results/baseline-startup.json
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from .load import BACKEND_DIR, start_api, start_fake_remotive, stop, wait_for_port
+from .postgres import ephemeral_postgres, free_port, migrate
+from .results import compare_metrics, load_results, save_results
+
+DEFAULT_MODULE = "app.main"
+# FastAPI, SQLAlchemy e httpx (via routers) respondem por quase todo o tempo
+DEFAULT_BUDGET_MS = 800.0
+DEFAULT_ROUTES_PREFIX = "/api"
+
+# roda depois do import (fora da medição): o app tem que sair montado
+_ROUTES_CHECK = """
+import sys
+app = getattr(sys.modules[{module!r}], "app", None)
+paths = [getattr(r, "path", "") for r in getattr(app, "routes", [])]
+if not any(p.startswith({prefix!r}) for p in paths):
+    sys.exit("{module}.app sem rotas {prefix} depois do import")
+"""
+
+# app.config exige essas variáveis (o valor não importa para o import)
+BENCH_ENV = {
+    "DATABASE_URL": "postgresql+asyncpg://bench@127.0.0.1:5432/bench",
+    "JWT_SECRET_KEY": "bench-secret",
+}
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Linhas do -X importtime como (módulo, self µs, cumulativo µs)."""
+    rows: List[Tuple[str, int, int]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure_import(module: str, repeat: int, top: int, routes_prefix: Optional[str] = None) -> Dict[str, Any]:
+    env = {**os.environ, **BENCH_ENV}
+    code = f"import {module}\n"
+    if routes_prefix:
+        code += _ROUTES_CHECK.format(module=module, prefix=routes_prefix)
+    totals: List[float] = []
+    heaviest: Dict[str, int] = {}
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=BACKEND_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise SystemExit(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"import {module} falhou")
+        rows = parse_importtime(proc.stderr)
+        total = next((cum for name, _, cum in rows if name == module), None)
+        if total is None:
+            raise SystemExit(f"{module} não aparece na saída do -X importtime")
+        totals.append(total / 1000)
+        # pacotes de topo (primeiro nível do nome) por tempo próprio somado
+        by_package: Dict[str, int] = {}
+        for name, self_us, _ in rows:
+            root = name.split(".")[0]
+            by_package[root] = by_package.get(root, 0) + self_us
+        for root, us in by_package.items():
+            heaviest[root] = min(heaviest.get(root, us), us)
+
+    ranked = sorted(heaviest.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "min_ms": min(totals),
+        "median_ms": statistics.median(totals),
+        "max_ms": max(totals),
+        "packages_ms": {name: us / 1000 for name, us in ranked},
+    }
+
+
+def wait_for_status(url: str, since: float, timeout: float) -> float:
+    """Milissegundos desde 'since' (monotonic) até 'url' responder 200."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return (time.monotonic() - since) * 1000
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.02)
+    raise TimeoutError(f"{url} não respondeu 200 em {timeout:.0f}s")
+
+
+def measure_serve(args: argparse.Namespace) -> Dict[str, Any]:
+    fake_port, api_port = free_port(), free_port()
+    fake = start_fake_remotive(fake_port, args)
+    api: Optional[subprocess.Popen] = None
+    try:
+        with ephemeral_postgres() as database_url:
+            migrate(database_url)
+            wait_for_port("127.0.0.1", fake_port)
+            base = f"http://127.0.0.1:{api_port}"
+            started = time.monotonic()
+            api = start_api(api_port, database_url, f"http://127.0.0.1:{fake_port}/api", args)
+            # healthy/ready contados a partir do spawn do processo
+            healthy_ms = wait_for_status(f"{base}/healthz", started, args.timeout)
+            ready_ms = wait_for_status(f"{base}/readyz", started, args.timeout)
+            first_page = time.monotonic()
+            httpx.get(f"{base}/api/jobs", timeout=10.0).raise_for_status()
+            first_page_ms = (time.monotonic() - first_page) * 1000
+    finally:
+        if api is not None:
+            stop(api)
+        stop(fake)
+    return {
+        "healthy_ms": healthy_ms,
+        "ready_ms": ready_ms,
+        "first_page_ms": first_page_ms,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="pacotes mais caros no relatório")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="orçamento do import")
+    parser.add_argument(
+        "--routes-prefix",
+        default=DEFAULT_ROUTES_PREFIX,
+        help="rotas que o app precisa ter logo após o import ('' desliga a checagem)",
+    )
+    parser.add_argument("--serve", action="store_true", help="mede também healthy/ready via uvicorn")
+    parser.add_argument("--jobs", type=int, default=2000, help="tamanho do feed fake (--serve)")
+    parser.add_argument("--feed", type=Path, default=None)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--out", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    imports = measure_import(args.module, args.repeat, args.top, args.routes_prefix)
+    print(
+        f"import {imports['module']}: min {imports['min_ms']:.1f} ms"
+        f" | mediana {imports['median_ms']:.1f} ms | orçamento {args.budget_ms:.0f} ms"
+    )
+    for name, ms in imports["packages_ms"].items():
+        print(f"   {name:<28}{ms:>10.1f} ms")
+
+    result: Dict[str, Any] = {"import": imports, "config": {"budget_ms": args.budget_ms, "repeat": args.repeat}}
+    if args.serve:
+        serve = measure_serve(args)
+        result["serve"] = serve
+        print(
+            f"\nhealthy em {serve['healthy_ms']:.0f} ms | ready em {serve['ready_ms']:.0f} ms"
+            f" | primeira página {serve['first_page_ms']:.1f} ms"
+        )
+
+    path = save_results("startup", result, args.out)
+    print(f">> Resultado salvo em {path}")
+
+    status = 0
+    if imports["min_ms"] > args.budget_ms:
+        print(f"\n!! import de {args.module} acima do orçamento ({imports['min_ms']:.1f} ms > {args.budget_ms:.0f} ms)")
+        status = 1
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        regressions = compare_metrics(
+            {k: baseline[k] for k in ("import", "serve") if k in baseline},
+            {k: result[k] for k in ("import", "serve") if k in result},
+            metrics=("min_ms", "healthy_ms", "ready_ms", "first_page_ms"),
+            tolerance=args.tolerance,
+        )
+        if regressions:
+            print("\n!! Regressões em relação ao baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"\n>> Sem regressões acima de {args.tolerance * 100:.0f}%")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+# tests/conftest.py
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# app.config exige essas variáveis; os testes de unidade não abrem conexão com o banco
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://test@127.0.0.1:5432/test")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+# permite rodar "python -m pytest" de backend/ ou da raiz do repositório
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture(scope="session")
+def database_url():
+    """
+    Banco descartável para os testes de integração (TEST_DATABASE_URL, asyncpg).
+    O schema jobify é recriado pelas migrations; sem a variável, os testes
+    são pulados.
+    """
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL não definido")
+    import asyncio
+
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async def reset():
+        engine = create_async_engine(url)
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA IF EXISTS jobify CASCADE"))
+            await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        await engine.dispose()
+
+    asyncio.run(reset())
+    env = {**os.environ, "DATABASE_URL": url}
+    subprocess.run(["alembic", "upgrade", "head"], cwd=BACKEND_DIR, env=env, check=True, capture_output=True)
+    return url
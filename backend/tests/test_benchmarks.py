@@ -0,0 +1,55 @@
+# tests/test_benchmarks.py
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fake_remotive import build_feed
+from benchmarks.load import DEFAULT_MIX, make_request_factory, parse_mix
+
+README = Path(__file__).resolve().parents[1] / "benchmarks" / "README.md"
+
+
+def test_every_scenario_in_the_mix_can_be_built():
+    build = make_request_factory(build_feed(20, seed=1), 1)
+    for name in DEFAULT_MIX:
+        kind, method, path, _, _ = build(name)
+        assert kind == name
+        assert method in ("GET", "POST", "DELETE")
+        assert path.startswith("/api/")
+
+
+def test_default_mix_leaves_out_zero_weights():
+    mix = parse_mix(None)
+    assert "jobs_export" not in mix
+    assert all(weight > 0 for weight in mix.values())
+
+
+def test_mix_examples_from_the_readme_parse():
+    readme = README.read_text(encoding="utf-8")
+    examples = re.findall(r"--mix ([\w=,]+)", readme)
+    assert any("jobs_export" in example for example in examples)
+    for example in examples:
+        assert parse_mix(example)
+
+
+@pytest.mark.parametrize("raw", ["nope=1", "jobs_list=0"])
+def test_invalid_mix_is_rejected(raw):
+    with pytest.raises(SystemExit):
+        parse_mix(raw)
+
+
+def test_importing_the_app_does_not_build_settings_or_load_numpy():
+    check = (
+        "import sys, app.main\n"
+        "from app.config import get_settings\n"
+        "assert any(r.path.startswith('/api') for r in app.main.app.routes)\n"
+        "assert get_settings.cache_info().currsize == 0\n"
+        "assert 'numpy' not in sys.modules\n"
+    )
+    # sem as variáveis obrigatórias: o import não pode depender do ambiente
+    env = {k: v for k, v in os.environ.items() if k not in ("DATABASE_URL", "JWT_SECRET_KEY")}
+    subprocess.run([sys.executable, "-c", check], cwd=README.parents[1], env=env, check=True)
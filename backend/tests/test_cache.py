@@ -0,0 +1,65 @@
+# tests/test_cache.py
+import asyncio
+import time
+
+import pytest
+
+from app.services.cache import MemoryCache, SharedMemoryCache
+
+
+@pytest.fixture(params=["memory", "shm"])
+def make_cache(request, tmp_path):
+    if request.param == "memory":
+        shared = MemoryCache()
+        return lambda: shared
+    # cada chamada é um "worker" diferente sobre o mesmo diretório
+    return lambda: SharedMemoryCache(tmp_path / "cache")
+
+
+def test_values_expire_with_their_ttl(make_cache):
+    async def scenario():
+        cache = make_cache()
+        await cache.set("forever", b"a")
+        await cache.set("short", b"b", ttl=0.05)
+        before = (await cache.get("forever"), await cache.get("short"), await cache.get("missing"))
+        await asyncio.sleep(0.1)
+        return before, await cache.get("short")
+
+    before, after = asyncio.run(scenario())
+    assert before == (b"a", b"b", None)
+    assert after is None
+
+
+def test_versions_are_shared_and_monotonic(make_cache):
+    async def scenario():
+        writer, reader = make_cache(), make_cache()
+        start = await reader.version("catalog")
+        bumped = [await writer.bump_version("catalog") for _ in range(3)]
+        await writer.set("catalog:data", b"v3")
+        return start, bumped, await reader.version("catalog"), await reader.get("catalog:data")
+
+    assert asyncio.run(scenario()) == (0, [1, 2, 3], 3, b"v3")
+
+
+def test_only_one_holder_of_the_lock(make_cache):
+    async def scenario():
+        first, second = make_cache(), make_cache()
+        taken = [await first.try_lock("refresh"), await second.try_lock("refresh"), await first.try_lock("refresh")]
+        await first.unlock("refresh")
+        taken.append(await second.try_lock("refresh"))
+        await second.unlock("refresh")
+        return taken
+
+    assert asyncio.run(scenario()) == [True, False, False, True]
+
+
+def test_shm_sweep_removes_expired_files(tmp_path):
+    async def scenario():
+        cache = SharedMemoryCache(tmp_path)
+        await cache.set("old", b"x", ttl=0.01)
+        await cache.set("kept", b"y")
+        time.sleep(0.02)
+        cache._sweep()
+        return len(list(tmp_path.glob("*.val"))), await cache.get("kept")
+
+    assert asyncio.run(scenario()) == (1, b"y")
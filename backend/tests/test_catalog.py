@@ -0,0 +1,61 @@
+# tests/test_catalog.py
+import asyncio
+
+from app.services.cache import MemoryCache
+from app.services.catalog import Catalog, CatalogDelta
+
+
+def delta(version, added=(), removed=()):
+    return CatalogDelta(version, list(added), list(removed))
+
+
+def test_merge_keeps_order_of_net_changes():
+    added, removed = CatalogDelta.merge([delta(2, added=["a", "b"], removed=["x"]), delta(3, added=["c"])])
+    assert added == ["a", "b", "c"]
+    assert removed == ["x"]
+
+
+def test_merge_drops_ids_whose_membership_did_not_change():
+    deltas = [
+        delta(2, added=["a"], removed=["x"]),
+        delta(3, added=["x"], removed=["a"]),
+        delta(4, added=["b"]),
+    ]
+    assert CatalogDelta.merge(deltas) == (["b"], [])
+
+
+def test_merge_removed_then_readded_then_removed_again():
+    deltas = [delta(2, removed=["x"]), delta(3, added=["x"]), delta(4, removed=["x"])]
+    assert CatalogDelta.merge(deltas) == ([], ["x"])
+
+
+def test_merge_empty():
+    assert CatalogDelta.merge([]) == ([], [])
+
+
+def test_delta_roundtrip():
+    original = delta(7, added=["a"], removed=["b", "c"])
+    assert CatalogDelta.loads(original.dumps()) == original
+
+
+def test_fallback_rebuild_waits_for_the_lock_and_stamps_the_published_version():
+    async def scenario():
+        cache = MemoryCache()
+        loads = []
+
+        async def loader():
+            loads.append(1)
+            return [{"id": "1", "title": "Backend", "category": "Software Development"}]
+
+        catalog = Catalog(cache, loader, name="t", wait_timeout=0.05)
+        await cache.try_lock("t")  # outro worker "travado" atualizando
+        waiting = asyncio.ensure_future(catalog.refresh(wait=True))
+        await asyncio.sleep(0.3)
+        assert not waiting.done() and loads == []  # não monta sem o lock
+        await cache.unlock("t")
+        snap = await waiting
+        stamped = (await catalog._load_published_state())[0]
+        return snap.version, await cache.version("t"), stamped
+
+    version, published, stamped = asyncio.run(scenario())
+    assert version == published == stamped == 1
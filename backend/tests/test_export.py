@@ -0,0 +1,274 @@
+# tests/test_export.py
+import asyncio
+import csv
+import gzip
+import io
+import json
+import zlib
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.services.export import (
+    EXPORT_FIELDS,
+    ExportBusy,
+    ExportSlots,
+    ExportStream,
+    accepts_gzip,
+    export_query,
+)
+from app.services.job_store import JobStore
+from app.services.sync import persist_catalog
+
+T0 = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def job(job_id, title, **extra):
+    return {
+        "id": str(job_id),
+        "remotive_id": str(job_id),
+        "title": title,
+        "company": "Acme",
+        "category": "Software Development",
+        "job_type": "full_time",
+        "location": "Worldwide",
+        "url": f"https://example.com/{job_id}",
+        "published_at": "2026-09-30T10:00:00",
+        "description": "<p>...</p>",
+        "tags": ["python"],
+        **extra,
+    }
+
+
+def with_database(url, scenario):
+    async def run():
+        engine = create_async_engine(url)
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text("TRUNCATE jobify.favorites, jobify.jobs CASCADE"))
+            return await scenario(async_sessionmaker(engine, expire_on_commit=False))
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+async def exported_ids(sessions, **filters):
+    async with sessions() as session:
+        rows = await session.execute(export_query(**filters))
+        return sorted(r.id for r in rows)
+
+
+def test_incremental_export_skips_rows_only_re_seen(database_url):
+    async def scenario(sessions):
+        first = JobStore.from_jobs([job(101, "Backend"), job(102, "Frontend"), job(103, "Data")])
+        await persist_catalog(sessions, first, seen_resolution=3600, now=T0)
+
+        # duas horas depois: 101 igual (last_seen vencido, é regravado), 102
+        # mudou, 103 saiu do feed, 104 é nova
+        later = T0 + timedelta(hours=2)
+        second = JobStore.from_jobs([job(101, "Backend"), job(102, "Frontend Sr"), job(104, "QA")])
+        counts = await persist_catalog(sessions, second, seen_resolution=3600, now=later)
+
+        async with sessions() as session:
+            seen = dict((await session.execute(text("SELECT id, last_seen FROM jobify.jobs"))).all())
+        since = T0 + timedelta(hours=1)
+        return (
+            counts,
+            seen,
+            await exported_ids(sessions, since=since),
+            await exported_ids(sessions, since=since, include_expired=True),
+            await exported_ids(sessions),
+        )
+
+    counts, seen, active, with_expired, everything = with_database(database_url, scenario)
+    assert counts == {"seen": 3, "upserted": 3, "expired": 1}
+    assert seen[101] == T0 + timedelta(hours=2)  # last_seen andou mesmo sem mudança
+    assert active == [102, 104]
+    assert with_expired == [102, 103, 104]
+    assert everything == [101, 102, 104]
+
+
+def test_job_back_in_the_feed_is_exported_again(database_url):
+    async def scenario(sessions):
+        store = JobStore.from_jobs([job(201, "Backend")])
+        await persist_catalog(sessions, store, seen_resolution=3600, now=T0)
+        await persist_catalog(sessions, JobStore.from_jobs([job(202, "Other")]), seen_resolution=3600, now=T0 + timedelta(minutes=1))
+        await persist_catalog(sessions, store, seen_resolution=3600, now=T0 + timedelta(minutes=30))
+        return await exported_ids(sessions, since=T0 + timedelta(minutes=10))
+
+    assert with_database(database_url, scenario) == [201]
+
+
+def test_filters_ignore_case_and_surrounding_spaces_like_the_listing(database_url):
+    async def scenario(sessions):
+        store = JobStore.from_jobs([
+            job(301, "Backend", job_type="Full_Time"),
+            job(302, "Frontend", job_type="contract", location="USA Only"),
+            job(303, "Data", category="Data", job_type="part_time"),
+        ])
+        await persist_catalog(sessions, store, seen_resolution=3600, now=T0)
+        return (
+            await exported_ids(sessions, job_type=[" full_time "]),
+            await exported_ids(sessions, location=["usa only"]),
+            await exported_ids(sessions, category=["software development"], job_type=["CONTRACT"]),
+        )
+
+    assert with_database(database_url, scenario) == ([301], [302], [302])
+
+
+def test_export_slot_is_released_when_the_query_cannot_start():
+    class Broken:
+        async def stream(self, stmt):
+            raise OSError("conexão recusada")
+
+        async def close(self):
+            pass
+
+    def refused():
+        raise OSError("pool esgotado")
+
+    slots = ExportSlots(1, retry_after=5)
+    for factory in (Broken, refused):
+        slots.acquire()
+        with pytest.raises(OSError):
+            asyncio.run(ExportStream.open(factory, export_query(), chunk_size=10, fmt="ndjson", on_close=slots.release))
+        assert slots.active == 0
+
+    slots.acquire()
+    with pytest.raises(ExportBusy):
+        slots.acquire()
+
+
+def test_persist_keeps_the_last_duplicate_and_advances_the_id_sequence(database_url):
+    async def scenario(sessions):
+        # feed com id repetido no mesmo lote e uma vaga sem id numérico
+        store = JobStore.from_jobs([job(401, "Old title"), job(5, "Other"), job(401, "New title"), job("ext-1", "Partner")])
+        counts = await persist_catalog(sessions, store, seen_resolution=3600, now=T0)
+        async with sessions() as session:
+            rows = dict((await session.execute(text("SELECT remotive_id, id FROM jobify.jobs"))).all())
+            title = await session.scalar(text("SELECT title FROM jobify.jobs WHERE id = 401"))
+            # a próxima vaga vinda da sequence não colide com os ids da Remotive
+            next_id = await session.scalar(text("SELECT nextval(pg_get_serial_sequence('jobify.jobs', 'id'))"))
+        return counts, rows, title, next_id
+
+    counts, rows, title, next_id = with_database(database_url, scenario)
+    assert counts["seen"] == 3
+    assert title == "New title"
+    assert rows["401"] == 401 and rows["5"] == 5
+    assert rows["ext-1"] > 401
+    assert next_id > rows["ext-1"]
+
+
+def exported_row(job_id, **extra):
+    values = {
+        "id": job_id,
+        "remotive_id": str(job_id),
+        "title": f"Vaga {job_id}, \"sênior\"",
+        "company": "Acme",
+        "category": "Software Development",
+        "job_type": "full_time",
+        "location": "Worldwide",
+        "url": None,
+        "posted_at": T0,
+        "tags": ["python", "sql"],
+        "description": "linha 1\nlinha 2",
+        "expired_at": None,
+        **extra,
+    }
+    return SimpleNamespace(**values)
+
+
+class FakeResult:
+    def __init__(self, partitions):
+        self._partitions = partitions
+        self.closed = False
+
+    async def partitions(self):
+        for partition in self._partitions:
+            yield partition
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, partitions):
+        self.result = FakeResult(partitions)
+        self.closed = False
+
+    async def stream(self, stmt):
+        return self.result
+
+    async def close(self):
+        self.closed = True
+
+
+def run_export(fmt, partitions, gzip_level=None):
+    session = FakeSession(partitions)
+    released = []
+
+    async def scenario():
+        export = await ExportStream.open(
+            lambda: session, export_query(), chunk_size=2, fmt=fmt, gzip_level=gzip_level,
+            on_close=lambda: released.append(1),
+        )
+        return [chunk async for chunk in export.chunks()]
+
+    chunks = asyncio.run(scenario())
+    assert session.closed and session.result.closed and released == [1]
+    return chunks
+
+
+def test_ndjson_export_has_one_record_per_line():
+    rows = [exported_row(1), exported_row(2, tags=None, posted_at=None, expired_at=T0, remotive_id=None)]
+    body = b"".join(run_export("ndjson", [rows[:1], rows[1:]])).decode("utf-8")
+    records = [json.loads(line) for line in body.splitlines()]
+    assert [r["id"] for r in records] == ["1", "2"]
+    assert list(records[0]) == list(EXPORT_FIELDS)
+    assert records[0]["published_at"] == T0.isoformat() and records[0]["title"] == 'Vaga 1, "sênior"'
+    assert (records[1]["tags"], records[1]["published_at"], records[1]["remotive_id"]) == ([], None, "")
+    assert records[1]["expired_at"] == T0.isoformat()
+    assert body.endswith("\n")
+
+
+def test_csv_export_has_a_header_and_quoted_fields():
+    chunks = run_export("csv", [[exported_row(1), exported_row(2)], [exported_row(3)]])
+    # cabeçalho e um chunk por lote do cursor
+    assert len(chunks) == 3
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+    assert rows[0] == list(EXPORT_FIELDS)
+    assert [r[0] for r in rows[1:]] == ["1", "2", "3"]
+    record = dict(zip(EXPORT_FIELDS, rows[1]))
+    assert record["tags"] == "python, sql"
+    assert record["title"] == 'Vaga 1, "sênior"' and record["description"] == "linha 1\nlinha 2"
+
+
+def test_gzip_export_decompresses_chunk_by_chunk():
+    chunks = run_export("ndjson", [[exported_row(1)], [exported_row(2)]], gzip_level=6)
+    # cada lote sai com SYNC_FLUSH: o prefixo já descomprime sem o trailer
+    head = zlib.decompressobj(31).decompress(chunks[0])
+    assert json.loads(head.decode("utf-8"))["id"] == "1"
+    body = gzip.decompress(b"".join(chunks)).decode("utf-8")
+    assert [json.loads(line)["id"] for line in body.splitlines()] == ["1", "2"]
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        (None, False),
+        ("", False),
+        ("gzip", True),
+        ("br, GZIP;q=0.8", True),
+        ("deflate, gzip;q=0", False),
+        ("*", True),
+        ("identity, *;q=0", False),
+        ("gzip;q=abc", False),
+        ("x-gzip", False),
+    ],
+)
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) is expected
@@ -0,0 +1,78 @@
+# tests/test_facets.py
+import random
+
+import pytest
+
+from app.services.facets import FacetIndex, bitmap_from_rows, select_rows
+from app.services.job_store import JobStore
+
+CATEGORIES = ["Software Development", "Design", "Marketing", None]
+JOB_TYPES = ["full_time", "contract"]
+TAGS = ["python", "go", "react", "sql"]
+
+
+def make_jobs(n, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": str(1000 + i),
+            "remotive_id": str(1000 + i),
+            "title": f"Job {i}",
+            "company": rng.choice(["Acme", "beta", "Zeta", None]),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "job_type": rng.choice(JOB_TYPES),
+            "location": rng.choice(["Worldwide", "USA"]),
+            "tags": rng.sample(TAGS, rng.randint(0, 3)),
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    jobs = make_jobs(300)
+    return jobs, FacetIndex(JobStore.from_jobs(jobs))
+
+
+def rows_of(mask):
+    return [r for r in range(mask.bit_length()) if mask >> r & 1]
+
+
+def test_bitmap_roundtrip():
+    rows = [0, 3, 63, 64, 65, 200]
+    mask = bitmap_from_rows(rows, 201)
+    assert rows_of(mask) == rows
+    assert mask.bit_count() == len(rows)
+
+
+@pytest.mark.parametrize("start,count", [(0, 5), (2, 3), (4, 10), (6, 1), (0, 0), (100, 5)])
+def test_select_rows_pages_over_set_bits(start, count):
+    rows = [1, 5, 64, 70, 127, 128, 500]
+    mask = bitmap_from_rows(rows, 501)
+    assert select_rows(mask, start, count) == rows[start:start + count]
+
+
+def test_mask_for_or_and_match_all(catalog):
+    jobs, index = catalog
+    design_or_marketing = index.mask_for("category", ["design", " Marketing "])
+    assert rows_of(design_or_marketing) == [
+        r for r, j in enumerate(jobs) if j["category"] in ("Design", "Marketing")
+    ]
+    both = index.mask_for("tag", ["python", "sql"], match_all=True)
+    assert rows_of(both) == [r for r, j in enumerate(jobs) if {"python", "sql"} <= set(j["tags"])]
+    assert index.mask_for("category", ["desconhecida"]) == 0
+
+
+def test_counts_by_facet(catalog):
+    jobs, index = catalog
+    counts = index.counts(index.all_mask, {})
+    by_value = {c["value"]: c["count"] for c in counts["category"]}
+    assert by_value["Design"] == sum(1 for j in jobs if j["category"] == "Design")
+
+    # facetas disjuntivas: o filtro de tipo restringe as categorias, mas não
+    # os próprios tipos
+    contract = index.mask_for("job_type", ["contract"])
+    filtered = index.counts(index.all_mask, {"job_type": contract})
+    by_value = {c["value"]: c["count"] for c in filtered["category"]}
+    assert by_value["Design"] == sum(1 for j in jobs if j["category"] == "Design" and j["job_type"] == "contract")
+    assert {c["value"] for c in filtered["job_type"]} == set(JOB_TYPES)
@@ -0,0 +1,71 @@
+# tests/test_job_store.py
+import pickle
+
+import pytest
+
+from app.services.job_store import JobStore
+
+JOBS = [
+    {
+        "id": "300",
+        "remotive_id": "300",
+        "title": "Backend Engineer",
+        "company": "Acme",
+        "category": "Software Development",
+        "job_type": "full_time",
+        "location": "Worldwide",
+        "url": "https://example.com/300",
+        "published_at": "2026-09-30T10:00:00",
+        "description": "<p>Python e Postgres</p>",
+        "tags": ["python", "sql"],
+    },
+    {"id": "12", "remotive_id": "", "title": "Designer", "company": "Acme", "tags": []},
+    {"id": "ext-7", "title": "Parceiro", "description": None},
+    {"id": "007", "title": "Zero à esquerda"},
+]
+
+
+def expected(job):
+    return {
+        "id": job["id"],
+        "remotive_id": job.get("remotive_id") or "",
+        "title": job["title"],
+        "company": job.get("company"),
+        "category": job.get("category"),
+        "job_type": job.get("job_type"),
+        "location": job.get("location"),
+        "url": job.get("url"),
+        "published_at": job.get("published_at"),
+        "description": job.get("description"),
+        "is_favorite": False,
+        "tags": job.get("tags") or [],
+    }
+
+
+@pytest.fixture(scope="module")
+def store():
+    return JobStore.from_jobs(JOBS)
+
+
+def test_rows_come_back_in_the_normalized_format(store):
+    assert len(store) == len(JOBS)
+    assert [store.row(r) for r in range(len(store))] == [expected(j) for j in JOBS]
+    assert store.row(0, with_description=False)["description"] is None
+
+
+@pytest.mark.parametrize("job_id,row", [("300", 0), ("12", 1), ("ext-7", 2), ("007", 3), ("7", None), ("999", None), ("", None)])
+def test_row_of_finds_numeric_and_other_ids(store, job_id, row):
+    assert store.row_of(job_id) == row
+
+
+def test_pickle_roundtrip_keeps_every_column(store):
+    copy = pickle.loads(pickle.dumps(store, protocol=pickle.HIGHEST_PROTOCOL))
+    assert [copy.row(r) for r in range(len(copy))] == [store.row(r) for r in range(len(store))]
+    assert copy.get("ext-7") == store.get("ext-7")
+    assert copy.vocab == store.vocab
+
+
+def test_unknown_pickle_format_is_rejected(store):
+    fmt, values = store.__getstate__()
+    with pytest.raises(ValueError):
+        JobStore().__setstate__((fmt + 1, values))
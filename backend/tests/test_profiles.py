@@ -0,0 +1,140 @@
+# tests/test_profiles.py
+import asyncio
+
+from app.services.cache import MemoryCache
+from app.services.job_store import JobStore
+from app.services.profiles import FeedIndex, ProfileStore, UserProfile, job_features
+
+FEATURES = ["category:software development", "company:acme"]
+
+
+def store(**kwargs):
+    return ProfileStore(MemoryCache(), ttl=60, **kwargs)
+
+
+def test_profile_add_and_remove_are_idempotent_and_round_trip():
+    profile = UserProfile()
+    features = job_features("Software Development", " ACME ", ["Python", "python", "SQL"])
+    assert features == ["category:software development", "company:acme", "tag:python", "tag:sql"]
+    assert profile.add("10", "r10", features) and not profile.add("10", "r10", features)
+    profile.add("11", "", ["company:acme"])
+    assert profile.weights["company:acme"] == 2.0
+    assert profile.catalog_ids() == ["r10"]
+
+    copy = UserProfile.loads(profile.dumps())
+    assert copy == profile
+    assert copy.remove("10") and not copy.remove("10")
+    assert copy.weights == {"company:acme": 1.0}
+
+
+def test_feed_index_ranks_by_profile_affinity_then_recency():
+    jobs = [
+        {"id": "1", "title": "a", "category": "Design", "company": "Beta", "tags": ["figma"]},
+        {"id": "2", "title": "b", "category": "Software Development", "company": "Acme", "tags": ["python"]},
+        {"id": "3", "title": "c", "category": "Software Development", "company": "Zeta", "tags": ["go"]},
+        {"id": "4", "title": "d", "category": "Software Development", "company": "Zeta", "tags": ["rust"]},
+    ]
+    # linha 3 é a mais nova, linha 0 a mais antiga
+    index = FeedIndex(JobStore.from_jobs(jobs), newest_rank=[3, 2, 1, 0])
+    profile = UserProfile()
+    profile.add("99", "", job_features("Software Development", "Acme", ["python"]))
+
+    ranked = [row for row, _ in index.top(profile, 10)]
+    assert ranked == [1, 3, 2]  # afinidade; empate 2 x 3 decidido pela mais nova
+    assert [row for row, _ in index.top(profile, 10, exclude=[1])] == [3, 2]
+    assert index.top(profile, 1) == index.top(profile, 10)[:1]
+    assert index.top(UserProfile(), 10) == []
+
+
+def test_out_of_order_toggles_apply_the_current_state():
+    async def scenario():
+        profiles = store()
+        await profiles.put(1, UserProfile())
+        favorites = set()
+
+        async def current():
+            return ("r7", FEATURES) if "7" in favorites else None
+
+        # add e remove já gravados; a tarefa do remove termina antes da do add
+        favorites.add("7")
+        favorites.discard("7")
+        await profiles.update(1, "7", current)
+        await profiles.update(1, "7", current)
+        return await profiles.get(1)
+
+    profile = asyncio.run(scenario())
+    assert profile.members == {}
+    assert profile.weights == {}
+
+
+def test_toggle_during_a_build_waits_and_is_applied_after_it():
+    async def scenario():
+        profiles = store()
+        favorites = set()
+        reading = asyncio.Event()
+        release = asyncio.Event()
+
+        async def load():
+            snapshot = set(favorites)  # leitura do banco antes do toggle
+            reading.set()
+            await release.wait()
+            profile = UserProfile()
+            for job_id in snapshot:
+                profile.add(job_id, "r" + job_id, FEATURES)
+            return profile
+
+        async def current():
+            return ("r7", FEATURES) if "7" in favorites else None
+
+        build = asyncio.ensure_future(profiles.rebuild(1, load))
+        await reading.wait()
+        favorites.add("7")
+        toggle = asyncio.ensure_future(profiles.update(1, "7", current))
+        await asyncio.sleep(0.02)
+        assert not toggle.done()  # esperando o lock da montagem
+        release.set()
+        await asyncio.gather(build, toggle)
+        return await profiles.get(1)
+
+    assert list(asyncio.run(scenario()).members) == ["7"]
+
+
+def test_toggle_that_gives_up_on_the_lock_keeps_the_build_from_publishing():
+    async def scenario():
+        profiles = store(lock_timeout=0.01)
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            return UserProfile()
+
+        async def current():
+            return ("r7", FEATURES)
+
+        build = asyncio.ensure_future(profiles.rebuild(1, load))
+        await asyncio.sleep(0)
+        await profiles.update(1, "7", current)  # desiste e invalida
+        release.set()
+        built = await build
+        return built, await profiles.get(1)
+
+    built, stored = asyncio.run(scenario())
+    assert built.members == {}
+    # a montagem leu antes do toggle: servida, mas não publicada
+    assert stored is None
+
+
+def test_update_without_a_profile_is_a_no_op():
+    async def scenario():
+        profiles = store()
+        calls = []
+
+        async def current():
+            calls.append(1)
+            return ("r7", FEATURES)
+
+        await profiles.update(1, "7", current)
+        return calls, await profiles.get(1), await profiles.version(1)
+
+    calls, profile, version = asyncio.run(scenario())
+    assert (calls, profile, version) == ([], None, 0)
@@ -0,0 +1,54 @@
+# tests/test_retention.py
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.services.retention import _bound, add_months, month_start, partition_month, partition_name
+from app.services.sync import _posted_at
+
+
+def test_month_start_truncates_to_the_first_day():
+    assert month_start(date(2026, 1, 31)) == date(2026, 1, 1)
+    assert month_start(datetime(2026, 12, 31, 23, 59)) == date(2026, 12, 1)
+
+
+@pytest.mark.parametrize(
+    "month,delta,expected",
+    [
+        (date(2026, 1, 1), 1, date(2026, 2, 1)),
+        (date(2026, 12, 1), 1, date(2027, 1, 1)),
+        (date(2026, 1, 1), -1, date(2025, 12, 1)),
+        (date(2026, 3, 1), -15, date(2024, 12, 1)),
+        (date(2026, 5, 31), 0, date(2026, 5, 1)),
+        (date(2026, 5, 1), 24, date(2028, 5, 1)),
+    ],
+)
+def test_add_months_crosses_year_boundaries(month, delta, expected):
+    assert add_months(month, delta) == expected
+
+
+def test_partition_names_round_trip():
+    assert partition_name(date(2026, 3, 1)) == "job_history_2026_03"
+    assert partition_month("job_history_2026_03") == date(2026, 3, 1)
+    for name in ("job_history_2026_3", "job_history_default", "jobs_2026_03", "job_history_2026_03_old"):
+        assert partition_month(name) is None
+
+
+def test_partition_bounds_are_utc_midnight():
+    assert _bound(date(2026, 10, 1)) == "'2026-10-01 00:00:00+00'"
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("2026-09-30T10:00:00", datetime(2026, 9, 30, 10, tzinfo=timezone.utc)),
+        ("2026-09-30T10:00:00Z", datetime(2026, 9, 30, 10, tzinfo=timezone.utc)),
+        ("2026-09-30T12:00:00+02:00", datetime(2026, 9, 30, 10, tzinfo=timezone.utc)),
+        ("2026-09-30", datetime(2026, 9, 30, tzinfo=timezone.utc)),
+        ("ontem", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_posted_at_parses_remotive_dates_as_utc(value, expected):
+    assert _posted_at(value) == expected
@@ -0,0 +1,49 @@
+# tests/test_similarity.py
+import math
+
+from app.services.job_store import JobStore
+from app.services.similarity import SimilarityIndex, tokenize
+
+
+def store_of(*jobs):
+    return JobStore.from_jobs([{"id": str(i + 1), "title": t, "tags": tags} for i, (t, tags) in enumerate(jobs)])
+
+
+def test_tokenize_keeps_tech_terms_and_drops_stopwords():
+    assert tokenize("Senior C++ / C# Engineer for the Node.js team") == ["senior", "c++", "c#", "engineer", "node.js", "team"]
+
+
+def test_similar_ranks_by_shared_rare_terms():
+    store = store_of(
+        ("Python Django Developer", ["python"]),
+        ("Django Backend Developer", ["python"]),
+        ("Python Data Engineer", []),
+        ("Product Designer", ["figma"]),
+        ("Marketing Manager", []),
+    )
+    index = SimilarityIndex(store, max_df=1.0)
+    ranked = index.similar(0, 10)
+    rows = [row for row, _ in ranked]
+    assert rows[:2] == [1, 2]  # django + tag python pesam mais que só "python"
+    assert 0 not in rows and 3 not in rows and 4 not in rows
+    assert all(0 < score <= 1 for _, score in ranked)
+    assert index.similar(0, 1) == ranked[:1]
+
+
+def test_vectors_are_l2_normalized():
+    index = SimilarityIndex(store_of(("Go Engineer", ["go", "kubernetes"]), ("Go Developer", ["go"])))
+    for row in range(index.size):
+        weights = index.data[index.indptr[row]:index.indptr[row + 1]]
+        assert math.isclose(float((weights * weights).sum()), 1.0, rel_tol=1e-5)
+
+
+def test_common_terms_are_ignored_when_others_are_available():
+    titles = [("Engineer Rust", []), ("Engineer Rust", []), ("Engineer Go", [])] + [("Engineer", [])] * 7
+    index = SimilarityIndex(store_of(*titles), max_df=0.2)
+    # "engineer" está em todas: só "rust" conta para a linha 0
+    assert [row for row, _ in index.similar(0, 10)] == [1]
+
+
+def test_job_without_terms_has_no_similar_jobs():
+    index = SimilarityIndex(store_of(("", []), ("Python", [])))
+    assert index.similar(0, 5) == []
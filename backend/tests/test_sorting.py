@@ -0,0 +1,82 @@
+# tests/test_sorting.py
+import random
+
+import pytest
+
+from app.services.facets import FacetIndex, bitmap_from_rows
+from app.services.job_store import JobStore
+from app.services.sorting import SortIndex, walk_order
+
+
+def make_jobs(n, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": str(1000 + i),
+            "remotive_id": str(1000 + i),
+            "title": rng.choice(["Backend Engineer", "designer", "Data Analyst", ""]) + f" {i % 13}",
+            "company": rng.choice(["Acme", "beta", "Zeta", None]),
+            "category": ["Software Development", "Design", "Marketing", None][i % 4],
+            "published_at": rng.choice([None, f"2026-0{rng.randint(1, 9)}-{rng.randint(10, 28)}T00:00:00"]),
+            "tags": rng.sample(["python", "go", "react", "sql"], rng.randint(0, 3)),
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    jobs = make_jobs(300)
+    store = JobStore.from_jobs(jobs)
+    return jobs, FacetIndex(store), SortIndex(store)
+
+
+def rows_of(mask):
+    return [r for r in range(mask.bit_length()) if mask >> r & 1]
+
+
+def expected_order(jobs, key):
+    def casefold(value):
+        return (not value, (value or "").casefold())
+
+    rows = range(len(jobs))
+    if key == "newest":
+        dated = [r for r in rows if jobs[r]["published_at"]]
+        return sorted(dated, key=lambda r: jobs[r]["published_at"], reverse=True) + [
+            r for r in rows if not jobs[r]["published_at"]
+        ]
+    if key == "company":
+        return sorted(rows, key=lambda r: (casefold(jobs[r]["company"]), casefold(jobs[r]["title"])))
+    if key == "title":
+        return sorted(rows, key=lambda r: casefold(jobs[r]["title"]))
+    return list(rows)
+
+
+@pytest.mark.parametrize("key", ["relevance", "newest", "company", "title"])
+@pytest.mark.parametrize("facet,values", [(None, None), ("category", ["Design"]), ("tag", ["go"])])
+def test_sorted_pages_match_a_full_sort(catalog, key, facet, values):
+    # filtro denso (sem filtro), médio (categoria) e esparso (tag): os dois
+    # caminhos de SortIndex.page (varrer 'order' ou top-k) dão o mesmo resultado
+    jobs, index, sorting = catalog
+    mask = index.all_mask if facet is None else index.mask_for(facet, values)
+    selected = set(rows_of(mask))
+    full = [r for r in expected_order(jobs, key) if r in selected]
+    for start in (0, 7, len(full) - 3, len(full) + 5):
+        assert sorting.page(key, mask, max(start, 0), 10) == full[max(start, 0):max(start, 0) + 10]
+
+
+def test_sparse_filter_uses_rank_top_k(catalog):
+    jobs, index, sorting = catalog
+    rows = [5, 150, 299]
+    mask = bitmap_from_rows(rows, index.size)
+    expected = [r for r in expected_order(jobs, "title") if r in rows]
+    assert sorting.page("title", mask, 0, 10) == expected
+    assert sorting.page("title", mask, 1, 1) == expected[1:2]
+
+
+def test_walk_order_pages_in_given_order():
+    order = [9, 3, 7, 1, 0, 4]
+    mask = bitmap_from_rows([0, 3, 4, 9], 10)
+    assert walk_order(order, mask, 0, 10) == [9, 3, 0, 4]
+    assert walk_order(order, mask, 1, 2) == [3, 0]
+    assert walk_order(order, 0, 0, 10) == []
@@ -0,0 +1,137 @@
+# tests/test_sse.py
+import asyncio
+import json
+
+from app.routers import jobs
+from app.services.broadcast import Broadcaster, Event
+from app.services.catalog import CatalogDelta, CatalogSnapshot
+from app.services.job_store import JobStore
+
+
+def event(version):
+    return Event(version, version - 1, f"data: {version}\n\n".encode())
+
+
+def test_subscribers_share_the_chain_and_slow_ones_catch_up():
+    async def scenario():
+        broadcaster = Broadcaster()
+        fast = broadcaster.subscribe()
+        slow = broadcaster.subscribe()
+        assert broadcaster.subscribers == 2
+
+        waiting = asyncio.ensure_future(fast.next(1.0))
+        await asyncio.sleep(0)
+        broadcaster.publish(event(2))
+        first = await waiting
+        broadcaster.publish(event(3))
+        broadcaster.publish(event(4))
+
+        # o lento não perdeu nada: segue a cadeia de onde parou
+        slow_seen = [await slow.next(1.0) for _ in range(3)]
+        fast_seen = [first] + [await fast.next(1.0) for _ in range(2)]
+        fast.close()
+        slow.close()
+        return broadcaster, fast_seen, slow_seen
+
+    broadcaster, fast_seen, slow_seen = asyncio.run(scenario())
+    assert [e.version for e in fast_seen] == [2, 3, 4]
+    assert fast_seen == slow_seen
+    # o mesmo objeto (payload serializado uma vez) para todos os clientes
+    assert all(a is b for a, b in zip(fast_seen, slow_seen))
+    assert broadcaster.version == 4
+    assert broadcaster.subscribers == 0
+
+
+def test_subscription_starts_at_the_next_event():
+    async def scenario():
+        broadcaster = Broadcaster()
+        broadcaster.publish(event(2))
+        late = broadcaster.subscribe()
+        broadcaster.publish(event(3))
+        return await late.next(1.0)
+
+    assert asyncio.run(scenario()).version == 3
+
+
+def test_next_times_out_for_keepalive_without_losing_position():
+    async def scenario():
+        broadcaster = Broadcaster()
+        subscription = broadcaster.subscribe()
+        idle = await subscription.next(0.01)
+        broadcaster.publish(event(2))
+        return idle, await subscription.next(1.0)
+
+    idle, received = asyncio.run(scenario())
+    assert idle is None
+    assert received.version == 2
+
+
+def test_cancelled_waiter_does_not_break_the_shared_future():
+    async def scenario():
+        broadcaster = Broadcaster()
+        gone = broadcaster.subscribe()
+        staying = broadcaster.subscribe()
+        waiter = asyncio.ensure_future(gone.next(10.0))
+        await asyncio.sleep(0)
+        waiter.cancel()  # cliente desconectou no meio da espera
+        await asyncio.sleep(0)
+        gone.close()
+        broadcaster.publish(event(2))
+        return broadcaster, await staying.next(1.0)
+
+    broadcaster, received = asyncio.run(scenario())
+    assert received.version == 2
+    assert broadcaster.subscribers == 1
+
+
+def snapshot(version, ids):
+    store = JobStore.from_jobs(
+        [{"id": str(i), "title": f"Job {i}", "description": "<p>longa</p>", "tags": []} for i in ids]
+    )
+    return CatalogSnapshot.build(version, 0.0, store)
+
+
+def test_changes_payload_merges_deltas_without_descriptions():
+    snap = snapshot(4, [1, 3, 4])
+    deltas = [CatalogDelta(3, ["3", "2"], ["9"]), CatalogDelta(4, ["4"], ["2"])]
+    payload = jobs._changes_payload(snap, 2, deltas)
+    assert (payload["version"], payload["since"], payload["reset"]) == (4, 2, False)
+    assert [item["id"] for item in payload["added"]] == ["3", "4"]
+    assert all(item["description"] is None for item in payload["added"])
+    assert payload["removed"] == ["9"]
+    # intervalo fora do histórico: o cliente recarrega
+    assert jobs._changes_payload(snap, 2, None)["reset"] is True
+
+
+def test_sse_frame_carries_the_version_as_event_id():
+    frame = jobs._sse_frame({"version": 7, "added": [{"title": "Café"}]}).decode("utf-8")
+    head, event, data, end = frame.split("\n", 3)
+    assert (head, event, end) == ("id: 7", "event: changes", "\n")
+    assert json.loads(data[len("data: "):]) == {"version": 7, "added": [{"title": "Café"}]}
+
+
+def test_publish_changes_serializes_each_version_once(monkeypatch):
+    class FakeCatalog:
+        calls = 0
+
+        async def changes(self, snap, since):
+            FakeCatalog.calls += 1
+            return [CatalogDelta(v, [str(v)], []) for v in range(since + 1, snap.version + 1)]
+
+    async def scenario():
+        broadcaster = Broadcaster()
+        monkeypatch.setattr(jobs, "broadcaster", broadcaster)
+        monkeypatch.setattr(jobs, "get_catalog", FakeCatalog)
+        await jobs._publish_changes(snapshot(2, [2]))  # primeira versão: só registra
+        subscription = broadcaster.subscribe()
+        await jobs._publish_changes(snapshot(4, [2, 3, 4]))
+        await jobs._publish_changes(snapshot(4, [2, 3, 4]))  # outro worker/listener, mesma versão
+        event = await subscription.next(1.0)
+        idle = await subscription.next(0.01)
+        return event, idle
+
+    event, idle = asyncio.run(scenario())
+    assert (event.version, event.since) == (4, 2)
+    assert b'"added":[{"id":"3"' in event.frame
+    assert idle is None
+    assert FakeCatalog.calls == 1
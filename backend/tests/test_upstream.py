@@ -0,0 +1,101 @@
+# tests/test_upstream.py
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import jobs
+from app.services.upstream import SingleFlight, UpstreamBusy, UpstreamLimiter
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"jobs": []}
+
+        results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+        in_flight_after = len(flight)
+        again = await flight.do("k", fetch)  # terminada, a chave não fica presa
+        return calls, results, in_flight_after, again
+
+    calls, results, in_flight_after, again = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert all(r is results[0] for r in results)
+    assert in_flight_after == 0
+    assert again == {"jobs": []}
+
+
+def test_single_flight_survives_the_first_caller_being_cancelled():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.ensure_future(flight.do("k", fetch))
+        second = asyncio.ensure_future(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()  # cliente desconectou
+        release.set()
+        return await second, first.cancelled()
+
+    assert asyncio.run(scenario()) == ("ok", True)
+
+
+def test_limiter_fails_fast_when_the_queue_is_full():
+    async def scenario():
+        limiter = UpstreamLimiter(1, 1, queue_timeout=1.0, retry_after=7)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter:
+                await release.wait()
+
+        holder = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+        queued = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(UpstreamBusy) as busy:
+            async with limiter:
+                pass
+        release.set()
+        await asyncio.gather(holder, queued)
+        return busy.value.retry_after, limiter.waiting
+
+    assert asyncio.run(scenario()) == (7, 0)
+
+
+def test_limiter_gives_up_after_the_queue_timeout():
+    async def scenario():
+        limiter = UpstreamLimiter(1, 5, queue_timeout=0.01, retry_after=3)
+        async with limiter:
+            with pytest.raises(UpstreamBusy):
+                async with limiter:
+                    pass
+        # a vaga volta: a próxima chamada entra direto
+        async with limiter:
+            return limiter.waiting
+
+    assert asyncio.run(scenario()) == 0
+
+
+def test_busy_upstream_becomes_503_with_retry_after(monkeypatch):
+    class Full:
+        async def __aenter__(self):
+            raise UpstreamBusy(11)
+
+        async def __aexit__(self, *exc_info):
+            pass
+
+    monkeypatch.setattr(jobs, "get_limiter", Full)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(jobs._fetch_json("/remote-jobs", None, "k", use_cache=False))
+    assert error.value.status_code == 503
+    assert error.value.headers == {"Retry-After": "11"}
@@ -0,0 +1,79 @@
+# tests/test_warmer.py
+import asyncio
+import time
+
+from app.services.cache import LocalLRU, MemoryCache
+from app.services.warmer import QueryLog, Warmer
+
+
+def test_query_log_merges_workers_and_decays():
+    async def scenario():
+        cache = MemoryCache()
+        first, second = QueryLog(cache), QueryLog(cache)
+        for q in ["Python", " python ", "go", "", None]:
+            first.record(q)
+        for q in ["go", "go", "rust"]:
+            second.record(q)
+        top = await first.top(2) + await second.top(3)
+        # duas versões: go 3 -> 0.75, python 2 -> 0.5, rust 1 -> 0.25 (sai)
+        await first.decay()
+        await first.decay()
+        return top, await first.top(5)
+
+    top, decayed = asyncio.run(scenario())
+    assert top == ["python", "go", "go", "python", "rust"]
+    assert decayed == ["go", "python"]
+
+
+def test_query_log_keeps_counts_while_another_worker_holds_the_lock():
+    async def scenario():
+        cache = MemoryCache()
+        log = QueryLog(cache)
+        log.record("sql")
+        await cache.try_lock(log.key)
+        await log.flush()  # adiado, não perdido
+        await cache.unlock(log.key)
+        return await log.top(1)
+
+    assert asyncio.run(scenario()) == ["sql"]
+
+
+def test_warmer_limits_concurrency_and_survives_failures():
+    async def scenario():
+        warmer = Warmer(concurrency=2)
+        running = peak = 0
+
+        async def task(fail=False):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if fail:
+                raise RuntimeError("Remotive fora")
+
+        async def build():
+            return [task, lambda: task(fail=True), task, task]
+
+        warmer.schedule(build)
+        warmer.schedule(build)  # já rodando: ignorado
+        report = await warmer.wait()
+        return report, peak
+
+    report, peak = asyncio.run(scenario())
+    assert (report.tasks, report.errors) == (4, 1)
+    assert peak == 2
+
+
+def test_local_lru_evicts_the_least_recent_and_expires():
+    lru = LocalLRU(2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1  # "a" passa a ser o mais recente
+    lru.set("c", 3)
+    assert (lru.get("a"), lru.get("b"), lru.get("c"), len(lru)) == (1, None, 3, 2)
+
+    short = LocalLRU(10, ttl=0.01)
+    short.set("q", "resposta")
+    time.sleep(0.02)
+    assert short.get("q") is None
@@ -0,0 +1,205 @@
+# tests/test_write_behind.py
+import asyncio
+import logging
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.services import write_behind as wb
+from app.services.write_behind import FavoriteWriteBehind
+
+
+def describe(stmt):
+    """('insert', user_id, job_ids) ou ('delete', [(user_id, job_id), ...])."""
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    if stmt.is_insert:
+        return ("insert", params["param_1"], list(params["id_1"]))
+    return ("delete", sorted(params["param_1"]))
+
+
+class FakeDatabase:
+    """Sessões falsas: registram o que foi comitado e podem falhar sob demanda."""
+
+    def __init__(self):
+        self.committed = []
+        self.sessions = 0
+        self.reject = lambda op: False  # True -> IntegrityError nesse statement
+        self.fail_commit = False
+        self.gate = None  # asyncio.Event: execute espera por ele
+
+    def __call__(self):
+        return FakeSession(self)
+
+
+class FakeSession:
+    def __init__(self, db):
+        self.db = db
+        self.executed = []
+
+    async def __aenter__(self):
+        self.db.sessions += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def begin_nested(self):
+        return FakeSavepoint(self)
+
+    async def execute(self, stmt):
+        if self.db.gate is not None:
+            await self.db.gate.wait()
+        op = describe(stmt)
+        if self.db.reject(op):
+            raise IntegrityError(str(stmt), {}, Exception("violates foreign key constraint"))
+        self.executed.append(op)
+
+    async def commit(self):
+        if self.db.fail_commit:
+            raise OperationalError("COMMIT", {}, Exception("connection lost"))
+        self.db.committed.extend(self.executed)
+
+
+class FakeSavepoint:
+    def __init__(self, session):
+        self.session = session
+
+    async def __aenter__(self):
+        self.mark = len(self.session.executed)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            del self.session.executed[self.mark:]  # ROLLBACK TO SAVEPOINT
+        return False
+
+
+def make(db, flush_ms=10_000):
+    # intervalo longo: os testes chamam flush() explicitamente
+    return FavoriteWriteBehind(db, flush_ms=flush_ms, max_batch=500)
+
+
+def test_toggles_are_coalesced_into_one_batch():
+    async def scenario():
+        db = FakeDatabase()
+        queue = make(db)
+        queue.enqueue(1, 10, favorite=True)
+        queue.enqueue(1, 10, favorite=False)  # vale o último
+        queue.enqueue(1, 11, favorite=True)
+        queue.enqueue(1, 12, favorite=True)
+        queue.enqueue(2, 11, favorite=True)
+        assert len(queue) == 4
+        assert queue.pending_state(1, 10) is False
+        await queue.flush()
+        await queue.close()
+        return db, queue
+
+    db, queue = asyncio.run(scenario())
+    assert db.sessions == 1
+    assert sorted(db.committed, key=repr) == sorted(
+        [("insert", 1, [11, 12]), ("insert", 2, [11]), ("delete", [(1, 10)])], key=repr
+    )
+    assert len(queue) == 0
+    assert queue.pending_state(1, 11) is None
+
+
+def test_failed_batch_is_requeued_without_overwriting_newer_toggles():
+    async def scenario():
+        db = FakeDatabase()
+        db.gate = asyncio.Event()
+        db.fail_commit = True
+        queue = make(db)
+        queue.enqueue(1, 10, favorite=True)
+        queue.enqueue(1, 11, favorite=True)
+
+        flushing = asyncio.ensure_future(queue.flush())
+        await asyncio.sleep(0)
+        # em voo: as leituras enxergam o lote que está sendo gravado
+        assert queue.pending_state(1, 10) is True
+        queue.enqueue(1, 10, favorite=False)  # toggle mais novo durante a gravação
+        db.gate.set()
+        with pytest.raises(OperationalError):
+            await flushing
+
+        state = {key: queue.pending_state(*key) for key in [(1, 10), (1, 11)]}
+        db.fail_commit = False
+        await queue.flush()
+        await queue.close()
+        return db, state
+
+    db, state = asyncio.run(scenario())
+    assert state == {(1, 10): False, (1, 11): True}
+    assert sorted(db.committed, key=repr) == [("delete", [(1, 10)]), ("insert", 1, [11])]
+
+
+def test_close_flushes_pending_toggles():
+    async def scenario():
+        db = FakeDatabase()
+        queue = make(db)
+        queue.enqueue(1, 10, favorite=True)
+        queue.enqueue(1, 11, favorite=False)
+        await queue.close()
+        return db, queue
+
+    db, queue = asyncio.run(scenario())
+    assert sorted(db.committed, key=repr) == [("delete", [(1, 11)]), ("insert", 1, [10])]
+    assert len(queue) == 0
+
+
+def test_background_flusher_writes_after_the_interval():
+    async def scenario():
+        db = FakeDatabase()
+        queue = make(db, flush_ms=5)
+        queue.enqueue(1, 10, favorite=True)
+        for _ in range(100):
+            if db.committed:
+                break
+            await asyncio.sleep(0.01)
+        await queue.close()
+        return db
+
+    assert asyncio.run(scenario()).committed == [("insert", 1, [10])]
+
+
+def test_rejected_rows_do_not_block_the_rest_and_are_dropped_after_max_attempts(caplog):
+    async def scenario():
+        db = FakeDatabase()
+        # usuário 99 não existe: FK de user_id falha sempre
+        db.reject = lambda op: op[0] == "insert" and op[1] == 99
+        queue = make(db)
+        queue.enqueue(99, 10, favorite=True)
+        queue.enqueue(1, 10, favorite=True)
+        await queue.flush()
+        first = list(db.committed)
+        attempts = 1
+        while len(queue):
+            await queue.flush()
+            attempts += 1
+        queue.enqueue(1, 11, favorite=True)
+        await queue.flush()
+        return db, first, attempts
+
+    with caplog.at_level(logging.WARNING, logger=wb.__name__):
+        db, first, attempts = asyncio.run(scenario())
+    assert first == [("insert", 1, [10])]
+    assert attempts == wb.MAX_ATTEMPTS
+    assert db.committed[-1] == ("insert", 1, [11])
+    assert not any(op[1] == 99 for op in db.committed)
+    assert "descartados" in caplog.text
+
+
+def test_newer_toggle_replaces_a_rejected_row():
+    async def scenario():
+        db = FakeDatabase()
+        db.reject = lambda op: op[0] == "insert"
+        queue = make(db)
+        queue.enqueue(1, 10, favorite=True)
+        await queue.flush()
+        assert queue.pending_state(1, 10) is True  # recusada, de volta à fila
+        queue.enqueue(1, 10, favorite=False)
+        await queue.flush()
+        return db, queue
+
+    db, queue = asyncio.run(scenario())
+    assert db.committed == [("delete", [(1, 10)])]
+    assert len(queue) == 0
@@ -1,5 +1,6 @@
 // src/app/jobs/[id]/page.tsx
 import type { Metadata } from "next";
+import Link from "next/link";
 import { notFound, redirect } from "next/navigation";
 
 type JobDetail = {
@@ -15,6 +16,10 @@ type JobDetail = {
   tags?: string[] | null;
 };
 
+type SimilarJob = Pick<JobDetail, "id" | "title" | "company" | "location"> & {
+  score: number;
+};
+
 export const metadata: Metadata = {
   title: "Detalhes da vaga • Jobify",
 };
@@ -34,6 +39,20 @@ async function fetchJob(id: string): Promise<JobDetail | null> {
   }
 }
 
+async function fetchSimilar(id: string): Promise<SimilarJob[]> {
+  try {
+    const base = process.env.NEXT_PUBLIC_API_URL ?? "";
+    const res = await fetch(`${base}/api/jobs/${id}/similar?limit=6`, {
+      next: { revalidate: 300 },
+    });
+    if (!res.ok) return [];
+    const data = (await res.json()) as { items?: SimilarJob[] };
+    return data.items ?? [];
+  } catch {
+    return [];
+  }
+}
+
 export default async function JobDetailPage({
   params,
   searchParams,
@@ -42,7 +61,10 @@ export default async function JobDetailPage({
   searchParams: Promise<{ url?: string }>;
 }) {
   const sp = await searchParams;
-  const job = await fetchJob(params.id);
+  const [job, similar] = await Promise.all([
+    fetchJob(params.id),
+    fetchSimilar(params.id),
+  ]);
 
   if (!job) {
     if (sp?.url) redirect(sp.url);
@@ -96,6 +118,24 @@ export default async function JobDetailPage({
           )}
         </div>
       </div>
+
+      {similar.length > 0 && (
+        <section className="mt-8">
+          <h2 className="text-lg font-semibold">Vagas parecidas</h2>
+          <ul className="mt-4 grid gap-3 sm:grid-cols-2">
+            {similar.map((s) => (
+              <li key={s.id} className="card p-4">
+                <Link href={`/jobs/${s.id}`} className="font-medium">
+                  {s.title}
+                </Link>
+                <p className="text-sm text-[rgb(var(--muted))]">
+                  {s.company} • {s.location ?? "Remoto"}
+                </p>
+              </li>
+            ))}
+          </ul>
+        </section>
+      )}
     </main>
   );
 }
@@ -2,8 +2,8 @@
 "use client";
 
 import Link from "next/link";
-import { useQueries } from "@tanstack/react-query";
-import { api } from "@/lib/api";
+import { useQueries, useQuery } from "@tanstack/react-query";
+import { api, fetchFeed } from "@/lib/api";
 
 /** Tipo enxuto esperado dos itens do backend */
 type JobItem = {
@@ -56,6 +56,17 @@ export default function LatestJobs({
     })),
   });
 
+  // recomendações a partir dos favoritos (só aparecem se houver perfil)
+  const feed = useQuery({
+    queryKey: ["landing", "feed", perTopic] as const,
+    queryFn: () => fetchFeed(perTopic),
+    staleTime: 60_000,
+    gcTime: 5 * 60_000,
+    retry: 1,
+    refetchOnWindowFocus: false,
+  });
+  const recommended = feed.data?.personalized ? feed.data.items : [];
+
   const isLoading = queries.some((q) => q.isLoading);
   const isError = queries.some((q) => q.isError);
 
@@ -81,6 +92,33 @@ export default function LatestJobs({
 
   return (
     <div className="space-y-4">
+      {recommended.length > 0 && (
+        <section className="card">
+          <div className="flex items-center justify-between mb-2">
+            <h3 className="font-semibold">Recomendadas para você</h3>
+            <Link className="link text-sm" href="/favorites" prefetch={false}>
+              favoritos
+            </Link>
+          </div>
+          <ul className="space-y-2">
+            {recommended.map((job) => (
+              <li key={`feed-${job.id}`} className="text-sm">
+                <Link
+                  className="link"
+                  href={`/jobs/${encodeURIComponent(job.id)}?url=${encodeURIComponent(job.url)}`}
+                  prefetch={false}
+                >
+                  {job.title}
+                </Link>
+                {job.company && (
+                  <span className="ml-2 text-[rgb(var(--muted))]">— {job.company}</span>
+                )}
+              </li>
+            ))}
+          </ul>
+        </section>
+      )}
+
       {queries.map((q, idx) => {
         const list = q.data ?? [];
         const topic = topics[idx];
@@ -38,6 +38,7 @@ export function useToggleFavorite() {
     onSuccess: () => {
       qc.invalidateQueries({ queryKey: ["favorites"] });
       qc.invalidateQueries({ queryKey: ["jobs"] });
+      qc.invalidateQueries({ queryKey: ["landing", "feed"] });
     },
   });
 }
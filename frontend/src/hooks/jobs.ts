@@ -1,10 +1,11 @@
 // src/hooks/jobs.ts
 import { useQuery } from "@tanstack/react-query";
-import { fetchJobs, type UiJob } from "@/lib/api";
+import { fetchJobs, type JobSort, type UiJob } from "@/lib/api";
 
 type Params = {
   q?: string | null;
   category?: string | null;
+  sort?: JobSort;
   page?: number;
   per_page?: number;
 };
@@ -17,10 +18,10 @@ export type JobsResult = {
   total_pages: number;
 };
 
-export function useJobs({ q, category, page = 1, per_page = 20 }: Params) {
+export function useJobs({ q, category, sort = "relevance", page = 1, per_page = 20 }: Params) {
   return useQuery<JobsResult>({
-    queryKey: ["jobs", { q: q ?? null, category: category ?? null, page, per_page }],
-    queryFn: () => fetchJobs({ q, category, page, per_page }),
+    queryKey: ["jobs", { q: q ?? null, category: category ?? null, sort, page, per_page }],
+    queryFn: () => fetchJobs({ q, category, sort, page, per_page }),
     staleTime: 30_000,
     gcTime: 5 * 60_000,
     retry: 1,
@@ -41,6 +41,8 @@ export type UiJob = {
   tags?: string[];
 };
 
+export type JobSort = "relevance" | "newest" | "company" | "title";
+
 export type JobsList = {
   items: UiJob[];
   total: number;
@@ -165,6 +167,7 @@ function raise(message: string, err?: unknown): never {
 export async function fetchJobs(params: {
   q?: string | null;
   category?: string | null;
+  sort?: JobSort;
   page?: number;
   per_page?: number;
 }): Promise<JobsList> {
@@ -173,6 +176,7 @@ export async function fetchJobs(params: {
       params: {
         q: params.q ?? undefined,
         category: params.category ?? undefined,
+        sort: params.sort ?? undefined,
         page: params.page ?? 1,
         per_page: params.per_page ?? undefined,
       },
@@ -195,6 +199,26 @@ export async function fetchJobs(params: {
   }
 }
 
+export type FeedResult = {
+  items: UiJob[];
+  personalized: boolean;
+};
+
+export async function fetchFeed(limit = 6): Promise<FeedResult> {
+  try {
+    const { data } = await api.get<{ items?: RawJob[]; personalized?: boolean }>(
+      p("/feed"),
+      { params: { limit } }
+    );
+    return {
+      items: (data.items ?? []).filter(isRawJob).map(normalizeJob),
+      personalized: Boolean(data.personalized),
+    };
+  } catch (err) {
+    return raise("Falha ao buscar recomendações", err);
+  }
+}
+
 export async function fetchJobById(id: string): Promise<UiJob> {
   try {
     const { data } = await api.get<RawJob>(p(`/jobs/${encodeURIComponent(id)}`));